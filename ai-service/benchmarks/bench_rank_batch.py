@@ -0,0 +1,122 @@
+"""
+Benchmark: /rank/batch legacy per-object ranking vs the columnar engine.
+
+    python -m benchmarks.bench_rank_batch                 # 1k, 100k, 1M
+    python -m benchmarks.bench_rank_batch --sizes 1000 100000 --http
+
+"legacy" reproduces the original handler: one ``CandidateResult`` per
+candidate followed by a full Python sort.  "engine" is the NumPy path used
+by the router today, timed for a full ranking and for ``topK=100``.
+``--http`` additionally times the endpoint end to end through TestClient,
+including request parsing and JSON encoding, for a full ranking and for
+``topK=100``.
+"""
+
+import argparse
+import json
+import random
+import time
+
+from src.routers.ranking import CandidateInput, CandidateResult, _compute_final
+from src.services import ranking_engine
+
+
+def _legacy_rank(candidates: list[CandidateInput]) -> list[CandidateResult]:
+    results = [
+        CandidateResult(
+            candidateId=c.candidateId,
+            cvScore=c.cvScore,
+            examScore=c.examScore,
+            hardFilterPassed=c.hardFilterPassed,
+            finalScore=_compute_final(c),
+        )
+        for c in candidates
+    ]
+    results.sort(key=lambda r: r.finalScore, reverse=True)
+    return results
+
+
+def _engine_rank(candidates: list[CandidateInput], top_k: int | None) -> list[dict]:
+    batch = ranking_engine.rank(
+        [c.candidateId for c in candidates],
+        [c.cvScore for c in candidates],
+        [c.examScore for c in candidates],
+        [c.hardFilterPassed for c in candidates],
+        top_k=top_k,
+    )
+    return list(batch.rows())
+
+
+def _payload(n: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "candidateId": f"cand-{i}",
+            "cvScore": round(rng.uniform(0, 100), 2),
+            "examScore": round(rng.uniform(0, 100), 2),
+            "hardFilterPassed": rng.random() > 0.1,
+        }
+        for i in range(n)
+    ]
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: list[int], http: bool, repeat: int) -> list[dict]:
+    results = []
+    for n in sizes:
+        payload = _payload(n)
+        candidates = [CandidateInput(**c) for c in payload]
+        row = {
+            "n": n,
+            "legacySeconds": _time(lambda: _legacy_rank(candidates), repeat),
+            "engineSeconds": _time(lambda: _engine_rank(candidates, None), repeat),
+            "engineTop100Seconds": _time(lambda: _engine_rank(candidates, 100), repeat),
+        }
+        if http:
+            from fastapi import FastAPI
+            from fastapi.testclient import TestClient
+
+            from src.routers import ranking
+
+            app = FastAPI()
+            app.include_router(ranking.router)
+            client = TestClient(app)
+            body = json.dumps({"candidates": payload})
+            headers = {"content-type": "application/json"}
+            row["httpSeconds"] = _time(lambda: client.post("/rank/batch", content=body, headers=headers), 1)
+            top_body = json.dumps({"candidates": payload, "topK": 100})
+            row["httpTop100Seconds"] = _time(lambda: client.post("/rank/batch", content=top_body, headers=headers), 1)
+        row["speedup"] = round(row["legacySeconds"] / row["engineSeconds"], 2)
+        results.append(row)
+        print(
+            f"n={n:>9,}  legacy={row['legacySeconds']:.4f}s  engine={row['engineSeconds']:.4f}s  "
+            f"top100={row['engineTop100Seconds']:.4f}s  speedup={row['speedup']}x"
+            + (f"  http={row['httpSeconds']:.4f}s  httpTop100={row['httpTop100Seconds']:.4f}s" if http else "")
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--http", action="store_true", help="also time the endpoint through TestClient")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.http, args.repeat)
+    if args.json_out:
+        with open(args.json_out, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
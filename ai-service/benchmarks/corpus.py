@@ -0,0 +1,129 @@
+"""
+Deterministic synthetic corpus: aviation CVs, job descriptions and short answers.
+
+Every generator takes an index and a seed, so the same call always returns
+the same text and benchmark runs stay comparable.  CVs carry the kinds of PII
+:mod:`src.utils.pii_masker` looks for (email, phone, IC/passport numbers,
+Malaysian addresses) and the compound terms in ``nlp_pipeline.DOMAIN_TERMS``.
+"""
+
+import random
+
+FIRST_NAMES = ["Aisyah", "Daniel", "Farah", "Hafiz", "Mei Ling", "Arjun", "Nurul", "Tan Wei", "Siti", "Omar"]
+LAST_NAMES = ["Rahman", "Lim", "Kumar", "Abdullah", "Wong", "Ismail", "Chen", "Hassan", "Yusof", "Raj"]
+AIRCRAFT = ["Boeing 737", "Boeing 777", "Boeing 787", "Airbus A320", "Airbus A380", "ATR 72", "Cessna 172"]
+RATINGS = ["ATPL", "commercial pilot license", "instrument rating", "type rating", "multi-engine rating"]
+SKILLS = [
+    "crew resource management", "air traffic control phraseology", "flight planning", "weight and balance",
+    "emergency procedures", "line maintenance", "safety management systems", "human factors",
+    "meteorology", "navigation", "aircraft systems", "ground handling", "dangerous goods",
+]
+EMPLOYERS = ["Malaysia Airlines", "AirAsia", "Batik Air", "Firefly", "MASwings", "Singapore Airlines", "Emirates"]
+UNIVERSITIES = ["UniKL MIAT", "UiTM", "Universiti Malaya", "Taylor's University", "APU", "Politeknik Banting"]
+REGIONS = ["Selangor", "Penang", "Johor", "Sabah", "Sarawak", "Kuala Lumpur"]
+ROLES = ["First Officer", "Captain", "Cabin Crew", "Aircraft Engineer", "Flight Dispatcher", "Ground Ops Officer"]
+QUESTIONS = [
+    ("What is crew resource management?",
+     "Crew resource management is the use of all available resources, people, procedures and equipment, "
+     "to improve safety through communication, leadership and decision making on the flight deck.",
+     ["communication", "decision making", "safety"]),
+    ("Explain the purpose of a weight and balance calculation.",
+     "Weight and balance ensures the aircraft stays within its certified weight limits and that the centre "
+     "of gravity remains within the allowed envelope for stable, controllable flight.",
+     ["centre of gravity", "limits", "stable"]),
+    ("Describe the actions after an engine failure on take-off.",
+     "Maintain directional control, follow the memory items, continue the take-off if above V1, "
+     "secure the engine, complete the checklist and communicate with air traffic control.",
+     ["V1", "checklist", "directional control"]),
+]
+
+
+def _rng(kind: str, index: int, seed: int) -> random.Random:
+    return random.Random(f"{kind}:{seed}:{index}")
+
+
+def candidate_name(index: int, seed: int = 42) -> str:
+    rng = _rng("name", index, seed)
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def cv(index: int, seed: int = 42) -> str:
+    """One CV of roughly 1.5–3 KB including contact details and work history."""
+    rng = _rng("cv", index, seed)
+    name = candidate_name(index, seed)
+    lines = [
+        name,
+        f"Email: {name.lower().replace(' ', '.')}{index}@example.com | Phone: +60 1{rng.randint(0, 9)}-"
+        f"{rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        f"IC: {rng.randint(700101, 991231)}-{rng.randint(10, 14)}-{rng.randint(1000, 9999)} | "
+        f"Passport: A{rng.randint(10_000_000, 99_999_999)}",
+        f"Address: No. {rng.randint(1, 200)}, Jalan {rng.choice(['Ampang', 'Bukit', 'Tun Razak', 'Sultan'])}, "
+        f"{rng.randint(40000, 89999)} {rng.choice(REGIONS)}",
+        "",
+        "Profile",
+        f"{rng.choice(ROLES)} with {rng.randint(500, 12000)} flight hours on the "
+        f"{rng.choice(AIRCRAFT)} and {rng.choice(AIRCRAFT)}. Holds an {rng.choice(RATINGS)} and a "
+        f"{rng.choice(RATINGS)}. Strong background in {', '.join(rng.sample(SKILLS, 3))}.",
+        "",
+        "Experience",
+    ]
+    for _ in range(rng.randint(3, 6)):
+        start = rng.randint(2005, 2021)
+        lines.append(f"{rng.choice(ROLES)}, {rng.choice(EMPLOYERS)} ({start}–{start + rng.randint(1, 4)})")
+        for _ in range(rng.randint(2, 4)):
+            lines.append(
+                f"- Operated {rng.choice(AIRCRAFT)} on regional and long-haul sectors; applied "
+                f"{rng.choice(SKILLS)} and {rng.choice(SKILLS)} under {rng.choice(['IFR', 'VFR'])} conditions."
+            )
+    lines += [
+        "",
+        "Education",
+        f"Diploma in Aviation, {rng.choice(UNIVERSITIES)} ({rng.randint(2000, 2018)})",
+        "",
+        "Skills: " + ", ".join(rng.sample(SKILLS, 5)),
+    ]
+    return "\n".join(lines)
+
+
+def job_description(index: int, seed: int = 42) -> str:
+    rng = _rng("jd", index, seed)
+    role = rng.choice(ROLES)
+    return (
+        f"{role} — {rng.choice(EMPLOYERS)}\n"
+        f"We are hiring a {role} for our {rng.choice(AIRCRAFT)} fleet. Applicants must hold an "
+        f"{rng.choice(RATINGS)} and show experience in {', '.join(rng.sample(SKILLS, 4))}. "
+        f"A minimum of {rng.randint(500, 5000)} hours is required; {rng.choice(RATINGS)} on "
+        f"{rng.choice(AIRCRAFT)} is an advantage. Candidates should demonstrate crew resource management, "
+        f"clear communication and sound decision making."
+    )
+
+
+def short_answer(index: int, seed: int = 42) -> tuple[str, str, str, list[str]]:
+    """Returns ``(question, ideal_answer, candidate_answer, required_keywords)``."""
+    rng = _rng("answer", index, seed)
+    question, ideal, keywords = QUESTIONS[index % len(QUESTIONS)]
+    words = ideal.split()
+    # Candidate answers drop and shuffle parts of the ideal answer
+    kept = [w for w in words if rng.random() > 0.3]
+    cut = rng.randint(0, len(kept))
+    answer = " ".join(kept[cut:] + kept[:cut])
+    return question, ideal, answer, keywords
+
+
+def candidates(n: int, seed: int = 42) -> list[dict]:
+    """Scored candidates in the shape the bias and ranking endpoints accept."""
+    rng = random.Random(f"candidates:{seed}")
+    out = []
+    for i in range(n):
+        university = rng.choice(UNIVERSITIES)
+        out.append(
+            {
+                "candidateId": f"cand-{i}",
+                "cvScore": round(min(100.0, max(0.0, rng.gauss(65, 15))), 2),
+                "examScore": round(rng.uniform(0, 100), 2),
+                "hardFilterPassed": rng.random() > 0.1,
+                "cohort": university,
+                "attributes": {"university": university, "region": rng.choice(REGIONS)},
+            }
+        )
+    return out
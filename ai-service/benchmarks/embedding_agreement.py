@@ -0,0 +1,107 @@
+"""
+Ranking agreement of compact embeddings against full precision.
+
+    python -m benchmarks.embedding_agreement                      # stub encoder, offline
+    python -m benchmarks.embedding_agreement --real-model --dims 64 128 --json agreement.json
+
+Embeds corpus CVs and job descriptions once, fits a PCA projection on a
+training split of the CVs, then ranks the held-out CVs against every job
+with each configuration — ``int8``, ``pcaN`` and ``pcaN+int8`` — and
+compares the ranking with full-precision float32 scores (see
+:func:`src.utils.embedding_codec.agreement`).  Reported per configuration:
+mean and minimum Spearman correlation, mean and minimum top-k overlap, and
+stored bytes per vector.
+
+The stub encoder produces unrelated random directions, so its PCA numbers
+are a lower bound; use ``--real-model`` (needs the SBERT model locally) for
+figures that justify turning a reduction on.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks import corpus, fakes
+from src.utils import embedding_codec
+
+
+def _encode(texts: list[str], real_model: bool) -> np.ndarray:
+    if real_model:
+        from src.services.embedding_service import load_model
+
+        return np.asarray(load_model().encode(texts, batch_size=64, convert_to_numpy=True), dtype=np.float32)
+    return fakes.StubEncoder().encode(texts)
+
+
+def _scores(cvs: np.ndarray, jobs: np.ndarray, int8: bool) -> np.ndarray:
+    """``(jobs, cvs)`` cosine matrix, scored on int8 values when *int8*."""
+    if int8:
+        cvs, jobs = embedding_codec.quantize(cvs)[0], embedding_codec.quantize(jobs)[0]
+    return np.stack([embedding_codec.cosine_scores(cvs, job) for job in jobs])
+
+
+def run(n_cvs: int, n_jobs: int, dims: list[int], k: int, real_model: bool) -> dict:
+    cvs = _encode([corpus.cv(i) for i in range(n_cvs)], real_model)
+    jobs = _encode([corpus.job_description(i) for i in range(n_jobs)], real_model)
+    train, test = cvs[: n_cvs // 2], cvs[n_cvs // 2:]
+    reference = _scores(test, jobs, int8=False)
+    dim = cvs.shape[1]
+
+    configs = {"int8": (None, True)}
+    for d in dims:
+        mean, components, explained = embedding_codec.fit_projection(train, d)
+        configs[f"pca{d}"] = ((mean, components, explained), False)
+        configs[f"pca{d}+int8"] = ((mean, components, explained), True)
+
+    results = {"float32": {"bytesPerVector": 4 * dim}}
+    for name, (fit, int8) in configs.items():
+        test_v, jobs_v = test, jobs
+        if fit is not None:
+            proj = fit[:2]
+            test_v, jobs_v = embedding_codec.project(test, proj), embedding_codec.project(jobs, proj)
+        candidate = _scores(test_v, jobs_v, int8)
+        reports = [embedding_codec.agreement(r, c, k) for r, c in zip(reference, candidate)]
+        spearman = [r["spearman"] for r in reports]
+        overlap = [r["topKOverlap"] for r in reports]
+        width = test_v.shape[1]
+        results[name] = {
+            "bytesPerVector": 4 + width if int8 else 4 * width,
+            "spearmanMean": round(float(np.mean(spearman)), 4),
+            "spearmanMin": round(float(np.min(spearman)), 4),
+            "topKOverlapMean": round(float(np.mean(overlap)), 4),
+            "topKOverlapMin": round(float(np.min(overlap)), 4),
+        }
+        if fit is not None:
+            results[name]["explainedVariance"] = round(fit[2], 4)
+    return {"encoder": "sbert" if real_model else "stub", "cvs": len(test), "jobs": n_jobs, "k": k, "results": results}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cvs", type=int, default=1000, help="CVs embedded; half fit the projection")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--dims", type=int, nargs="+", default=[128])
+    parser.add_argument("-k", type=int, default=10, help="top-k for the overlap metric")
+    parser.add_argument("--real-model", action="store_true", help="use the SBERT model instead of the stub")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args.cvs, args.jobs, args.dims, args.k, args.real_model)
+    print(f"{report['encoder']} encoder, {report['cvs']} held-out CVs x {report['jobs']} jobs, k={report['k']}")
+    for name, r in report["results"].items():
+        if "spearmanMean" not in r:
+            print(f"{name:<14} {r['bytesPerVector']:>5} B/vector  (reference)")
+            continue
+        print(f"{name:<14} {r['bytesPerVector']:>5} B/vector  spearman mean={r['spearmanMean']:.4f} "
+              f"min={r['spearmanMin']:.4f}  top-{report['k']} overlap mean={r['topKOverlapMean']:.3f} "
+              f"min={r['topKOverlapMin']:.3f}")
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+Offline stand-ins used by the benchmarks and load generator.
+
+``StubEncoder`` replaces the SBERT model with a deterministic hash-based
+encoder of the same output shape, optionally sleeping to mimic inference
+latency.  ``FakeRedis`` is an in-process dict store that implements the
+subset of redis-py the service uses (strings, hashes, sets, sorted sets,
+pipelines and WATCH transactions), so cache code paths run unmodified.
+"""
+
+import hashlib
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+EMBEDDING_DIM = 384
+
+
+class StubEncoder:
+    """Deterministic ``SentenceTransformer.encode`` stand-in."""
+
+    def __init__(self, dim: int = EMBEDDING_DIM, latency_ms: float = 0.0, per_item_ms: float = 0.0) -> None:
+        self.dim = dim
+        self.latency_ms = latency_ms
+        self.per_item_ms = per_item_ms
+        self.calls = 0
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+        vec = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return vec / np.linalg.norm(vec)
+
+    def encode(self, texts, batch_size: int = 32, convert_to_numpy: bool = True, **_: Any):
+        single = isinstance(texts, str)
+        items = [texts] if single else list(texts)
+        self.calls += 1
+        delay = self.latency_ms + self.per_item_ms * len(items)
+        if delay:
+            time.sleep(delay / 1000)
+        out = np.stack([self._vector(t) for t in items]) if items else np.empty((0, self.dim), np.float32)
+        return out[0] if single else out
+
+
+def install_stub_encoder(encoder: StubEncoder | None = None) -> StubEncoder:
+    """
+    Make ``embedding_service`` use *encoder* instead of loading SBERT, for
+    the rest of the process (benchmark runs); tests use the ``stub_encoder``
+    fixture, which restores the model afterwards.
+    """
+    from src.services import embedding_service
+
+    encoder = encoder or StubEncoder()
+    embedding_service._model = encoder
+    return encoder
+
+
+class FakeRedis:
+    """Single-process, dict-backed Redis stand-in (TTLs are accepted and ignored)."""
+
+    def __init__(self) -> None:
+        self._data: dict[str, Any] = {}
+
+    # — strings —
+    def get(self, key: str):
+        value = self._data.get(key)
+        return value if isinstance(value, (str, bytes)) or value is None else None
+
+    def set(self, key: str, value, ex: int | None = None, nx: bool = False):
+        if nx and key in self._data:
+            return None
+        self._data[key] = value
+        return True
+
+    def setex(self, key: str, _ttl: int, value):
+        return self.set(key, value)
+
+    def mget(self, keys):
+        return [self.get(k) for k in keys]
+
+    def exists(self, *keys: str) -> int:
+        return sum(1 for k in keys if k in self._data)
+
+    def delete(self, *keys: str) -> int:
+        return sum(1 for k in keys if self._data.pop(k, None) is not None)
+
+    def expire(self, key: str, _ttl: int) -> bool:
+        return key in self._data
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        self._data[key] = str(int(self._data.get(key, 0)) + amount)
+        return int(self._data[key])
+
+    # — hashes —
+    def _hash(self, key: str) -> dict:
+        return self._data.setdefault(key, {})
+
+    def hset(self, key: str, field: str | None = None, value=None, mapping: dict | None = None) -> int:
+        h = self._hash(key)
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        added = sum(1 for f in items if f not in h)
+        h.update(items)
+        return added
+
+    def hget(self, key: str, field: str):
+        return self._data.get(key, {}).get(field)
+
+    def hmget(self, key: str, fields):
+        h = self._data.get(key, {})
+        return [h.get(f) for f in fields]
+
+    def hgetall(self, key: str) -> dict:
+        return dict(self._data.get(key, {}))
+
+    def hdel(self, key: str, *fields: str) -> int:
+        h = self._data.get(key, {})
+        return sum(1 for f in fields if h.pop(f, None) is not None)
+
+    # — sets —
+    def sadd(self, key: str, *members: str) -> int:
+        members_set = self._data.setdefault(key, set())
+        added = sum(1 for m in members if m not in members_set)
+        members_set.update(members)
+        return added
+
+    def smembers(self, key: str) -> set:
+        return set(self._data.get(key, set()))
+
+    def sunion(self, keys, *more: str) -> set:
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        return set().union(*(self._data.get(k, set()) for k in [*keys, *more]))
+
+    # — sorted sets —
+    def _zset(self, key: str) -> dict:
+        return self._data.setdefault(key, {})
+
+    def zadd(self, key: str, mapping: dict) -> int:
+        z = self._zset(key)
+        added = sum(1 for m in mapping if m not in z)
+        z.update({m: float(s) for m, s in mapping.items()})
+        return added
+
+    def zrem(self, key: str, *members: str) -> int:
+        z = self._data.get(key, {})
+        return sum(1 for m in members if z.pop(m, None) is not None)
+
+    def zscore(self, key: str, member: str):
+        return self._data.get(key, {}).get(member)
+
+    def zcard(self, key: str) -> int:
+        return len(self._data.get(key, {}))
+
+    @staticmethod
+    def _in_range(score: float, low, high) -> bool:
+        return float(low) <= score <= float(high)  # float() parses "-inf" / "+inf"
+
+    def zrangebyscore(self, key: str, low, high) -> list[str]:
+        items = sorted(self._data.get(key, {}).items(), key=lambda kv: (kv[1], kv[0]))
+        return [m for m, score in items if self._in_range(score, low, high)]
+
+    def zremrangebyscore(self, key: str, low, high) -> int:
+        z = self._data.get(key, {})
+        doomed = [m for m, score in z.items() if self._in_range(score, low, high)]
+        for m in doomed:
+            del z[m]
+        return len(doomed)
+
+    def _ordered(self, key: str) -> list[tuple[str, float]]:
+        # ZREVRANGE order: score descending, equal scores in reverse lexicographic order
+        return sorted(self._data.get(key, {}).items(), key=lambda kv: (kv[1], kv[0]), reverse=True)
+
+    def zrevrank(self, key: str, member: str):
+        for i, (m, _) in enumerate(self._ordered(key)):
+            if m == member:
+                return i
+        return None
+
+    def zrevrange(self, key: str, start: int, end: int, withscores: bool = False):
+        items = self._ordered(key)
+        sliced = items[start:None if end == -1 else end + 1]
+        return sliced if withscores else [m for m, _ in sliced]
+
+    # — pipelines —
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self, buffered=True)
+
+    def transaction(self, func: Callable, *_watches: str, value_from_callable: bool = False, **__: Any):
+        pipe = FakePipeline(self, buffered=False)
+        value = func(pipe)
+        results = pipe.execute()
+        return value if value_from_callable else results
+
+
+class FakePipeline:
+    """Buffers commands until :meth:`execute`; in WATCH mode runs them immediately until ``multi()``."""
+
+    def __init__(self, client: FakeRedis, buffered: bool) -> None:
+        self._client = client
+        self._buffered = buffered
+        self._queue: list[tuple[str, tuple, dict]] = []
+
+    def multi(self) -> None:
+        self._buffered = True
+
+    def watch(self, *_keys: str) -> None:
+        pass
+
+    def __getattr__(self, name: str):
+        method = getattr(self._client, name)
+
+        def call(*args, **kwargs):
+            if not self._buffered:
+                return method(*args, **kwargs)
+            self._queue.append((name, args, kwargs))
+            return self
+
+        return call
+
+    def execute(self) -> list:
+        results = [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._queue]
+        self._queue.clear()
+        return results
+
+    def __enter__(self) -> "FakePipeline":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self._queue.clear()
+
+
+def install_fake_redis(client: FakeRedis | None = None) -> FakeRedis:
+    """
+    Point the shared Redis clients (and so every Redis-backed service) at one
+    :class:`FakeRedis` for the rest of the process; tests use the
+    ``fake_redis`` fixture instead.
+    """
+    from src.services import redis_client
+
+    client = client or FakeRedis()
+    redis_client._clients.update(default=client, cache=client)
+    return client
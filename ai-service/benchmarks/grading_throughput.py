@@ -0,0 +1,185 @@
+"""
+Short-answer grading throughput: JSON over HTTP vs the MessagePack stream.
+
+    python -m benchmarks.grading_throughput
+    python -m benchmarks.grading_throughput --requests 5000 --connections 8 --window 64 --json grading.json
+
+Serves the real grading router under uvicorn and the stream listener on
+loopback, with :class:`benchmarks.fakes.StubEncoder` (tunable latency)
+standing in for SBERT and :class:`benchmarks.fakes.FakeRedis` for Redis.
+Answers are distinct so every one reaches the model.
+
+- ``http``: ``--connections`` keep-alive clients, each posting one
+  ``AIGradingRequest`` at a time, like the exam engine's ``AIGradingClient``.
+- ``stream``: ``--connections`` connections, each keeping ``--window``
+  requests in flight.
+
+Reported per transport: requests/second and latency percentiles.
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks import corpus, fakes
+
+QUESTIONS = 50
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _answers(n: int) -> list[dict]:
+    return [
+        {"questionId": f"q{i % QUESTIONS}", "candidateAnswer": f"{corpus.short_answer(i)[2]} #{i}", "jobId": "bench"}
+        for i in range(n)
+    ]
+
+
+def _summary(latencies: list[float], elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "requestsPerSecond": round(len(ordered) / elapsed, 1),
+        "p50Ms": round(statistics.median(ordered) * 1000, 2),
+        "p99Ms": round(ordered[int(len(ordered) * 0.99) - 1] * 1000, 2),
+    }
+
+
+class Servers:
+    """uvicorn (HTTP) and the grading stream on one event loop in a background thread."""
+
+    def __init__(self) -> None:
+        import uvicorn
+        from fastapi import FastAPI
+
+        from src.routers import grading
+
+        app = FastAPI()
+        app.include_router(grading.router)
+        self.http_port, self.stream_port = _free_port(), _free_port()
+        self._uvicorn = uvicorn.Server(uvicorn.Config(app, port=self.http_port, log_level="warning"))
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._serve()), daemon=True)
+
+    async def _serve(self) -> None:
+        from src.services import grading_stream
+
+        await grading_stream.start("127.0.0.1", self.stream_port)
+        task = asyncio.create_task(self._uvicorn.serve())
+        while not self._uvicorn.started:
+            await asyncio.sleep(0.01)
+        self._ready.set()
+        await task
+        await grading_stream.stop()
+
+    def __enter__(self) -> "Servers":
+        self._thread.start()
+        self._ready.wait(30)
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self._uvicorn.should_exit = True
+        self._thread.join(10)
+
+
+def run_http(port: int, answers: list[dict], connections: int) -> dict:
+    def client(chunk: list[dict]) -> list[float]:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        latencies = []
+        for answer in chunk:
+            start = time.perf_counter()
+            conn.request("POST", "/api/v1/grade/short-answer", body=json.dumps(answer),
+                         headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            json.loads(response.read())
+            latencies.append(time.perf_counter() - start)
+        conn.close()
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(connections) as pool:
+        results = list(pool.map(client, [answers[i::connections] for i in range(connections)]))
+    return _summary([l for chunk in results for l in chunk], time.perf_counter() - start)
+
+
+async def _stream_client(port: int, chunk: list[dict], window: int, latencies: list[float]) -> None:
+    from src.services import grading_stream
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    sent_at: dict[int, float] = {}
+    slots = asyncio.Semaphore(window)
+
+    async def receive() -> None:
+        for _ in chunk:
+            response = await grading_stream.read_frame(reader)
+            latencies.append(time.perf_counter() - sent_at.pop(response["id"]))
+            slots.release()
+
+    receiver = asyncio.create_task(receive())
+    for request_id, answer in enumerate(chunk):
+        await slots.acquire()
+        sent_at[request_id] = time.perf_counter()
+        writer.write(grading_stream.encode_frame({"id": request_id, **answer}))
+        await writer.drain()
+    await receiver
+    writer.close()
+
+
+def run_stream(port: int, answers: list[dict], connections: int, window: int) -> dict:
+    latencies: list[float] = []
+
+    async def main() -> None:
+        await asyncio.gather(*(
+            _stream_client(port, answers[i::connections], window, latencies) for i in range(connections)
+        ))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return _summary(latencies, time.perf_counter() - start)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--window", type=int, default=64, help="in-flight requests per stream connection")
+    parser.add_argument("--model-latency-ms", type=float, default=5, help="fixed cost per encode call")
+    parser.add_argument("--model-per-item-ms", type=float, default=0.2, help="extra cost per encoded text")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    from src.services import answer_key_service
+
+    fakes.install_fake_redis()
+    fakes.install_stub_encoder(fakes.StubEncoder(latency_ms=args.model_latency_ms, per_item_ms=args.model_per_item_ms))
+    for q in range(QUESTIONS):
+        answer_key_service.store_answer_key(f"q{q}", corpus.short_answer(q)[2])
+
+    results = {}
+    with Servers() as servers:
+        # Distinct answers per transport so neither is served from the vector cache
+        results["http"] = run_http(servers.http_port, _answers(args.requests), args.connections)
+        stream_answers = [{**a, "candidateAnswer": a["candidateAnswer"] + " s"} for a in _answers(args.requests)]
+        results["stream"] = run_stream(servers.stream_port, stream_answers, args.connections, args.window)
+
+    for name, r in results.items():
+        print(f"{name:<7} {r['requestsPerSecond']:>9,.1f} req/s  p50={r['p50Ms']:.2f}ms  p99={r['p99Ms']:.2f}ms")
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps({"args": vars(args), "results": results}, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
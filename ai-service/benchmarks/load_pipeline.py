@@ -0,0 +1,386 @@
+"""
+End-to-end load generator for the Kafka pipeline.
+
+    python -m benchmarks.load_pipeline --rates 20 50 100 --duration 30
+    python -m benchmarks.load_pipeline --mix cv_uploaded=0.5,exam_submitted=0.5 \\
+        --model-latency-ms 15 --model-per-item-ms 4 --json load.json
+
+For each offered rate, a producer thread publishes a configurable mix of
+``CV_UPLOADED`` and ``EXAM_SUBMITTED`` events into an in-memory broker.  The
+real ``kafka_consumer._consume_loop`` then polls, validates, deduplicates,
+batches and retries them.  CV events point at generated PDF/DOCX files, so
+extraction and PII masking run for real.  The SBERT model is replaced by
+:class:`benchmarks.fakes.StubEncoder` with tunable latency and Redis by
+:class:`benchmarks.fakes.FakeRedis`.
+
+Reported per rate:
+
+- achieved throughput
+- end-to-end latency percentiles (publish to handler completion)
+- a once-per-second time series of consumer lag and process RSS
+
+A rate counts as sustainable when lag does not keep growing over the second
+half of the run.  ``--stub-nlp`` swaps spaCy lemmatisation for term
+protection only, for machines without ``en_core_web_sm``.
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict, namedtuple
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import psutil
+
+from benchmarks import corpus, fakes
+
+TopicPartition = namedtuple("TopicPartition", ["topic", "partition"])
+
+PARTITIONS = 3
+DEFAULT_MIX = "cv_uploaded=0.7,exam_submitted=0.3"
+SUSTAINABLE_LAG_GROWTH = 0.05  # lag may grow by at most 5% of the offered rate per second
+
+
+class _StopLoad(Exception):
+    """Raised from the fake consumer's poll to end the consume loop."""
+
+
+class FakeBroker:
+    """Append-only in-memory topics with a fixed number of partitions each."""
+
+    def __init__(self, partitions: int = PARTITIONS) -> None:
+        self.partitions = partitions
+        self._logs: dict[TopicPartition, list] = defaultdict(list)
+        self._cond = threading.Condition()
+        self._rr = 0
+
+    def append(self, topic: str, value: bytes, key=None, headers=None) -> SimpleNamespace:
+        with self._cond:
+            self._rr += 1
+            tp = TopicPartition(topic, self._rr % self.partitions)
+            log = self._logs[tp]
+            record = SimpleNamespace(
+                topic=topic, partition=tp.partition, offset=len(log), key=key, value=value,
+                headers=list(headers or []), timestamp=int(time.time() * 1000),
+            )
+            log.append(record)
+            self._cond.notify_all()
+            return record
+
+    def partitions_for(self, topics: list[str]) -> list[TopicPartition]:
+        return [TopicPartition(t, p) for t in topics for p in range(self.partitions)]
+
+    def end_offset(self, tp: TopicPartition) -> int:
+        return len(self._logs[tp])
+
+    def read(self, tp: TopicPartition, offset: int, limit: int) -> list:
+        return self._logs[tp][offset:offset + limit]
+
+    def wait(self, timeout: float) -> None:
+        with self._cond:
+            self._cond.wait(timeout)
+
+
+class FakeConsumer:
+    """The subset of ``KafkaConsumer`` used by ``_consume_loop``, over a :class:`FakeBroker`."""
+
+    def __init__(self, broker: FakeBroker, topics: list[str], stop: threading.Event) -> None:
+        self._broker = broker
+        self._stop = stop
+        self._assigned = broker.partitions_for(topics)
+        self._position = {tp: 0 for tp in self._assigned}
+        self._paused: set = set()
+        self.committed: dict[TopicPartition, int] = {}
+
+    def poll(self, timeout_ms: int = 0, max_records: int = 500) -> dict:
+        if self._stop.is_set():
+            raise _StopLoad
+        deadline = time.monotonic() + timeout_ms / 1000
+        while True:
+            out, budget = {}, max_records
+            for tp in self._assigned:
+                if tp in self._paused or budget <= 0:
+                    continue
+                records = self._broker.read(tp, self._position[tp], budget)
+                if records:
+                    out[tp] = records
+                    self._position[tp] += len(records)
+                    budget -= len(records)
+            remaining = deadline - time.monotonic()
+            if out or remaining <= 0 or self._stop.is_set():
+                return out
+            self._broker.wait(min(remaining, 0.05))
+
+    def commit(self) -> None:
+        self.committed.update(self._position)
+
+    def assignment(self) -> set:
+        return set(self._assigned)
+
+    def pause(self, *tps) -> None:
+        self._paused.update(tps)
+
+    def resume(self, *tps) -> None:
+        self._paused.difference_update(tps)
+
+    def seek(self, tp, offset: int) -> None:
+        self._position[tp] = offset
+
+    def position(self, tp) -> int:
+        return self._position[tp]
+
+    def highwater(self, tp) -> int:
+        return self._broker.end_offset(tp)
+
+
+class FakeProducer:
+    """Producer for retry and dead-letter topics; delivery is immediate."""
+
+    def __init__(self, broker: FakeBroker) -> None:
+        self._broker = broker
+
+    def send(self, topic: str, value: bytes, key=None, headers=None):
+        record = self._broker.append(topic, value, key, headers)
+        metadata = SimpleNamespace(topic=topic, partition=record.partition, offset=record.offset)
+        return SimpleNamespace(get=lambda timeout=None: metadata)
+
+    def flush(self, timeout: float | None = None) -> None:
+        pass
+
+    def close(self, timeout: float | None = None) -> None:
+        pass
+
+
+def _write_cv_files(directory: Path, count: int, fmt: str) -> list[str]:
+    paths = []
+    for i in range(count):
+        path = directory / f"cv-{i}.{fmt}"
+        text = corpus.cv(i)
+        if fmt == "pdf":
+            import fitz
+
+            doc = fitz.open()
+            page = doc.new_page()
+            page.insert_textbox(page.rect + (36, 36, -36, -36), text, fontsize=9)
+            doc.save(str(path))
+            doc.close()
+        else:
+            from docx import Document
+
+            doc = Document()
+            for line in text.splitlines():
+                doc.add_paragraph(line)
+            doc.save(str(path))
+        paths.append(str(path))
+    return paths
+
+
+def _parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip().upper()] = float(weight)
+    total = sum(mix.values())
+    return {topic: weight / total for topic, weight in mix.items()}
+
+
+def _event(topic: str, seq: int, cv_paths: list[str]) -> dict:
+    base = {"applicationId": f"load-{seq}", "candidateId": f"cand-{seq}", "jobId": f"job-{seq % 10}"}
+    if topic == "CV_UPLOADED":
+        return {**base, "cvFilePath": cv_paths[seq % len(cv_paths)]}
+    question, _, answer, _ = corpus.short_answer(seq)
+    return {**base, "answers": {"q1": answer, "q1_prompt": question}}
+
+
+class _Completion:
+    """Wraps the consumer's handlers to record when each event finishes."""
+
+    def __init__(self, kc) -> None:
+        self.done: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._originals = (dict(kc._HANDLERS), dict(kc._BATCH_HANDLERS))
+        for topic, (model, handler) in list(kc._HANDLERS.items()):
+            kc._HANDLERS[topic] = (model, self._wrap(lambda e, h=handler: h(e), lambda e: [e]))
+        for topic, handler in list(kc._BATCH_HANDLERS.items()):
+            kc._BATCH_HANDLERS[topic] = self._wrap(handler, lambda events: events)
+        self._kc = kc
+
+    def _wrap(self, handler, events_of):
+        def run(arg):
+            handler(arg)
+            now = time.perf_counter()
+            with self._lock:
+                for event in events_of(arg):
+                    self.done.setdefault(event.applicationId, now)
+
+        return run
+
+    def restore(self) -> None:
+        self._kc._HANDLERS.clear()
+        self._kc._HANDLERS.update(self._originals[0])
+        self._kc._BATCH_HANDLERS.clear()
+        self._kc._BATCH_HANDLERS.update(self._originals[1])
+
+
+def _percentiles(latencies_ms: np.ndarray) -> dict[str, float]:
+    if not len(latencies_ms):
+        return {}
+    out = {f"p{q}": round(float(np.percentile(latencies_ms, q)), 1) for q in (50, 90, 95, 99)}
+    out["max"] = round(float(latencies_ms.max()), 1)
+    return out
+
+
+def run_rate(rate: float, duration: float, mix: dict[str, float], cv_paths: list[str], drain: float) -> dict:
+    from src.services import kafka_consumer as kc
+
+    fakes.install_fake_redis()
+    broker = FakeBroker()
+    stop = threading.Event()
+    topics = list(mix)
+    retry_topics = [rt for t in kc._HANDLERS for rt in kc.retry_queue.retry_topics(t)]
+    consumer = FakeConsumer(broker, list(kc._HANDLERS) + retry_topics, stop)
+    completion = _Completion(kc)
+    factories = (kc._make_consumer, kc._make_failure_producer)
+    kc._make_consumer = lambda _topics: consumer
+    kc._make_failure_producer = lambda: FakeProducer(broker)
+
+    def consume():
+        try:
+            kc._consume_loop()
+        except _StopLoad:
+            pass
+
+    published: dict[str, float] = {}
+    producing = threading.Event()
+    producing.set()
+
+    def produce():
+        rng = random.Random(7)
+        start = time.perf_counter()
+        seq = 0
+        while producing.is_set():
+            due = start + seq / rate
+            now = time.perf_counter()
+            if due > now:
+                time.sleep(min(due - now, 0.01))
+                continue
+            topic = rng.choices(topics, weights=[mix[t] for t in topics])[0]
+            payload = _event(topic, seq, cv_paths)
+            published[payload["applicationId"]] = time.perf_counter()
+            broker.append(topic, json.dumps(payload).encode(), key=payload["applicationId"].encode())
+            seq += 1
+
+    process = psutil.Process()
+    rss_start = process.memory_info().rss
+    consumer_thread = threading.Thread(target=consume, name="kafka-consumer", daemon=True)
+    producer_thread = threading.Thread(target=produce, name="load-producer", daemon=True)
+    consumer_thread.start()
+    producer_thread.start()
+
+    series = []
+    t0 = time.perf_counter()
+    while True:
+        time.sleep(1)
+        elapsed = time.perf_counter() - t0
+        produced, processed = len(published), len(completion.done)
+        series.append({
+            "t": round(elapsed, 1),
+            "produced": produced,
+            "processed": processed,
+            "lag": produced - processed,
+            "rssMb": round(process.memory_info().rss / 2**20, 1),
+        })
+        if elapsed >= duration and producing.is_set():
+            producing.clear()
+            producer_thread.join()
+            load_end = len(series)
+        if not producing.is_set() and (processed >= len(published) or elapsed >= duration + drain):
+            break
+    stop.set()
+    consumer_thread.join(timeout=10)
+    completion.restore()
+    kc._make_consumer, kc._make_failure_producer = factories
+
+    latencies = np.array([completion.done[k] - published[k] for k in completion.done if k in published]) * 1000
+    load_phase = series[:load_end]
+    half = load_phase[len(load_phase) // 2:]
+    slope = float(np.polyfit([p["t"] for p in half], [p["lag"] for p in half], 1)[0]) if len(half) >= 2 else 0.0
+    processed_in_load = load_phase[-1]["processed"] if load_phase else 0
+    result = {
+        "offeredRate": rate,
+        "published": len(published),
+        "processed": len(completion.done),
+        "throughput": round(processed_in_load / duration, 1),
+        "latencyMs": _percentiles(latencies),
+        "lagSlopePerSecond": round(slope, 2),
+        "sustainable": slope <= SUSTAINABLE_LAG_GROWTH * rate,
+        "rssGrowthMb": round((process.memory_info().rss - rss_start) / 2**20, 1),
+        "series": series,
+    }
+    print(
+        f"rate={rate:>7.1f}/s  throughput={result['throughput']:>7.1f}/s  "
+        f"p50={result['latencyMs'].get('p50', 0):>8.1f}ms  p99={result['latencyMs'].get('p99', 0):>8.1f}ms  "
+        f"lagSlope={slope:>7.2f}/s  rss+={result['rssGrowthMb']}MB  "
+        f"{'sustainable' if result['sustainable'] else 'LAG GROWING'}"
+    )
+    return result
+
+
+def _stub_nlp() -> None:
+    from src.utils import nlp_pipeline
+
+    nlp_pipeline.preprocess_batch = lambda texts: [nlp_pipeline._protect_terms(t) for t in texts]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rates", type=float, nargs="+", default=[10, 25, 50, 100], help="events/second")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load per rate")
+    parser.add_argument("--drain", type=float, default=30, help="max seconds to wait for the backlog afterwards")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="topic=weight pairs")
+    parser.add_argument("--model-latency-ms", type=float, default=10, help="fixed cost per encode call")
+    parser.add_argument("--model-per-item-ms", type=float, default=3, help="extra cost per encoded text")
+    parser.add_argument("--corpus-size", type=int, default=500, help="distinct CV files to cycle through")
+    parser.add_argument("--cv-format", choices=["pdf", "docx"], default="pdf")
+    parser.add_argument("--stub-nlp", action="store_true", help="skip spaCy lemmatisation")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    if args.stub_nlp:
+        _stub_nlp()
+    else:
+        from src.utils import nlp_pipeline
+
+        try:
+            nlp_pipeline.load_model()
+        except (ImportError, OSError) as exc:
+            print(f"spaCy model unavailable ({exc}); install en_core_web_sm or pass --stub-nlp", file=sys.stderr)
+            return 2
+
+    fakes.install_stub_encoder(fakes.StubEncoder(latency_ms=args.model_latency_ms, per_item_ms=args.model_per_item_ms))
+    mix = _parse_mix(args.mix)
+    from src.services import kafka_consumer as kc
+
+    unknown = set(mix) - set(kc._HANDLERS)
+    if unknown:
+        parser.error(f"unknown topics in --mix: {', '.join(sorted(unknown))}")
+    with tempfile.TemporaryDirectory(prefix="load-cvs-") as tmp:
+        cv_paths = _write_cv_files(Path(tmp), args.corpus_size, args.cv_format)
+        results = [run_rate(rate, args.duration, mix, cv_paths, args.drain) for rate in args.rates]
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps({"mix": mix, "args": vars(args), "runs": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
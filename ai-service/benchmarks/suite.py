@@ -0,0 +1,312 @@
+"""
+Hot-path micro-benchmark suite.
+
+    python -m benchmarks.suite                                  # run, print table
+    python -m benchmarks.suite --json out.json                  # machine-readable results
+    python -m benchmarks.suite --compare benchmarks/baseline.json --threshold 0.25
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --only pii_masker.mask keyword_checker.check_keywords
+
+Runs fully offline: text comes from :mod:`benchmarks.corpus`, the SBERT model
+is replaced by :class:`benchmarks.fakes.StubEncoder` and Redis by
+:class:`benchmarks.fakes.FakeRedis`.  Each case is timed best-of-``repeat``
+(after one warm-up call), like ``bench_rank_batch``; ``--compare`` exits
+non-zero when any case is slower than its baseline by more than the
+threshold, or when a case that ran has no entry in the baseline.  Cases whose optional dependency is missing (spaCy model,
+reportlab) are reported as skipped rather than failing the run.
+
+The stored baseline is machine-specific: regenerate it with
+``--save-baseline`` on the hardware the comparison runs on.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from benchmarks import corpus, fakes
+
+DEFAULT_THRESHOLD = 0.25
+
+
+class Skip(Exception):
+    """Raised by a case's setup when an optional dependency is unavailable."""
+
+
+# name -> setup(); setup returns (callable to time, items processed per call)
+CASES: dict[str, Callable[[], tuple[Callable[[], object], int]]] = {}
+
+
+def case(name: str):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+@case("pii_masker.mask")
+def _mask():
+    from src.utils.pii_masker import mask
+
+    cvs = [corpus.cv(i) for i in range(50)]
+    return lambda: [mask(text) for text in cvs], len(cvs)
+
+
+@case("cv_dedup.fingerprint")
+def _fingerprint():
+    from src.services.cv_dedup import fingerprint
+
+    cvs = [corpus.cv(i) for i in range(50)]
+    return lambda: [fingerprint(text) for text in cvs], len(cvs)
+
+
+@case("nlp_pipeline.preprocess_batch")
+def _preprocess():
+    from src.utils import nlp_pipeline
+
+    try:
+        nlp_pipeline.load_model()
+    except (ImportError, OSError) as exc:
+        raise Skip(f"spaCy model unavailable: {exc}") from None
+    cvs = [corpus.cv(i) for i in range(20)]
+    return lambda: nlp_pipeline.preprocess_batch(cvs), len(cvs)
+
+
+@case("keyword_checker.check_keywords")
+def _keywords():
+    from src.services.keyword_checker import check_keywords
+
+    answers = [corpus.short_answer(i) for i in range(5000)]
+    return lambda: [check_keywords(answer, keywords) for _, _, answer, keywords in answers], len(answers)
+
+
+@case("similarity_service._cosine")
+def _cosine():
+    from src.services.similarity_service import _cosine
+
+    encoder = fakes.StubEncoder()
+    vectors = encoder.encode([corpus.cv(i) for i in range(200)]).tolist()
+    jd = encoder.encode(corpus.job_description(0)).tolist()
+    return lambda: [_cosine(v, jd) for v in vectors], len(vectors)
+
+
+@case("embedding_codec.cosine_scores[int8 10k]")
+def _int8_scores():
+    from src.utils import embedding_codec
+
+    encoder = fakes.StubEncoder()
+    matrix, _ = embedding_codec.quantize(encoder.encode([corpus.cv(i % 500) + str(i) for i in range(10_000)]))
+    job = embedding_codec.quantize(encoder.encode(corpus.job_description(0)))[0][0]
+    return lambda: embedding_codec.cosine_scores(matrix, job), len(matrix)
+
+
+@case("vector_cache.put_many+get_many")
+def _vector_cache():
+    from src.services import vector_cache
+
+    fakes.install_fake_redis()
+    texts = [corpus.cv(i) for i in range(200)]
+    vectors = fakes.StubEncoder().encode(texts).tolist()
+
+    def run():
+        vector_cache.put_many(zip(texts, vectors))
+        return vector_cache.get_many(texts)
+
+    return run, len(texts)
+
+
+@case("embedding_service.embed_batch")
+def _embed_batch():
+    from src.services import embedding_service
+
+    fakes.install_stub_encoder()
+    texts = [corpus.cv(i) for i in range(64)]
+
+    def run():
+        # A fresh cache each call so the encode path is exercised, not just hits
+        fakes.install_fake_redis()
+        return embedding_service.embed_batch(texts)
+
+    return run, len(texts)
+
+
+@case("chunked_embedding.embed_documents[long]")
+def _embed_long():
+    from src.services import chunked_embedding
+
+    fakes.install_stub_encoder()
+    # Roughly a 20-page CV each
+    texts = [" ".join(corpus.cv(i * 40 + j) for j in range(40)).lower() for i in range(4)]
+
+    def run():
+        fakes.install_fake_redis()
+        return chunked_embedding.embed_documents(texts)
+
+    return run, len(texts)
+
+
+@case("ranking.rank_batch[10k]")
+def _rank_batch():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from src.routers import ranking
+
+    app = FastAPI()
+    app.include_router(ranking.router)
+    client = TestClient(app)
+    rows = [
+        {k: c[k] for k in ("candidateId", "cvScore", "examScore", "hardFilterPassed")}
+        for c in corpus.candidates(10_000)
+    ]
+    body = json.dumps({"jobId": "bench", "candidates": rows})
+    headers = {"content-type": "application/json"}
+    return lambda: client.post("/rank/batch", content=body, headers=headers), len(rows)
+
+
+@case("bias_service.analyse[5k]")
+def _bias():
+    from src.services import bias_service
+
+    fakes.install_fake_redis()
+    rows = corpus.candidates(5_000)
+    return lambda: bias_service.analyse("bench", rows), len(rows)
+
+
+def _pdf_inputs():
+    try:
+        from src.services import pdf_generator
+    except ImportError as exc:
+        raise Skip(f"PDF dependencies unavailable: {exc}") from None
+    from src.services.attribution_service import AttributionResult
+    from src.services.justification_engine import JustificationInput, generate
+
+    pdf_generator.STORAGE_DIR = Path(tempfile.mkdtemp(prefix="bench-pdf-"))
+    weights = [(w, (-1) ** i * (10 - i) / 20) for i, w in enumerate(corpus.SKILLS[:10])]
+    attribution = AttributionResult(
+        top_positive=[w for w in weights if w[1] > 0],
+        top_negative=[w for w in weights if w[1] < 0],
+        raw_weights=weights,
+    )
+    name = corpus.candidate_name(0)
+    justification = generate(JustificationInput(
+        candidate_name=name, job_title="First Officer", cv_score=78.5, exam_score=64.0,
+        hard_filter_passed=True, final_score=74.2, attribution=attribution,
+    ))
+    return pdf_generator, ("bench-app", name, "First Officer", 78.5, 64.0, 74.2, True, attribution, justification)
+
+
+@case("pdf_generator.generate_pdf")
+def _pdf():
+    pdf_generator, inputs = _pdf_inputs()
+    calls = itertools.count()
+    # Distinct notes per call so every call renders instead of returning the memoized report
+    return lambda: pdf_generator.generate_pdf(*inputs, recruiter_notes=f"Run {next(calls)}"), 1
+
+
+@case("pdf_generator.generate_pdf[unchanged]")
+def _pdf_unchanged():
+    pdf_generator, inputs = _pdf_inputs()
+    return lambda: pdf_generator.generate_pdf(*inputs), 1
+
+
+def _time(fn: Callable[[], object], repeat: int) -> list[float]:
+    fn()  # warm-up: imports, lazy singletons, caches
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run(names: list[str], repeat: int) -> dict:
+    results = {}
+    for name in names:
+        try:
+            fn, items = CASES[name]()
+        except Skip as exc:
+            results[name] = {"skipped": str(exc)}
+            print(f"{name:<36} skipped: {exc}")
+            continue
+        samples = _time(fn, repeat)
+        best = min(samples)
+        results[name] = {
+            "bestSeconds": best,
+            "medianSeconds": statistics.median(samples),
+            "items": items,
+            "itemsPerSecond": round(items / best, 1) if best > 0 else None,
+            "repeat": repeat,
+        }
+        print(f"{name:<36} best={best * 1000:9.3f}ms  median={results[name]['medianSeconds'] * 1000:9.3f}ms  "
+              f"({results[name]['itemsPerSecond']:,} items/s)")
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Cases whose best time regressed by more than *threshold* (0.25 = 25%) against *baseline*."""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "bestSeconds" not in base or "bestSeconds" not in result:
+            continue
+        ratio = result["bestSeconds"] / base["bestSeconds"]
+        if ratio > 1 + threshold:
+            regressions.append({
+                "case": name,
+                "baselineSeconds": base["bestSeconds"],
+                "currentSeconds": result["bestSeconds"],
+                "ratio": round(ratio, 3),
+            })
+    return regressions
+
+
+def missing(current: dict, baseline: dict) -> list[str]:
+    """Cases that ran but have no entry in *baseline*, so a regression in them would go unnoticed."""
+    known = baseline.get("results", {})
+    return [name for name, result in current["results"].items() if "bestSeconds" in result and name not in known]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), help="run a subset of cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a case counts as a regression (default 0.25)")
+    parser.add_argument("--save-baseline", help="write results as the new baseline")
+    args = parser.parse_args(argv)
+
+    current = run(args.only or list(CASES), args.repeat)
+    for path in filter(None, (args.json_out, args.save_baseline)):
+        Path(path).write_text(json.dumps(current, indent=2) + "\n")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(current, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['case']}: {r['baselineSeconds'] * 1000:.3f}ms -> "
+                  f"{r['currentSeconds'] * 1000:.3f}ms ({r['ratio']}x)")
+        unbaselined = missing(current, baseline)
+        for name in unbaselined:
+            print(f"MISSING {name}: not in {args.compare}; regenerate it with --save-baseline")
+        if regressions or unbaselined:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
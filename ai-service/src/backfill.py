@@ -0,0 +1,373 @@
+"""
+Offline bulk re-embedding.
+
+    python -m src.backfill cvs --dir /data/cvs --job-id JOB-42
+    python -m src.backfill cvs --manifest cvs.jsonl --workers 8 --max-rate 200
+    python -m src.backfill answer-keys --manifest answer_keys.jsonl --refresh
+
+Rebuilds what the live pipeline would have written — after a model
+upgrade, a Redis flush or a new ``EMBEDDING_*`` configuration — without
+going through the service one call at a time.
+
+``cvs`` reads CV files from a directory (``--dir``; applicationId is the
+file name without its extension) or a JSON-lines manifest of
+``CV_UPLOADED`` events (``applicationId``, ``candidateId``, ``jobId``,
+``cvFilePath``).  Extraction, PII masking, SimHash fingerprinting and spaCy
+preprocessing run across a process pool; the main process then embeds
+``--batch-size`` CVs at a time, sorted by length across a window of
+several batches so each model call pads little, and writes the vector cache, the near-duplicate index and the
+per-job matrices with pipelined writes.  ``answer-keys`` reads
+``{"questionId", "idealAnswer"}`` lines and caches their embeddings.
+
+Every id written is appended to ``--checkpoint`` after its batch is
+stored, so an interrupted run resumes where it stopped; ``--refresh``
+re-embeds instead of reusing cached vectors, ``--max-rate`` caps
+documents per second and progress (done, rate, ETA, failures) is logged
+every ``--report-seconds``.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from contextlib import nullcontext
+from functools import partial
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from src.models.events import CvUploadedEvent
+
+logger = logging.getLogger("src.backfill")
+
+CV_SUFFIXES = (".pdf", ".docx", ".doc")
+TASK_SIZE = 16  # CVs per process-pool task
+SORT_WINDOW_BATCHES = 8  # batches buffered and sorted by length together
+
+
+@dataclass
+class Prepared:
+    event: CvUploadedEvent
+    preprocessed: str | None = None
+    simhash: int | None = None
+    masked_digest: str | None = None
+    error: str | None = None
+
+
+@dataclass
+class Progress:
+    total: int
+    done: int = 0
+    failed: int = 0
+    skipped: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    _last_report: float = 0.0
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def report(self, every: float, final: bool = False) -> None:
+        now = time.perf_counter()
+        if not final and now - self._last_report < every:
+            return
+        self._last_report = now
+        rate = self.rate()
+        remaining = self.total - self.done - self.failed
+        eta = f"{remaining / rate:.0f}s" if rate and remaining else "-"
+        logger.info(
+            "%s %d/%d done (%d failed, %d already done) %.1f docs/s ETA %s",
+            "Finished:" if final else "Progress:", self.done, self.total, self.failed, self.skipped, rate, eta,
+        )
+
+    def summary(self) -> dict:
+        return {
+            "total": self.total, "done": self.done, "failed": self.failed, "skipped": self.skipped,
+            "seconds": round(time.perf_counter() - self.started, 2), "docsPerSecond": round(self.rate(), 1),
+        }
+
+
+class Checkpoint:
+    """Append-only file of ids already written."""
+
+    def __init__(self, path: str | None) -> None:
+        self.path = Path(path) if path else None
+        self.done: set[str] = set()
+        if self.path is not None and self.path.exists():
+            self.done = {line for line in self.path.read_text().splitlines() if line}
+
+    def record(self, ids: Iterable[str]) -> None:
+        ids = list(ids)
+        self.done.update(ids)
+        if self.path is not None and ids:
+            with open(self.path, "a") as f:
+                f.write("".join(f"{i}\n" for i in ids))
+                f.flush()
+                os.fsync(f.fileno())
+
+
+class Throttle:
+    """Sleeps just enough to keep the overall rate at or under *max_rate* items per second."""
+
+    def __init__(self, max_rate: float) -> None:
+        self.max_rate = max_rate
+        self.started = time.perf_counter()
+        self.count = 0
+
+    def __call__(self, items: int) -> None:
+        self.count += items
+        if self.max_rate > 0:
+            ahead = self.count / self.max_rate - (time.perf_counter() - self.started)
+            if ahead > 0:
+                time.sleep(ahead)
+
+
+# — inputs —
+
+def events_from_dir(directory: str, job_id: str = "") -> list[CvUploadedEvent]:
+    paths = sorted(p for p in Path(directory).rglob("*") if p.suffix.lower() in CV_SUFFIXES)
+    return [CvUploadedEvent(applicationId=p.stem, candidateId=p.stem, jobId=job_id, cvFilePath=str(p)) for p in paths]
+
+
+def read_manifest(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise SystemExit(f"{path}:{number}: invalid JSON ({exc})") from None
+
+
+# — process-pool work —
+
+def _init_worker(level: int) -> None:
+    logging.basicConfig(level=level, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    from src.utils import nlp_pipeline
+
+    nlp_pipeline.load_model()
+
+
+def prepare(events: list[CvUploadedEvent]) -> list[Prepared]:
+    """Extract, mask, fingerprint and preprocess CVs (one ``nlp.pipe`` pass for the task)."""
+    from src.services.cv_dedup import fingerprint, text_digest
+    from src.utils.nlp_pipeline import preprocess_batch
+    from src.utils.pii_masker import mask
+    from src.utils.text_extractor import extract_text
+
+    results, masked = [], []
+    for event in events:
+        try:
+            text = mask(extract_text(event.cvFilePath)).masked_text
+        except Exception as exc:
+            results.append(Prepared(event, error=f"{type(exc).__name__}: {exc}"))
+            continue
+        results.append(Prepared(event, simhash=fingerprint(text), masked_digest=text_digest(text)))
+        masked.append(text)
+    ok = [r for r in results if r.error is None]
+    for result, preprocessed in zip(ok, preprocess_batch(masked)):
+        result.preprocessed = preprocessed
+    return results
+
+
+def start_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Start *workers* extraction processes now.  They are forked, so start
+    them before the embedding model loads torch: a fork taken after torch
+    has started its threads can deadlock, and every worker would carry a
+    copy of the model it never uses.
+    """
+    pool = ProcessPoolExecutor(
+        workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(logging.getLogger().level,),
+    )
+    pool.submit(int).result()  # with fork, the first task starts every worker
+    return pool
+
+
+def _prepared_stream(
+    events: list[CvUploadedEvent], workers: int, task_size: int, pool: ProcessPoolExecutor | None = None,
+) -> Iterator[Prepared]:
+    """Results as tasks finish, with at most ``2 * workers`` tasks in flight to bound memory."""
+    tasks = [events[i:i + task_size] for i in range(0, len(events), task_size)]
+    if workers <= 0:
+        for task in tasks:
+            yield from prepare(task)
+        return
+    with start_pool(workers) if pool is None else nullcontext(pool) as running:
+        pending: set[Future] = set()
+        queue = iter(tasks)
+        for task in queue:
+            pending.add(running.submit(prepare, task))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield from future.result()
+                task = next(queue, None)
+                if task is not None:
+                    pending.add(running.submit(prepare, task))
+
+
+# — writes —
+
+def _store_cvs(batch: list[Prepared], refresh: bool) -> None:
+    from src.services import cv_dedup, job_index
+    from src.services.chunked_embedding import document_vectors
+
+    # Longest first so each model call groups texts of similar length
+    batch = sorted(batch, key=lambda p: len(p.preprocessed), reverse=True)
+    vectors = document_vectors([p.preprocessed for p in batch], refresh=refresh)
+    cv_dedup.record_many([
+        {
+            "applicationId": p.event.applicationId, "candidateId": p.event.candidateId, "jobId": p.event.jobId,
+            "simhash": p.simhash, "maskedDigest": p.masked_digest, "preprocessed": p.preprocessed,
+        }
+        for p in batch
+    ])
+    job_index.add_many(
+        (p.event.jobId, p.event.applicationId, p.event.candidateId, vector)
+        for p, vector in zip(batch, vectors) if p.event.jobId
+    )
+
+
+def backfill_cvs(
+    events: list[CvUploadedEvent],
+    checkpoint: Checkpoint,
+    workers: int,
+    batch_size: int,
+    max_rate: float = 0,
+    refresh: bool = False,
+    report_seconds: float = 10,
+    pool: ProcessPoolExecutor | None = None,
+) -> dict:
+    """
+    Backfill *events*; *pool* is a :func:`start_pool` pool to use instead of
+    starting one.  Prepared CVs are buffered ``SORT_WINDOW_BATCHES`` batches
+    at a time and sorted by length before being cut into batches, so each
+    batch holds CVs of similar length; every batch is checkpointed once stored.
+    """
+    todo = [e for e in events if e.applicationId not in checkpoint.done]
+    progress = Progress(total=len(events), skipped=len(events) - len(todo))
+    throttle = Throttle(max_rate)
+    buffer: list[Prepared] = []
+
+    def flush() -> None:
+        buffer.sort(key=lambda p: len(p.preprocessed), reverse=True)
+        for start in range(0, len(buffer), batch_size):
+            batch = buffer[start:start + batch_size]
+            _store_cvs(batch, refresh)
+            checkpoint.record(p.event.applicationId for p in batch)
+            progress.done += len(batch)
+            throttle(len(batch))
+        buffer.clear()
+
+    for prepared in _prepared_stream(todo, workers, TASK_SIZE, pool):
+        if prepared.error is not None:
+            progress.failed += 1
+            logger.warning("Skipping applicationId=%s: %s", prepared.event.applicationId, prepared.error)
+        else:
+            buffer.append(prepared)
+            if len(buffer) >= batch_size * SORT_WINDOW_BATCHES:
+                flush()
+        progress.report(report_seconds)
+    if buffer:
+        flush()
+    progress.report(report_seconds, final=True)
+    return progress.summary()
+
+
+def backfill_answer_keys(
+    ideal_answers: dict[str, str],
+    checkpoint: Checkpoint,
+    batch_size: int,
+    max_rate: float = 0,
+    refresh: bool = False,
+    report_seconds: float = 10,
+) -> dict:
+    from src.services.answer_key_service import store_answer_keys
+
+    todo = sorted((q for q in ideal_answers if q not in checkpoint.done), key=lambda q: len(ideal_answers[q]))
+    progress = Progress(total=len(ideal_answers), skipped=len(ideal_answers) - len(todo))
+    throttle = Throttle(max_rate)
+    for start in range(0, len(todo), batch_size):
+        batch = todo[start:start + batch_size]
+        store_answer_keys({q: ideal_answers[q] for q in batch}, refresh=refresh)
+        checkpoint.record(batch)
+        progress.done += len(batch)
+        throttle(len(batch))
+        progress.report(report_seconds)
+    progress.report(report_seconds, final=True)
+    return progress.summary()
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-embed CVs or answer keys in bulk")
+    parser.add_argument("kind", choices=["cvs", "answer-keys"])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dir", help="directory of CV files (cvs only)")
+    source.add_argument("--manifest", help="JSON-lines manifest")
+    parser.add_argument("--job-id", default="", help="jobId for CVs read with --dir")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="extraction/preprocessing processes (0 = run in this process)")
+    parser.add_argument("--batch-size", type=int, default=512, help="documents embedded per batch")
+    parser.add_argument("--checkpoint", help="resume file (default: .backfill-<kind>.ckpt next to the input)")
+    parser.add_argument("--refresh", action="store_true", help="re-embed even when a cached vector exists")
+    parser.add_argument("--max-rate", type=float, default=0, help="documents per second (0 = unthrottled)")
+    parser.add_argument("--report-seconds", type=float, default=10)
+    parser.add_argument("--json", dest="json_out", help="write the final report to this file")
+    return parser.parse_args(argv)
+
+
+def _load_embedding_model() -> None:
+    from src.services import embedding_service
+
+    embedding_service.load_model()
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    args = _parse_args(argv)
+    source = args.dir or args.manifest
+    checkpoint = Checkpoint(args.checkpoint or str(Path(source).resolve().parent / f".backfill-{args.kind}.ckpt"))
+    # Fork the extraction workers while this process is still small and single-threaded
+    pool = start_pool(args.workers) if args.kind == "cvs" and args.workers > 0 else None
+
+    with pool or nullcontext():
+        _load_embedding_model()
+
+        runner: Callable[[], dict]
+        if args.kind == "cvs":
+            events = events_from_dir(args.dir, args.job_id) if args.dir else [
+                CvUploadedEvent(**row) for row in read_manifest(args.manifest)
+            ]
+            runner = partial(
+                backfill_cvs,
+                events, checkpoint, args.workers, args.batch_size, args.max_rate, args.refresh, args.report_seconds,
+                pool=pool,
+            )
+        else:
+            if args.dir:
+                raise SystemExit("answer-keys needs --manifest")
+            ideal_answers = {row["questionId"]: row["idealAnswer"] for row in read_manifest(args.manifest)}
+            runner = partial(
+                backfill_answer_keys,
+                ideal_answers, checkpoint, args.batch_size, args.max_rate, args.refresh, args.report_seconds,
+            )
+
+        logger.info("Backfilling %s from %s (checkpoint %s)", args.kind, source, checkpoint.path)
+        report = runner()
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2) + "\n")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
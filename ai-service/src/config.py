@@ -3,14 +3,70 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     sbert_model: str = "all-MiniLM-L6-v2"
+    model_dir: str = ""  # pinned model snapshots; empty = load by name (may download)
+    warmup_token_lengths: list[int] = [16, 128, 384]
     redis_url: str = "redis://localhost:6379"
+    redis_max_connections: int = 64
+    redis_pool_timeout_ms: int = 500
+    redis_connect_timeout_ms: int = 200
+    redis_socket_timeout_ms: int = 1000
+    redis_cache_timeout_ms: int = 100
+    redis_breaker_failures: int = 5
+    redis_breaker_cooldown_seconds: float = 30.0
     chroma_path: str = "./chroma_db"
     spring_callback_url: str = "http://localhost:8080"
     kafka_bootstrap_servers: str = "localhost:9092"
     pdf_storage_dir: str = "./reports"
+    pdf_sweep_grace_seconds: int = 300  # superseded feedback PDFs outlive their replacement this long
+    embedding_batch_size: int = 32
+    embedding_quantization: str = "none"  # none | int8
+    embedding_projection_path: str = ""  # PCA .npz from `python -m src.utils.embedding_codec fit`
+    embedding_long_documents: bool = True  # pool overlapping windows instead of truncating long CVs
+    embedding_pooling: str = "mean"  # mean | max
+    embedding_chunk_tokens: int = 0  # 0 = the model's max sequence length
+    embedding_chunk_overlap_tokens: int = 32
+    embedding_chunk_group: int = 256  # windows encoded per embed_batch call
+    embedding_max_chunks: int = 128
+    job_matrix_dir: str = "./job_matrices"  # memory-mapped per-job CV vectors, shared by all workers
+    kafka_max_poll_records: int = 500
+    kafka_poll_timeout_ms: int = 1000
+    cv_batch_workers: int = 4
+    kafka_retry_max_attempts: int = 4
+    kafka_retry_backoff_ms: int = 2000
+    kafka_retry_backoff_max_ms: int = 60000
+    kafka_replay_mode: bool = False
+    cv_dedup_enabled: bool = True
+    cv_dedup_threshold: float = 0.9  # SimHash similarity at which a CV reuses an earlier one
+    cv_dedup_ttl_seconds: int = 60 * 60 * 24 * 90
+    idempotency_ttl_seconds: int = 60 * 60 * 24 * 7
+    worker_processes: int = 0  # 0 = one per CPU core
+    worker_torch_threads: int = 2
+    worker_state_dir: str = "/tmp/eaa-ai-workers"
+    worker_restart_backoff_seconds: float = 1.0  # doubled per recent crash of the same worker
+    worker_restart_backoff_max_seconds: float = 60.0
+    worker_crash_limit: int = 10  # crashes within the window after which the supervisor gives up
+    worker_crash_window_seconds: float = 300.0
+    bias_permutation_workers: int = 0  # >1 spreads permutation resamples over a process pool
+    tracing_exporter: str = "none"  # none | file | otlp
+    tracing_file_path: str = "./traces.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    tracing_sample_ratio: float = 0.1
+    grading_stream_host: str = "0.0.0.0"
+    grading_stream_port: int = 8001  # MessagePack grading transport; 0 disables
+    grading_batch_size: int = 64
+    grading_batch_wait_ms: float = 2.0
+    grading_max_pending: int = 1024
+    admin_token: str = ""  # empty disables the /admin endpoints
+    profile_max_stored: int = 100  # per-request profiles kept on disk; the oldest are removed
+    cpu_workers: int = 0  # 0 = one per CPU core
+    io_workers: int = 32
+    admission_queue_factor: int = 4  # queued requests allowed per concurrency slot
+    admission_queue_timeout_ms: int = 2000
+    admission_limits: dict[str, tuple[int, int]] = {}  # route -> (concurrency, queue)
 
     class Config:
         env_file = ".env"
+        protected_namespaces = ("settings_",)  # allow model_dir
 
 
 settings = Settings()
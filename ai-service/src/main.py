@@ -1,10 +1,15 @@
+import inspect
 import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from starlette.concurrency import run_in_threadpool
 
-from src.routers import bias, health, ranking
-from src.services.embedding_service import load_model
+from src.config import settings
+from src.routers import bias, cv, grading, health, jobs, leaderboard, metrics, profiling, ranking
+from src.services import grading_stream, startup
 from src.services.kafka_consumer import start_consumer
+from src.utils import executors, profiler, tracing
+from src.utils.admission import AdmissionMiddleware
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,10 +21,77 @@ app = FastAPI(title="EAA AI Service")
 
 @app.on_event("startup")
 def startup_event() -> None:
-    load_model()
-    start_consumer()
+    tracing.configure()
+    # Models load and warm up in the background; /health/ready is 503 until then.
+    # Under src.supervisor they are already loaded, warmed and shared copy-on-write.
+    startup.begin(on_ready=start_consumer)
 
 
+@app.on_event("startup")
+async def start_grading_stream() -> None:
+    if settings.grading_stream_port:
+        await grading_stream.start(settings.grading_stream_host, settings.grading_stream_port)
+
+
+@app.on_event("shutdown")
+async def stop_grading_stream() -> None:
+    await grading_stream.stop()
+
+
+@app.on_event("shutdown")
+def shutdown_event() -> None:
+    executors.shutdown()
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Continue the caller's trace (W3C ``traceparent``) for every request."""
+    if not tracing.is_enabled():
+        return await call_next(request)
+    parent = tracing.extract_http(request.headers)
+    with tracing.span(f"{request.method} {request.url.path}", parent=parent, kind="server") as span:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        if span is not None:
+            # Name by route template so spans group per endpoint, not per ID
+            if route is not None:
+                span.update_name(f"{request.method} {route.path}")
+            span.set_attribute("http.response.status_code", response.status_code)
+        return response
+
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    """Sample the stacks of one request when an admin sends ``X-Profile-Request: 1``."""
+    if request.headers.get(profiling.PROFILE_REQUEST_HEADER) != "1" or not profiling.is_admin(
+        request.headers.get("X-Admin-Token")
+    ):
+        return await call_next(request)
+    sampler = profiler.StackSampler(interval_ms=1).start()
+    try:
+        response = await call_next(request)
+    finally:
+        await run_in_threadpool(sampler.stop)
+    endpoint = getattr(request.scope.get("route"), "endpoint", None)
+    # Offloaded handlers run on an executor thread; filter on the real handler, not its async wrapper
+    endpoint = inspect.unwrap(endpoint) if endpoint is not None else None
+    collapsed = sampler.collapsed(only_through=getattr(endpoint, "__code__", None))
+    response.headers[profiling.PROFILE_ID_HEADER] = await run_in_threadpool(
+        profiling.save_request_profile, collapsed,
+    )
+    return response
+
+
+# Added last so it is outermost: overloaded requests are shed before tracing or profiling start
+app.add_middleware(AdmissionMiddleware)
+
 app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(profiling.router)
 app.include_router(ranking.router)
+app.include_router(leaderboard.router)
 app.include_router(bias.router)
+app.include_router(cv.router)
+app.include_router(jobs.router)
+app.include_router(grading.router)
+ranking.register_openapi_schemas(app)
@@ -1,14 +1,18 @@
 """
 Bias detection router (FR-76).
 
-POST /bias/analyse   — run analysis for a job batch
-GET  /bias/report/{job_id} — retrieve stored report (FR-40 admin analytics)
+POST   /bias/analyse            — run analysis for a job batch (groupBy → permutation tests)
+POST   /bias/stream/{job_id}    — push newly produced scores into the live accumulators
+DELETE /bias/stream/{job_id}    — discard the live accumulators
+GET    /bias/report/{job_id}    — live report, else stored report (FR-40 admin analytics);
+                                  ?groupBy=a&groupBy=b returns the stored multi-attribute report
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
-from src.services import bias_service
+from src.services import bias_engine, bias_service
+from src.utils import executors
 
 router = APIRouter(prefix="/bias")
 
@@ -17,25 +21,75 @@ class CandidateRecord(BaseModel):
     candidateId: str
     cohort: str = Field(description="University name or geographic indicator")
     cvScore: float = Field(ge=0, le=100)
+    attributes: dict[str, str] = Field(
+        default_factory=dict, description="Extra grouping attributes, e.g. university and region",
+    )
 
 
 class AnalyseRequest(BaseModel):
     jobId: str
     candidates: list[CandidateRecord] = Field(min_length=1)
+    groupBy: list[str] | None = Field(
+        default=None, description="Attributes for permutation testing; intersections are included",
+    )
+    permutations: int = Field(default=bias_engine.DEFAULT_PERMUTATIONS, ge=100, le=100_000)
+    alpha: float = Field(default=bias_engine.DEFAULT_ALPHA, gt=0, lt=1)
+    minCohortSize: int = Field(default=bias_engine.DEFAULT_MIN_COHORT_SIZE, ge=1)
+
+
+class StreamRequest(BaseModel):
+    candidates: list[CandidateRecord] = Field(min_length=1)
+
+
+def _unavailable() -> HTTPException:
+    return HTTPException(status_code=503, detail="Bias score store unavailable; retry later", headers={"Retry-After": "1"})
 
 
 @router.post("/analyse")
+@executors.offload(executors.CPU)
 def analyse(body: AnalyseRequest):
+    candidates = [c.model_dump() for c in body.candidates]
     try:
-        report = bias_service.analyse(body.jobId, [c.model_dump() for c in body.candidates])
+        if body.groupBy:
+            report = bias_service.analyse_by_attributes(
+                body.jobId,
+                candidates,
+                body.groupBy,
+                permutations=body.permutations,
+                alpha=body.alpha,
+                min_cohort_size=body.minCohortSize,
+            )
+        else:
+            report = bias_service.analyse(body.jobId, candidates)
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc))
     return {"status": "ok", "data": report}
 
 
+@router.post("/stream/{job_id}")
+@executors.offload(executors.IO)
+def push_scores(job_id: str, body: StreamRequest):
+    try:
+        total = bias_service.push(job_id, [c.model_dump() for c in body.candidates])
+    except bias_service.Unavailable:
+        raise _unavailable()
+    return {"status": "ok", "data": {"jobId": job_id, "accepted": len(body.candidates), "totalCandidates": total}}
+
+
+@router.delete("/stream/{job_id}")
+@executors.offload(executors.IO)
+def reset_stream(job_id: str):
+    try:
+        bias_service.reset_stream(job_id)
+    except bias_service.Unavailable:
+        raise _unavailable()
+    return {"status": "ok"}
+
+
 @router.get("/report/{job_id}")
-def get_report(job_id: str):
-    report = bias_service.get_report(job_id)
+@executors.offload(executors.IO)
+def get_report(job_id: str, groupBy: list[str] | None = Query(default=None)):
+    report = bias_service.get_report(job_id, groupBy)
     if report is None:
         raise HTTPException(status_code=404, detail=f"No bias report found for jobId={job_id}")
     return {"status": "ok", "data": report}
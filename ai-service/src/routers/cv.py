@@ -0,0 +1,29 @@
+"""
+CV router.
+
+GET /cv/duplicates?applicationId=… — near-duplicate CVs of an application
+                                     (SimHash similarity, see ``cv_dedup``),
+                                     including which CV each one reused
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+
+from src.services import cv_dedup
+from src.utils import executors
+
+router = APIRouter(prefix="/cv")
+
+
+@router.get("/duplicates")
+@executors.offload(executors.IO)
+def get_duplicates(
+    applicationId: str,
+    threshold: float | None = Query(default=None, ge=0.5, le=1, description="Defaults to CV_DEDUP_THRESHOLD"),
+):
+    try:
+        result = cv_dedup.duplicates_of(applicationId, threshold)
+    except cv_dedup.Unavailable:
+        raise HTTPException(status_code=503, detail="Duplicate index unavailable; retry later", headers={"Retry-After": "1"})
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"applicationId={applicationId} has no indexed CV")
+    return {"status": "ok", "data": result}
@@ -0,0 +1,47 @@
+"""
+Grading router — short-answer scoring for the exam engine (FR-56).
+
+POST /api/v1/grade/short-answer — AIGradingRequest {questionId, candidateAnswer,
+                                  jobId[, idealAnswer]} -> AIGradingResponse
+                                  {score: 0–100}
+
+Concurrent requests are graded together (``grading_service.Batcher``).  For
+batch-exam load the same requests can be multiplexed over one connection as
+MessagePack frames on GRADING_STREAM_PORT (``grading_stream``).
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from src.services import grading_service
+from src.utils import metrics
+
+router = APIRouter(prefix="/api/v1/grade")
+
+
+class GradingRequest(BaseModel):
+    questionId: str
+    candidateAnswer: str
+    jobId: str
+    idealAnswer: Optional[str] = None
+
+
+class GradingResponse(BaseModel):
+    score: float
+
+
+@router.post("/short-answer", response_model=GradingResponse)
+async def grade_short_answer(body: GradingRequest):
+    request = grading_service.GradeRequest(body.questionId, body.candidateAnswer, body.jobId, body.idealAnswer)
+    try:
+        score = await grading_service.get_batcher().submit(request)
+    except grading_service.Overloaded:
+        metrics.GRADING_REQUESTS.labels("http", "overloaded").inc()
+        raise HTTPException(status_code=503, detail="Grading queue full; retry later", headers={"Retry-After": "1"})
+    if score is None:
+        metrics.GRADING_REQUESTS.labels("http", "no_answer_key").inc()
+        raise HTTPException(status_code=404, detail=f"No answer key for questionId={body.questionId}")
+    metrics.GRADING_REQUESTS.labels("http", "ok").inc()
+    return GradingResponse(score=score)
@@ -1,16 +1,32 @@
 """
 Health check endpoint (FR-77).
 
-GET /health → { status, modelLoaded, cpuUsagePercent, ramUsageMb, gpuMemoryMb }
+GET /health → { status, modelLoaded, cpuUsagePercent, ramUsageMb, gpuMemoryMb, redis, admission }
 
 status is "UP" when the SBERT model is loaded, "DEGRADED" otherwise.
-gpuMemoryMb is omitted when no CUDA device is available.
+gpuMemoryMb is omitted when no CUDA device is available.  ``redis`` reports
+the cache circuit breaker and a ping through the async client; the ping
+bypasses the breaker, and Redis being down does not change ``status``
+since every Redis-backed cache path has a fallback.
+``admission`` shows in-flight and queued requests per limited route.  This
+route is ``async`` and never admission-limited, so it answers under load.
+
+GET /health/ready is the readiness probe: 503 until the models are loaded
+and warmed (see ``src.services.startup``), then 200.  Point load balancer
+and Kubernetes readiness checks here and liveness checks at /health.
+
+GET /health/workers aggregates the status snapshots of every worker when
+running under ``python -m src.supervisor``.
 """
 
+import asyncio
 import logging
 
 import psutil
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from src.utils import admission
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +46,8 @@ def _gpu_memory_mb() -> float | None:
 
 
 @router.get("/health")
-def health_check():
+async def health_check():
+    from src.services import redis_client
     from src.services.embedding_service import _model
 
     model_loaded = _model is not None
@@ -47,8 +64,47 @@ def health_check():
         "ramUsageMb": ram_mb,
     }
 
-    gpu_mb = _gpu_memory_mb()
+    # The first call imports torch; keep it off the event loop (and off the IO pool, which may be saturated)
+    gpu_mb = await asyncio.to_thread(_gpu_memory_mb)
     if gpu_mb is not None:
         response["gpuMemoryMb"] = gpu_mb
 
+    ping_ms = await redis_client.ping()
+    response["redis"] = {
+        "reachable": ping_ms is not None,
+        "pingMs": ping_ms,
+        "circuit": redis_client.breaker.snapshot(),
+    }
+    response["admission"] = admission.snapshot()
     return response
+
+
+@router.get("/health/ready")
+async def readiness():
+    from src.services import startup
+
+    report = startup.report()
+    report["status"] = "READY" if report["ready"] else "STARTING"
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
+@router.get("/health/workers")
+def workers_health():
+    from src.services import worker_registry
+
+    workers = worker_registry.collect()
+    up = sum(1 for w in workers if w["status"] == "UP")
+    if not workers:
+        status = "DOWN"
+    elif up == len(workers):
+        status = "UP"
+    else:
+        status = "DEGRADED"
+
+    return {
+        "status": status,
+        "workerCount": len(workers),
+        "workersUp": up,
+        "totalPssMb": round(sum(w.get("pssMb", 0.0) for w in workers), 2),
+        "workers": workers,
+    }
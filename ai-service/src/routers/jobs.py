@@ -0,0 +1,58 @@
+"""
+Job router.
+
+POST /jobs/{job_id}/rescore — re-score every indexed CV of a job against an
+                              edited description in one matrix product;
+                              returns (and publishes on CV_SCORES_UPDATED)
+                              only the scores that changed; 503 when the
+                              publish is not acknowledged
+DELETE /jobs/{job_id}/applications/{application_id}
+                            — drop a withdrawn application from the job's
+                              index so re-scores no longer include it
+
+Job ids must be usable as a matrix-store directory name (422 otherwise);
+503 when the job's index cannot be reached.
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Path
+from pydantic import BaseModel, Field
+
+from src.services import job_index, job_matrix_store
+from src.utils import executors
+
+router = APIRouter(prefix="/jobs")
+
+JobId = Annotated[str, Path(pattern=job_matrix_store.JOB_ID_PATTERN)]
+
+
+def _unavailable(detail: str) -> HTTPException:
+    return HTTPException(status_code=503, detail=f"{detail}; retry later", headers={"Retry-After": "1"})
+
+
+class RescoreRequest(BaseModel):
+    description: str = Field(min_length=1)
+    publish: bool = Field(default=True, description="Publish changed scores on CV_SCORES_UPDATED")
+
+
+@router.post("/{job_id}/rescore")
+@executors.offload(executors.CPU)
+def rescore_job(job_id: JobId, body: RescoreRequest):
+    try:
+        result = job_index.rescore(job_id, body.description, publish=body.publish)
+    except job_index.PublishFailed:
+        raise _unavailable("Score publish failed")
+    except job_index.Unavailable:
+        raise _unavailable("Job index unavailable")
+    return {"status": "ok", "data": result}
+
+
+@router.delete("/{job_id}/applications/{application_id}")
+@executors.offload(executors.IO)
+def withdraw_application(job_id: JobId, application_id: str):
+    try:
+        job_index.remove(job_id, [application_id])
+    except job_index.Unavailable:
+        raise _unavailable("Job index unavailable")
+    return {"status": "ok"}
@@ -0,0 +1,86 @@
+"""
+Incremental leaderboard router (FR-67).
+
+PUT    /rank/leaderboard/{job_id}/candidates/{candidate_id} — update one candidate's scores
+GET    /rank/leaderboard/{job_id}                           — paginated top-k
+GET    /rank/leaderboard/{job_id}/candidates/{candidate_id} — rank of one candidate
+DELETE /rank/leaderboard/{job_id}/candidates/{candidate_id} — drop a candidate
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field, model_validator
+
+from src.services import leaderboard_service
+from src.utils import executors
+
+router = APIRouter(prefix="/rank/leaderboard")
+
+
+def _unavailable() -> HTTPException:
+    return HTTPException(status_code=503, detail="Leaderboard store unavailable; retry later", headers={"Retry-After": "1"})
+
+
+class ScoreUpdate(BaseModel):
+    cvScore: float | None = Field(default=None, ge=0, le=100)
+    examScore: float | None = Field(default=None, ge=0, le=100)
+    hardFilterPassed: bool | None = None
+
+    @model_validator(mode="after")
+    def _at_least_one(self) -> "ScoreUpdate":
+        if self.cvScore is None and self.examScore is None and self.hardFilterPassed is None:
+            raise ValueError("at least one of cvScore, examScore, hardFilterPassed is required")
+        return self
+
+
+@router.put("/{job_id}/candidates/{candidate_id}")
+@executors.offload(executors.IO)
+def update_candidate(job_id: str, candidate_id: str, body: ScoreUpdate):
+    try:
+        entry = leaderboard_service.update(
+            job_id,
+            candidate_id,
+            cv_score=body.cvScore,
+            exam_score=body.examScore,
+            hard_filter_passed=body.hardFilterPassed,
+        )
+    except leaderboard_service.Unavailable:
+        raise _unavailable()
+    return {"status": "ok", "data": entry}
+
+
+@router.get("/{job_id}")
+@executors.offload(executors.IO)
+def get_leaderboard(
+    job_id: str,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=1000),
+):
+    try:
+        page = leaderboard_service.top(job_id, offset, limit)
+    except leaderboard_service.Unavailable:
+        raise _unavailable()
+    return {"status": "ok", "data": page}
+
+
+@router.get("/{job_id}/candidates/{candidate_id}")
+@executors.offload(executors.IO)
+def get_candidate_rank(job_id: str, candidate_id: str):
+    try:
+        entry = leaderboard_service.rank_of(job_id, candidate_id)
+    except leaderboard_service.Unavailable:
+        raise _unavailable()
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"candidateId={candidate_id} not ranked for jobId={job_id}")
+    return {"status": "ok", "data": entry}
+
+
+@router.delete("/{job_id}/candidates/{candidate_id}")
+@executors.offload(executors.IO)
+def remove_candidate(job_id: str, candidate_id: str):
+    try:
+        removed = leaderboard_service.remove(job_id, candidate_id)
+    except leaderboard_service.Unavailable:
+        raise _unavailable()
+    if not removed:
+        raise HTTPException(status_code=404, detail=f"candidateId={candidate_id} not ranked for jobId={job_id}")
+    return {"status": "ok"}
@@ -0,0 +1,30 @@
+"""
+Prometheus scrape endpoint.
+
+GET /metrics → Prometheus text exposition format
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set (supervisor mode) the response
+aggregates the metric files written by every worker process.
+"""
+
+import os
+
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+router = APIRouter()
+
+
+def _registry():
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    from prometheus_client import multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,148 @@
+"""
+Admin-only on-demand profiling.
+
+GET /admin/profile/cpu                  — sample all threads for N seconds (collapsed stacks)
+GET /admin/profile/memory               — tracemalloc allocation growth over N seconds
+GET /admin/profile/requests/{id}        — profile of one request sent with ``X-Profile-Request: 1``
+
+Every call needs ``X-Admin-Token`` matching ``ADMIN_TOKEN``; with no token
+configured the endpoints are disabled.  Captures run on the request's worker
+thread and a sampler thread, never on the event loop, so other requests are
+served normally while a profile is being taken.
+"""
+
+import hmac
+import os
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from src.config import settings
+from src.utils import profiler
+
+PROFILE_REQUEST_HEADER = "X-Profile-Request"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+_cpu_lock = threading.Lock()
+_memory_lock = threading.Lock()
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def is_admin(token: str | None) -> bool:
+    return bool(settings.admin_token) and token is not None and hmac.compare_digest(token, settings.admin_token)
+
+
+def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (ADMIN_TOKEN not set)")
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin/profile", dependencies=[Depends(require_admin)], include_in_schema=False)
+
+
+def _profile_dir() -> Path:
+    path = Path(settings.worker_state_dir) / "profiles"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def save_request_profile(collapsed: str) -> str:
+    """
+    Store a per-request profile where any worker can serve it; returns its ID.
+    Only the newest ``PROFILE_MAX_STORED`` profiles are kept.
+    """
+    profile_id = uuid.uuid4().hex
+    path = _profile_dir() / f"{profile_id}.folded"
+    path.write_text(collapsed, encoding="utf-8")
+    _prune_profiles(keep=path)
+    return profile_id
+
+
+def _prune_profiles(keep: Path) -> None:
+    others = []
+    for entry in os.scandir(keep.parent):
+        if entry.name.endswith(".folded") and entry.name != keep.name:
+            try:
+                others.append((entry.stat().st_mtime_ns, entry.path))
+            except FileNotFoundError:
+                continue  # pruned by another worker
+    for _, path in sorted(others)[:max(0, len(others) - settings.profile_max_stored + 1)]:
+        Path(path).unlink(missing_ok=True)
+
+
+@router.get("/cpu", response_class=PlainTextResponse)
+def cpu_profile(
+    seconds: float = Query(default=10, gt=0, le=120),
+    intervalMs: float = Query(default=profiler.DEFAULT_INTERVAL_MS, ge=1, le=100),
+):
+    if not _cpu_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A CPU profile is already being captured")
+    try:
+        sampler = profiler.sample(seconds, intervalMs)
+    finally:
+        _cpu_lock.release()
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={"X-Profile-Samples": str(sampler.sample_count)},
+    )
+
+
+@router.get("/memory")
+def memory_profile(
+    seconds: float = Query(default=10, gt=0, le=120),
+    top: int = Query(default=50, ge=1, le=500),
+    groupBy: str = Query(default="lineno", pattern="^(lineno|filename|traceback)$"),
+):
+    if not _memory_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A memory profile is already being captured")
+    started_here = not tracemalloc.is_tracing()
+    try:
+        if started_here:
+            tracemalloc.start(25 if groupBy == "traceback" else 1)
+        before = tracemalloc.take_snapshot()
+        time.sleep(seconds)
+        after = tracemalloc.take_snapshot()
+        traced_current, traced_peak = tracemalloc.get_traced_memory()
+    finally:
+        # Tracing slows every allocation, so only leave it on if someone else turned it on
+        if started_here:
+            tracemalloc.stop()
+        _memory_lock.release()
+
+    stats = after.compare_to(before, groupBy)[:top]
+    return {
+        "status": "ok",
+        "data": {
+            "seconds": seconds,
+            "tracedBytes": traced_current,
+            "peakTracedBytes": traced_peak,
+            "allocations": [
+                {
+                    "location": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+                    "sizeBytes": stat.size,
+                    "sizeDiffBytes": stat.size_diff,
+                    "count": stat.count,
+                    "countDiff": stat.count_diff,
+                }
+                for stat in stats
+            ],
+        },
+    }
+
+
+@router.get("/requests/{profile_id}", response_class=PlainTextResponse)
+def request_profile(profile_id: str):
+    if not _PROFILE_ID.match(profile_id):
+        raise HTTPException(status_code=404, detail=f"No profile {profile_id}")
+    path = _profile_dir() / f"{profile_id}.folded"
+    if not path.exists():
+        raise HTTPException(status_code=404, detail=f"No profile {profile_id}")
+    return PlainTextResponse(path.read_text(encoding="utf-8"))
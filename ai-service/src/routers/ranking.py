@@ -1,8 +1,34 @@
-from fastapi import APIRouter
-from pydantic import BaseModel, Field
+"""
+Batch ranking router (FR-67).
+
+POST /rank/batch — rank candidates by the 40/40/20 final score
+
+``topK`` limits the response to the best k candidates.  Very large batches
+can be streamed as NDJSON (one ranked candidate per line) with
+``?stream=true`` or ``Accept: application/x-ndjson``.
+
+The body is decoded straight into columns rather than one Pydantic model
+per candidate; a body that fails the fast checks is re-validated with
+:class:`BatchRankRequest` so errors keep FastAPI's 422 format.
+"""
+
+import json
+from typing import Any
+
+import numpy as np
+from fastapi import APIRouter, Depends, FastAPI, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+
+from src.services import ranking_engine
+from src.utils import executors
 
 router = APIRouter(prefix="/rank")
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+_STREAM_CHUNK_ROWS = 1000
+
 
 class CandidateInput(BaseModel):
     candidateId: str
@@ -21,6 +47,7 @@ class CandidateResult(BaseModel):
 
 class BatchRankRequest(BaseModel):
     candidates: list[CandidateInput]
+    topK: int | None = Field(default=None, ge=1)
 
 
 class BatchRankResponse(BaseModel):
@@ -28,22 +55,108 @@ class BatchRankResponse(BaseModel):
 
 
 def _compute_final(c: CandidateInput) -> float:
-    if not c.hardFilterPassed:
-        return 0.0
-    return round(c.cvScore * 0.4 + c.examScore * 0.4 + 100 * 0.2, 2)
-
-
-@router.post("/batch", response_model=BatchRankResponse)
-def rank_batch(body: BatchRankRequest) -> BatchRankResponse:
-    results = [
-        CandidateResult(
-            candidateId=c.candidateId,
-            cvScore=c.cvScore,
-            examScore=c.examScore,
-            hardFilterPassed=c.hardFilterPassed,
-            finalScore=_compute_final(c),
-        )
-        for c in body.candidates
-    ]
-    results.sort(key=lambda r: r.finalScore, reverse=True)
-    return BatchRankResponse(ranked=results)
+    return ranking_engine.final_score(c.cvScore, c.examScore, c.hardFilterPassed)
+
+
+def _wants_stream(request: Request, stream: bool) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _ndjson(batch: ranking_engine.RankedBatch):
+    lines: list[str] = []
+    for row in batch.rows():
+        lines.append(json.dumps(row))
+        if len(lines) == _STREAM_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines.clear()
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+class _NotFastPath(Exception):
+    pass
+
+
+def _columns(body) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray, int | None]:
+    """Columns of a well-formed request; raises :class:`_NotFastPath` for anything else."""
+    try:
+        candidates = body["candidates"]
+        top_k = body.get("topK")
+        ids = [c["candidateId"] for c in candidates]
+        cv = [c["cvScore"] for c in candidates]
+        exam = [c["examScore"] for c in candidates]
+        passed = [c["hardFilterPassed"] for c in candidates]
+    except (KeyError, TypeError, AttributeError):
+        raise _NotFastPath from None
+    if not isinstance(candidates, list) or not (top_k is None or (type(top_k) is int and top_k >= 1)):
+        raise _NotFastPath
+    if {type(v) for v in ids} - {str} or {type(v) for v in cv + exam} - {int, float} or {type(v) for v in passed} - {bool}:
+        raise _NotFastPath
+    cv_col = np.array(cv, dtype=np.float64)
+    exam_col = np.array(exam, dtype=np.float64)
+    scores = np.concatenate([cv_col, exam_col])
+    if not np.all((scores >= 0) & (scores <= 100)):  # also rejects NaN
+        raise _NotFastPath
+    return ids, cv_col, exam_col, np.array(passed, dtype=bool), top_k
+
+
+def _rank_body(raw: bytes) -> ranking_engine.RankedBatch:
+    try:
+        ids, cv, exam, passed, top_k = _columns(json.loads(raw))
+    except (ValueError, _NotFastPath):
+        try:
+            body = BatchRankRequest.model_validate_json(raw)
+        except ValidationError as exc:
+            raise RequestValidationError([{**e, "loc": ("body", *e["loc"])} for e in exc.errors()]) from None
+        candidates = body.candidates
+        ids = [c.candidateId for c in candidates]
+        cv = [c.cvScore for c in candidates]
+        exam = [c.examScore for c in candidates]
+        passed = [c.hardFilterPassed for c in candidates]
+        top_k = body.topK
+    return ranking_engine.rank(ids, cv, exam, passed, top_k=top_k)
+
+
+async def _raw_body(request: Request) -> bytes:
+    return await request.body()
+
+
+def _component_schemas(model: type[BaseModel]) -> dict[str, dict[str, Any]]:
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    return {model.__name__: schema, **schema.pop("$defs", {})}
+
+
+# FastAPI never sees BatchRankRequest because the handler reads the raw body,
+# so its schema (and the models it refers to) is published by hand.
+_REQUEST_SCHEMAS = _component_schemas(BatchRankRequest)
+
+
+def register_openapi_schemas(app: FastAPI) -> None:
+    """Add the raw-body request schemas to ``app``'s OpenAPI components."""
+    default_openapi = app.openapi
+
+    def openapi() -> dict[str, Any]:
+        schema = default_openapi()
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(_REQUEST_SCHEMAS)
+        return schema
+
+    app.openapi = openapi
+
+
+@router.post(
+    "/batch",
+    responses={200: {"model": BatchRankResponse}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": {"$ref": "#/components/schemas/BatchRankRequest"}}},
+        },
+    },
+)
+@executors.offload(executors.CPU)
+def rank_batch(request: Request, stream: bool = False, raw: bytes = Depends(_raw_body)):
+    batch = _rank_body(raw)
+    if _wants_stream(request, stream):
+        return StreamingResponse(_ndjson(batch), media_type=NDJSON_MEDIA_TYPE)
+    # Rows already match CandidateResult; skip re-validating each one
+    return JSONResponse({"ranked": list(batch.rows())})
@@ -1,23 +1,57 @@
 import logging
-from typing import List
+
+import numpy as np
 
 from src.services import vector_cache
-from src.services.embedding_service import embed
+from src.services.embedding_service import embed, embed_batch
+from src.utils import tracing
 
 logger = logging.getLogger(__name__)
 
 
-def store_answer_key(question_id: str, ideal_answer: str) -> List[float]:
+def _key(question_id: str) -> str:
+    return f"answerkey:{question_id}"
+
+
+@tracing.traced()
+def store_answer_key(question_id: str, ideal_answer: str) -> np.ndarray:
     """Embed the ideal answer and cache it keyed by question_id."""
     vector = embed(ideal_answer)
-    vector_cache.put(f"answerkey:{question_id}", vector)
+    vector_cache.put(_key(question_id), vector)
     logger.info("Answer key embedding stored for question_id=%s", question_id)
     return vector
 
 
-def get_answer_key_embedding(question_id: str, ideal_answer: str) -> List[float]:
+@tracing.traced()
+def get_answer_key_embedding(question_id: str, ideal_answer: str) -> np.ndarray:
     """Return cached embedding, or generate and cache if missing."""
-    cached = vector_cache.get(f"answerkey:{question_id}")
-    if cached:
+    cached = vector_cache.get(_key(question_id))
+    if cached is not None:
         return cached
     return store_answer_key(question_id, ideal_answer)
+
+
+@tracing.traced()
+def get_answer_key_embeddings(question_ids: list[str], ideal_answers: dict[str, str]) -> dict[str, np.ndarray]:
+    """
+    Answer-key vectors for many questions with one cache round trip.  Keys
+    not cached yet are embedded (one model call) when *ideal_answers* has
+    their text; questions with neither are left out of the result.
+    """
+    question_ids = list(dict.fromkeys(question_ids))
+    found = {q: v for q, v in zip(question_ids, vector_cache.get_many([_key(q) for q in question_ids])) if v is not None}
+    missing = [q for q in question_ids if q not in found and ideal_answers.get(q)]
+    if missing:
+        vectors = embed_batch([ideal_answers[q] for q in missing])
+        vector_cache.put_many((_key(q), v) for q, v in zip(missing, vectors))
+        found.update(zip(missing, vectors))
+        logger.info("Answer key embeddings stored for %d questions", len(missing))
+    return found
+
+
+@tracing.traced()
+def store_answer_keys(ideal_answers: dict[str, str], refresh: bool = False) -> None:
+    """Embed and cache many answer keys with one model call and one pipelined write."""
+    question_ids = list(ideal_answers)
+    vectors = embed_batch([ideal_answers[q] for q in question_ids], refresh=refresh)
+    vector_cache.put_many((_key(q), v) for q, v in zip(question_ids, vectors))
@@ -8,6 +8,7 @@ import numpy as np
 from src.services.answer_key_service import get_answer_key_embedding
 from src.services.embedding_service import embed
 from src.services.keyword_checker import KeywordCheckResult, check_keywords, apply_keyword_penalty
+from src.utils import tracing
 
 logger = logging.getLogger(__name__)
 
@@ -24,14 +25,26 @@ class AnswerScore:
     keyword_result: Optional[KeywordCheckResult] = field(default=None)
 
 
-def _cosine(a: List[float], b: List[float]) -> float:
-    va, vb = np.array(a, dtype=np.float32), np.array(b, dtype=np.float32)
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    va, vb = np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)
     n_a, n_b = np.linalg.norm(va), np.linalg.norm(vb)
     if n_a == 0 or n_b == 0:
         return 0.0
     return float(np.dot(va, vb) / (n_a * n_b))
 
 
+def award(similarity: float, max_marks: float) -> float:
+    """Marks for a cosine similarity against the answer key."""
+    if similarity >= THRESHOLD_FULL:
+        return max_marks
+    if similarity >= THRESHOLD_PARTIAL:
+        # Linear interpolation between partial and full threshold
+        ratio = (similarity - THRESHOLD_PARTIAL) / (THRESHOLD_FULL - THRESHOLD_PARTIAL)
+        return round(max_marks * (0.5 + 0.5 * ratio), 2)
+    return 0.0
+
+
+@tracing.traced()
 def score_answer(
     question_id: str,
     ideal_answer: str,
@@ -42,15 +55,7 @@ def score_answer(
     ideal_vec = get_answer_key_embedding(question_id, ideal_answer)
     candidate_vec = embed(candidate_answer)
     similarity = _cosine(ideal_vec, candidate_vec)
-
-    if similarity >= THRESHOLD_FULL:
-        awarded = max_marks
-    elif similarity >= THRESHOLD_PARTIAL:
-        # Linear interpolation between partial and full threshold
-        ratio = (similarity - THRESHOLD_PARTIAL) / (THRESHOLD_FULL - THRESHOLD_PARTIAL)
-        awarded = round(max_marks * (0.5 + 0.5 * ratio), 2)
-    else:
-        awarded = 0.0
+    awarded = award(similarity, max_marks)
 
     # Apply keyword penalty if keywords defined
     kw_result = None
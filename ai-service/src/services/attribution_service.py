@@ -1,22 +1,27 @@
 import logging
 from dataclasses import dataclass
-from typing import List
+from typing import TYPE_CHECKING, List
 
 import numpy as np
-from lime.lime_text import LimeTextExplainer
 
 from src.services.embedding_service import embed
+from src.utils import metrics, tracing
+
+if TYPE_CHECKING:
+    from lime.lime_text import LimeTextExplainer
 
 logger = logging.getLogger(__name__)
 
 TOP_N = 10
 
-_explainer: LimeTextExplainer | None = None
+_explainer: "LimeTextExplainer | None" = None
 
 
-def _get_explainer() -> LimeTextExplainer:
+def _get_explainer() -> "LimeTextExplainer":
     global _explainer
     if _explainer is None:
+        from lime.lime_text import LimeTextExplainer  # pulls in scikit-learn; loaded on first explanation
+
         _explainer = LimeTextExplainer(
             class_names=["relevance"],
             bow=True,
@@ -32,6 +37,7 @@ class AttributionResult:
     raw_weights: List[tuple[str, float]]    # full list, sorted by abs weight
 
 
+@tracing.traced()
 def explain_cv(cv_text: str, job_description: str, num_samples: int = 300) -> AttributionResult:
     jd_vec = np.array(embed(job_description), dtype=np.float32)
     jd_norm = np.linalg.norm(jd_vec)
@@ -53,13 +59,14 @@ def explain_cv(cv_text: str, job_description: str, num_samples: int = 300) -> At
         return np.array(scores)
 
     explainer = _get_explainer()
-    explanation = explainer.explain_instance(
-        cv_text,
-        predict_fn,
-        num_features=TOP_N * 2,
-        num_samples=num_samples,
-        labels=[0],
-    )
+    with metrics.stage("lime"):
+        explanation = explainer.explain_instance(
+            cv_text,
+            predict_fn,
+            num_features=TOP_N * 2,
+            num_samples=num_samples,
+            labels=[0],
+        )
 
     weights: List[tuple[str, float]] = explanation.as_list(label=0)
     weights_sorted = sorted(weights, key=lambda x: abs(x[1]), reverse=True)
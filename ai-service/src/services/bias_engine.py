@@ -0,0 +1,208 @@
+"""
+Multi-attribute bias analysis with permutation significance tests (FR-76).
+
+Extends the single-field z-score check in :mod:`bias_service`.  Candidates
+are grouped on every requested attribute on its own and, when more than one
+is given, on their intersection (e.g. university × region).  For each
+cohort the statistic is the absolute gap between the cohort mean and the
+overall mean; its p-value comes from a permutation test in which scores
+are shuffled across candidates thousands of times.
+
+All cohorts of all dimensions are tested against the same resamples: each
+chunk of permutations is one ``(resamples × candidates)`` matrix, and cohort
+sums for every cohort come from one matrix product with a one-hot
+membership matrix.  Chunks can be spread over a process pool.  P-values are
+Benjamini–Hochberg adjusted across all cohorts and cohorts smaller than
+``min_cohort_size`` are never flagged, so small cohorts are not flagged by
+noise.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from src.config import settings
+from src.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERMUTATIONS = 5000
+DEFAULT_ALPHA = 0.05
+DEFAULT_MIN_COHORT_SIZE = 5
+INTERSECTION_SEPARATOR = " × "
+
+# Resamples per matrix product; bounds memory at CHUNK × N float64 values
+_CHUNK = 256
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # forkserver avoids forking a process that already runs server threads
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.bias_permutation_workers,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _pool
+
+
+def _attribute(candidate: dict[str, Any], name: str) -> str:
+    value = candidate.get("cohort") if name == "cohort" else (candidate.get("attributes") or {}).get(name)
+    return str(value).strip() if value is not None and str(value).strip() else "Unknown"
+
+
+def _dimensions(group_by: list[str]) -> list[tuple[str, ...]]:
+    dims = [(attr,) for attr in group_by]
+    if len(group_by) > 1:
+        dims.append(tuple(group_by))
+    return dims
+
+
+def _exceedances(
+    scores: np.ndarray,
+    membership: np.ndarray,
+    counts: np.ndarray,
+    observed: np.ndarray,
+    n_resamples: int,
+    seed: int | np.random.SeedSequence,
+) -> np.ndarray:
+    """Count, per cohort, how many resamples give a gap at least as large as observed."""
+    rng = np.random.default_rng(seed)
+    mean = scores.mean()
+    hits = np.zeros(len(counts), dtype=np.int64)
+    remaining = n_resamples
+    while remaining > 0:
+        size = min(_CHUNK, remaining)
+        shuffled = rng.permuted(np.broadcast_to(scores, (size, len(scores))), axis=1)
+        gaps = np.abs(shuffled @ membership / counts - mean)
+        hits += (gaps >= observed - 1e-12).sum(axis=0)
+        remaining -= size
+    return hits
+
+
+def _bh_adjust(p_values: np.ndarray) -> np.ndarray:
+    """Benjamini–Hochberg false-discovery-rate adjustment."""
+    m = len(p_values)
+    order = np.argsort(p_values)
+    ranked = p_values[order] * m / np.arange(1, m + 1)
+    adjusted = np.minimum.accumulate(ranked[::-1])[::-1]
+    out = np.empty(m)
+    out[order] = np.minimum(adjusted, 1.0)
+    return out
+
+
+@tracing.traced()
+def analyse(
+    job_id: str,
+    candidates: list[dict[str, Any]],
+    group_by: list[str],
+    permutations: int = DEFAULT_PERMUTATIONS,
+    alpha: float = DEFAULT_ALPHA,
+    min_cohort_size: int = DEFAULT_MIN_COHORT_SIZE,
+    seed: int = 42,
+) -> dict[str, Any]:
+    """
+    Permutation-test every cohort of every requested dimension.
+
+    Parameters
+    ----------
+    job_id:
+        Identifier for the completed job batch.
+    candidates:
+        Dicts with ``cvScore`` and ``cohort`` plus an optional
+        ``attributes`` mapping (e.g. ``{"university": ..., "region": ...}``).
+        ``"cohort"`` in *group_by* refers to the top-level field.
+    group_by:
+        Attribute names to group on; intersections are added automatically.
+
+    Returns
+    -------
+    Report dict in the same spirit as :func:`bias_service.analyse`, with a
+    ``pValue`` and ``adjustedPValue`` per cohort.
+    """
+    if not candidates:
+        raise ValueError("candidates list must not be empty")
+    if not group_by:
+        raise ValueError("groupBy must name at least one attribute")
+
+    scores = np.fromiter((float(c["cvScore"]) for c in candidates), dtype=np.float64, count=len(candidates))
+    n = len(scores)
+    overall_mean = float(scores.mean())
+    overall_stddev = float(scores.std()) if n >= 2 else 0.0
+
+    # One column of the membership matrix per cohort, across all dimensions
+    columns: list[np.ndarray] = []
+    cohorts: list[tuple[tuple[str, ...], tuple[str, ...]]] = []
+    values = {attr: [_attribute(c, attr) for c in candidates] for attr in group_by}
+    for dim in _dimensions(group_by):
+        labels = list(zip(*(values[attr] for attr in dim)))
+        names, inverse = np.unique(np.array([INTERSECTION_SEPARATOR.join(label) for label in labels], dtype=object),
+                                   return_inverse=True)
+        first = {}
+        for i, label in zip(inverse.tolist(), labels):
+            first.setdefault(i, label)
+        for g in range(len(names)):
+            columns.append(inverse == g)
+            cohorts.append((dim, first[g]))
+
+    membership = np.column_stack(columns).astype(np.float64)
+    counts = membership.sum(axis=0)
+    means = scores @ membership / counts
+    observed = np.abs(means - overall_mean)
+
+    workers = settings.bias_permutation_workers
+    if workers > 1 and permutations >= workers * _CHUNK:
+        seeds = np.random.SeedSequence(seed).spawn(workers)
+        shares = [permutations // workers + (1 if i < permutations % workers else 0) for i in range(workers)]
+        futures = [
+            _get_pool().submit(_exceedances, scores, membership, counts, observed, share, s)
+            for share, s in zip(shares, seeds)
+        ]
+        hits = sum(f.result() for f in futures)
+    else:
+        hits = _exceedances(scores, membership, counts, observed, permutations, seed)
+
+    p_values = (hits + 1) / (permutations + 1)
+    adjusted = _bh_adjust(p_values)
+
+    cohort_stats = []
+    for (dim, label), count, avg, p, q in zip(cohorts, counts, means, p_values, adjusted):
+        deviation = (avg - overall_mean) / overall_stddev if overall_stddev > 0 else 0.0
+        flagged = bool(q < alpha and count >= min_cohort_size)
+        cohort_stats.append(
+            {
+                "dimension": INTERSECTION_SEPARATOR.join(dim),
+                "cohort": INTERSECTION_SEPARATOR.join(label),
+                "attributes": dict(zip(dim, label)),
+                "candidateCount": int(count),
+                "averageScore": round(float(avg), 4),
+                "deviationFromMean": round(deviation, 4),
+                "pValue": round(float(p), 6),
+                "adjustedPValue": round(float(q), 6),
+                "flagged": flagged,
+            }
+        )
+
+    report: dict[str, Any] = {
+        "jobId": job_id,
+        "method": "permutation",
+        "groupBy": list(group_by),
+        "totalCandidates": n,
+        "overallMeanScore": round(overall_mean, 4),
+        "overallStdDev": round(overall_stddev, 4),
+        "permutations": permutations,
+        "alpha": alpha,
+        "minCohortSize": min_cohort_size,
+        "flaggedCohorts": [s["cohort"] for s in cohort_stats if s["flagged"]],
+        "cohortStats": cohort_stats,
+    }
+    logger.info(
+        "Permutation bias analysis complete: jobId=%s dimensions=%d cohorts=%d flagged=%d",
+        job_id, len(_dimensions(group_by)), len(cohort_stats), len(report["flaggedCohorts"]),
+    )
+    return report
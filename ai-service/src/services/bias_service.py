@@ -7,6 +7,11 @@ standard deviations from the overall mean are flagged.
 
 Results are serialised as a JSON report and stored in Redis so the admin
 analytics API (FR-40) can retrieve them without re-running the analysis.
+
+Scores can also be streamed in as they are produced.  Per-cohort and
+overall Welford accumulators (count, mean, M2) live in Redis hashes and are
+merged with Chan's parallel update, so a live report is available at any
+time in O(#cohorts) without revisiting individual candidates.
 """
 
 import json
@@ -14,88 +19,93 @@ import logging
 import math
 from typing import Any
 
+import numpy as np
 import redis
 
-from src.config import settings
+from src.services import redis_client
+from src.utils import tracing
 
 logger = logging.getLogger(__name__)
 
 REPORT_TTL_SECONDS = 60 * 60 * 24 * 30  # 30 days
 BIAS_THRESHOLD_STDDEV = 1.5
 
-_client: redis.Redis | None = None
+
+class Unavailable(Exception):
+    """Raised when the streaming accumulators cannot be read or written."""
 
 
 def _get_client() -> redis.Redis:
-    global _client
-    if _client is None:
-        _client = redis.from_url(settings.redis_url, decode_responses=True)
-    return _client
+    return redis_client.get_client()
 
 
-def _report_key(job_id: str) -> str:
+def _report_key(job_id: str, group_by: list[str] | None = None) -> str:
+    if group_by:
+        return f"bias_report:{job_id}:by:{','.join(group_by)}"
     return f"bias_report:{job_id}"
 
 
+def _stream_cohorts_key(job_id: str) -> str:
+    return f"bias_stream:{job_id}:cohorts"
+
+
+def _stream_overall_key(job_id: str) -> str:
+    return f"bias_stream:{job_id}:overall"
+
+
 # ---------------------------------------------------------------------------
 # Core statistics helpers
 # ---------------------------------------------------------------------------
 
-def _mean(values: list[float]) -> float:
-    return sum(values) / len(values)
+# Welford accumulator: (count, mean, M2) where M2 is the sum of squared deviations
+Accumulator = tuple[int, float, float]
 
 
-def _stddev(values: list[float], mean: float) -> float:
-    if len(values) < 2:
-        return 0.0
-    variance = sum((v - mean) ** 2 for v in values) / len(values)
-    return math.sqrt(variance)
+def _aggregate(cohorts: list[str], scores: np.ndarray) -> dict[str, Accumulator]:
+    """Per-cohort (count, mean, M2) in one vectorised pass over the batch."""
+    names, inverse = np.unique(np.asarray(cohorts, dtype=object), return_inverse=True)
+    counts = np.bincount(inverse)
+    means = np.bincount(inverse, weights=scores) / counts
+    m2 = np.bincount(inverse, weights=(scores - means[inverse]) ** 2)
+    return {str(n): (int(c), float(m), float(q)) for n, c, m, q in zip(names, counts, means, m2)}
 
 
-# ---------------------------------------------------------------------------
-# Public API
-# ---------------------------------------------------------------------------
+def _overall(scores: np.ndarray) -> Accumulator:
+    mean = float(scores.mean())
+    return len(scores), mean, float(((scores - mean) ** 2).sum())
 
-def analyse(job_id: str, candidates: list[dict[str, Any]]) -> dict[str, Any]:
-    """
-    Compute per-cohort score statistics and flag outlier cohorts.
 
-    Parameters
-    ----------
-    job_id:
-        Identifier for the completed job batch.
-    candidates:
-        List of dicts with keys:
-          - ``candidateId``  (str)
-          - ``cohort``       (str)  e.g. university name or geographic indicator
-          - ``cvScore``      (float, 0–100)
+def _merge(a: Accumulator, b: Accumulator) -> Accumulator:
+    """Chan et al. parallel combination of two Welford accumulators."""
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    if n == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    return n, mean, m2_a + m2_b + delta * delta * n_a * n_b / n
 
-    Returns
-    -------
-    Structured report dict (also persisted to Redis).
-    """
-    if not candidates:
-        raise ValueError("candidates list must not be empty")
 
-    # Group scores by cohort
-    cohort_scores: dict[str, list[float]] = {}
-    for c in candidates:
-        cohort = str(c["cohort"]).strip() or "Unknown"
-        cohort_scores.setdefault(cohort, []).append(float(c["cvScore"]))
+def _columns(candidates: list[dict[str, Any]]) -> tuple[list[str], np.ndarray]:
+    cohorts = [str(c["cohort"]).strip() or "Unknown" for c in candidates]
+    scores = np.fromiter((float(c["cvScore"]) for c in candidates), dtype=np.float64, count=len(candidates))
+    return cohorts, scores
+
 
-    all_scores = [float(c["cvScore"]) for c in candidates]
-    overall_mean = _mean(all_scores)
-    overall_stddev = _stddev(all_scores, overall_mean)
+def _build_report(job_id: str, cohort_acc: dict[str, Accumulator], overall: Accumulator) -> dict[str, Any]:
+    total, overall_mean, overall_m2 = overall
+    # Population standard deviation, matching the original batch analysis
+    overall_stddev = math.sqrt(overall_m2 / total) if total >= 2 else 0.0
 
     cohort_stats = []
-    for cohort, scores in sorted(cohort_scores.items()):
-        avg = _mean(scores)
+    for cohort, (count, avg, _) in sorted(cohort_acc.items()):
         deviation = (avg - overall_mean) / overall_stddev if overall_stddev > 0 else 0.0
         flagged = abs(deviation) > BIAS_THRESHOLD_STDDEV
         cohort_stats.append(
             {
                 "cohort": cohort,
-                "candidateCount": len(scores),
+                "candidateCount": count,
                 "averageScore": round(avg, 4),
                 "deviationFromMean": round(deviation, 4),
                 "flagged": flagged,
@@ -104,9 +114,9 @@ def analyse(job_id: str, candidates: list[dict[str, Any]]) -> dict[str, Any]:
 
     flagged_cohorts = [s["cohort"] for s in cohort_stats if s["flagged"]]
 
-    report: dict[str, Any] = {
+    return {
         "jobId": job_id,
-        "totalCandidates": len(candidates),
+        "totalCandidates": total,
         "overallMeanScore": round(overall_mean, 4),
         "overallStdDev": round(overall_stddev, 4),
         "biasThresholdStdDev": BIAS_THRESHOLD_STDDEV,
@@ -114,20 +124,146 @@ def analyse(job_id: str, candidates: list[dict[str, Any]]) -> dict[str, Any]:
         "cohortStats": cohort_stats,
     }
 
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+@tracing.traced()
+def analyse(job_id: str, candidates: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Compute per-cohort score statistics and flag outlier cohorts.
+
+    Parameters
+    ----------
+    job_id:
+        Identifier for the completed job batch.
+    candidates:
+        List of dicts with keys:
+          - ``candidateId``  (str)
+          - ``cohort``       (str)  e.g. university name or geographic indicator
+          - ``cvScore``      (float, 0–100)
+
+    Returns
+    -------
+    Structured report dict (also persisted to Redis).  The streaming
+    accumulators for the job are reset to this batch so later
+    :func:`push` calls extend it.
+    """
+    if not candidates:
+        raise ValueError("candidates list must not be empty")
+
+    cohorts, scores = _columns(candidates)
+    cohort_acc = _aggregate(cohorts, scores)
+    overall = _overall(scores)
+    report = _build_report(job_id, cohort_acc, overall)
+
     _persist(job_id, report)
+    _replace_stream(job_id, cohort_acc, overall)
     logger.info(
         "Bias analysis complete: jobId=%s cohorts=%d flagged=%d",
         job_id,
-        len(cohort_stats),
-        len(flagged_cohorts),
+        len(report["cohortStats"]),
+        len(report["flaggedCohorts"]),
     )
     return report
 
 
-def get_report(job_id: str) -> dict[str, Any] | None:
-    """Retrieve a previously computed bias report from Redis."""
+@tracing.traced()
+def analyse_by_attributes(
+    job_id: str,
+    candidates: list[dict[str, Any]],
+    group_by: list[str],
+    **options: Any,
+) -> dict[str, Any]:
+    """
+    Multi-attribute permutation analysis (see :mod:`bias_engine`).
+
+    The report is persisted per ``(jobId, groupBy)`` so it can be fetched
+    with :func:`get_report` without re-running the resampling.
+    """
+    from src.services import bias_engine
+
+    report = bias_engine.analyse(job_id, candidates, group_by, **options)
+    _persist(job_id, report, group_by)
+    return report
+
+
+@tracing.traced()
+def push(job_id: str, candidates: list[dict[str, Any]]) -> int:
+    """
+    Fold newly produced candidate scores into the job's streaming accumulators.
+
+    The batch is reduced with NumPy first, so the Redis transaction only
+    touches one field per cohort present in the batch.  Returns the total
+    number of candidates seen for the job so far.  Raises
+    :class:`Unavailable` when Redis cannot be reached.
+    """
+    if not candidates:
+        raise ValueError("candidates list must not be empty")
+
+    cohorts, scores = _columns(candidates)
+    batch_acc = _aggregate(cohorts, scores)
+    batch_overall = _overall(scores)
+    cohorts_key, overall_key = _stream_cohorts_key(job_id), _stream_overall_key(job_id)
+    names = list(batch_acc)
+
+    def _apply(pipe) -> int:
+        stored = pipe.hmget(cohorts_key, names)
+        stored_overall = _decode(pipe.get(overall_key))
+        merged = {
+            name: _merge(_decode(raw), batch_acc[name]) for name, raw in zip(names, stored)
+        }
+        overall = _merge(stored_overall, batch_overall)
+        pipe.multi()
+        pipe.hset(cohorts_key, mapping={name: json.dumps(acc) for name, acc in merged.items()})
+        pipe.set(overall_key, json.dumps(overall))
+        pipe.expire(cohorts_key, REPORT_TTL_SECONDS)
+        pipe.expire(overall_key, REPORT_TTL_SECONDS)
+        return overall[0]
+
+    try:
+        return _get_client().transaction(_apply, cohorts_key, overall_key, value_from_callable=True)
+    except redis.RedisError as exc:
+        logger.warning("Failed to push bias scores for jobId=%s", job_id, exc_info=True)
+        raise Unavailable(str(exc)) from exc
+
+
+@tracing.traced()
+def live_report(job_id: str) -> dict[str, Any] | None:
+    """Build a report from the streaming accumulators, or None if nothing was pushed."""
+    client = _get_client()
+    pipe = client.pipeline(transaction=False)
+    pipe.hgetall(_stream_cohorts_key(job_id))
+    pipe.get(_stream_overall_key(job_id))
+    raw_cohorts, raw_overall = pipe.execute()
+    if not raw_cohorts or raw_overall is None:
+        return None
+    cohort_acc = {name: _decode(raw) for name, raw in raw_cohorts.items()}
+    return _build_report(job_id, cohort_acc, _decode(raw_overall))
+
+
+def reset_stream(job_id: str) -> None:
     try:
-        raw = _get_client().get(_report_key(job_id))
+        _get_client().delete(_stream_cohorts_key(job_id), _stream_overall_key(job_id))
+    except redis.RedisError as exc:
+        logger.warning("Failed to reset bias stream for jobId=%s", job_id, exc_info=True)
+        raise Unavailable(str(exc)) from exc
+
+
+@tracing.traced()
+def get_report(job_id: str, group_by: list[str] | None = None) -> dict[str, Any] | None:
+    """
+    Return the live report from the streaming accumulators, falling back
+    to the last persisted batch report.  With *group_by*, return the
+    stored multi-attribute report for those attributes instead.
+    """
+    try:
+        if not group_by:
+            live = live_report(job_id)
+            if live is not None:
+                return live
+        raw = _get_client().get(_report_key(job_id, group_by))
         if raw:
             return json.loads(raw)
     except Exception:
@@ -135,8 +271,29 @@ def get_report(job_id: str) -> dict[str, Any] | None:
     return None
 
 
-def _persist(job_id: str, report: dict[str, Any]) -> None:
+def _persist(job_id: str, report: dict[str, Any], group_by: list[str] | None = None) -> None:
     try:
-        _get_client().setex(_report_key(job_id), REPORT_TTL_SECONDS, json.dumps(report))
+        _get_client().setex(_report_key(job_id, group_by), REPORT_TTL_SECONDS, json.dumps(report))
     except Exception:
         logger.warning("Failed to persist bias report for jobId=%s", job_id, exc_info=True)
+
+
+def _replace_stream(job_id: str, cohort_acc: dict[str, Accumulator], overall: Accumulator) -> None:
+    cohorts_key, overall_key = _stream_cohorts_key(job_id), _stream_overall_key(job_id)
+    try:
+        pipe = _get_client().pipeline(transaction=True)
+        pipe.delete(cohorts_key)
+        pipe.hset(cohorts_key, mapping={name: json.dumps(acc) for name, acc in cohort_acc.items()})
+        pipe.set(overall_key, json.dumps(overall))
+        pipe.expire(cohorts_key, REPORT_TTL_SECONDS)
+        pipe.expire(overall_key, REPORT_TTL_SECONDS)
+        pipe.execute()
+    except Exception:
+        logger.warning("Failed to seed bias stream accumulators for jobId=%s", job_id, exc_info=True)
+
+
+def _decode(raw: str | None) -> Accumulator:
+    if not raw:
+        return 0, 0.0, 0.0
+    n, mean, m2 = json.loads(raw)
+    return int(n), float(mean), float(m2)
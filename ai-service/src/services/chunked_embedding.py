@@ -0,0 +1,168 @@
+"""
+Long-document embedding.
+
+The SBERT model truncates its input at ``max_seq_length`` word pieces (256
+for all-MiniLM-L6-v2), so embedding a long CV in one call only scores its
+opening pages.  :func:`embed_documents` instead:
+
+1. splits each preprocessed text into overlapping windows that fit the
+   model (:func:`split`, counting word pieces with the model's tokenizer);
+2. encodes the windows of every document together through
+   :func:`embedding_service.embed_batch` — one cache round trip and one
+   model call per group of windows;
+3. pools each document's window vectors into one vector
+   (``EMBEDDING_POOLING``: length-weighted ``mean`` or element-wise ``max``).
+
+A text that fits in one window is its own only chunk, so short CVs embed
+exactly as before.
+
+Window boundaries are content-defined: besides the length limit, a window
+also ends after an *anchor* word (one whose CRC falls in a fixed residue
+class) once it is half full.  An edit only moves boundaries up to the next
+anchor, and window vectors are cached by text, so re-processing an edited
+CV re-encodes just the windows around the change.
+
+Memory stays bounded on very long CVs: windows are encoded
+``EMBEDDING_CHUNK_GROUP`` at a time and folded into running per-document
+sums (or maxima), and a document contributes at most
+``EMBEDDING_MAX_CHUNKS`` windows.  Window vectors are only retained when
+``keep_chunks`` is set, e.g. for attribution.
+"""
+
+import logging
+import re
+import zlib
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from src.config import settings
+from src.services.embedding_service import embed_batch, get_model
+from src.utils import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+MEAN = "mean"
+MAX = "max"
+DEFAULT_MAX_SEQ_LENGTH = 256
+SPECIAL_TOKENS = 2  # [CLS] and [SEP]
+ANCHOR_PERIOD = 24  # mean spacing of anchor words
+
+_WORD = re.compile(r"\S+")
+
+
+@dataclass
+class DocumentEmbedding:
+    vector: np.ndarray
+    chunks: List[str]
+    chunk_vectors: np.ndarray | None = None  # (len(chunks), dim), only with keep_chunks
+
+
+def window_tokens() -> int:
+    """Word pieces per window: ``EMBEDDING_CHUNK_TOKENS``, or whatever the model accepts."""
+    if settings.embedding_chunk_tokens:
+        return settings.embedding_chunk_tokens
+    max_seq_length = getattr(get_model(), "max_seq_length", None) or DEFAULT_MAX_SEQ_LENGTH
+    return max_seq_length - SPECIAL_TOKENS
+
+
+def _token_counts(words: List[str]) -> List[int]:
+    tokenizer = getattr(get_model(), "tokenizer", None)
+    if tokenizer is None:
+        return [1] * len(words)
+    # WordPiece splits on whitespace first, so per-word counts add up to the text's
+    unique = list(dict.fromkeys(words))
+    ids = tokenizer(unique, add_special_tokens=False)["input_ids"]
+    counts = {word: max(1, len(pieces)) for word, pieces in zip(unique, ids)}
+    return [counts[word] for word in words]
+
+
+def _is_anchor(word: str) -> bool:
+    return zlib.crc32(word.encode()) % ANCHOR_PERIOD == 0
+
+
+def split(text: str, max_tokens: int | None = None, overlap_tokens: int | None = None) -> List[str]:
+    """Overlapping windows of *text*, each at most *max_tokens* word pieces."""
+    max_tokens = max_tokens or window_tokens()
+    overlap = settings.embedding_chunk_overlap_tokens if overlap_tokens is None else overlap_tokens
+    overlap = min(overlap, max_tokens // 2)
+    matches = list(_WORD.finditer(text))
+    words = [m.group() for m in matches]
+    costs = _token_counts(words)
+    if sum(costs) <= max_tokens:
+        return [text]
+
+    budget = max_tokens - overlap
+    bounds: list[tuple[int, int]] = []
+    start, filled = 0, 0
+    for i, cost in enumerate(costs):
+        if filled + cost > budget and i > start:
+            bounds.append((start, i))
+            start, filled = i, 0
+        filled += cost
+        if filled >= budget // 2 and _is_anchor(words[i]):
+            bounds.append((start, i + 1))
+            start, filled = i + 1, 0
+    if start < len(words):
+        bounds.append((start, len(words)))
+
+    chunks = []
+    for start, end in bounds:
+        # Lead in with the tail of the previous window, up to the overlap budget
+        lead, spent = start, 0
+        while lead > 0 and spent + costs[lead - 1] <= overlap:
+            lead -= 1
+            spent += costs[lead]
+        chunks.append(text[matches[lead].start():matches[end - 1].end()])
+    return chunks
+
+
+@tracing.traced()
+def embed_documents(texts: List[str], keep_chunks: bool = False, refresh: bool = False) -> List[DocumentEmbedding]:
+    """One pooled vector per text; see the module docstring.  ``refresh`` is passed to ``embed_batch``."""
+    with metrics.stage("chunk"):
+        chunked = [split(text) for text in texts]
+    for i, chunks in enumerate(chunked):
+        if len(chunks) > settings.embedding_max_chunks:
+            logger.warning(
+                "Document has %d windows; embedding the first %d", len(chunks), settings.embedding_max_chunks,
+            )
+            chunked[i] = chunks[: settings.embedding_max_chunks]
+        metrics.EMBEDDING_CHUNKS.observe(len(chunked[i]))
+
+    pooled: list[np.ndarray | None] = [None] * len(texts)
+    weights = np.zeros(len(texts))
+    kept: list[list[np.ndarray]] = [[] for _ in texts]
+    flat = [(doc, chunk) for doc, chunks in enumerate(chunked) for chunk in chunks]
+    for offset in range(0, len(flat), settings.embedding_chunk_group):
+        group = flat[offset:offset + settings.embedding_chunk_group]
+        for (doc, chunk), vector in zip(group, embed_batch([chunk for _, chunk in group], refresh=refresh)):
+            vector = np.asarray(vector, dtype=np.float32)
+            if keep_chunks:
+                kept[doc].append(vector)
+            if len(chunked[doc]) == 1:
+                pooled[doc] = vector
+            elif settings.embedding_pooling == MAX:
+                pooled[doc] = vector if pooled[doc] is None else np.maximum(pooled[doc], vector)
+            else:
+                # Running length-weighted sum; divided once every window is in
+                weighted = vector * len(chunk)
+                pooled[doc] = weighted if pooled[doc] is None else pooled[doc] + weighted
+                weights[doc] += len(chunk)
+
+    return [
+        DocumentEmbedding(
+            vector=(pooled[doc] / weights[doc]).astype(np.float32) if weights[doc] else pooled[doc],
+            chunks=chunks,
+            chunk_vectors=np.stack(kept[doc]) if keep_chunks else None,
+        )
+        for doc, chunks in enumerate(chunked)
+    ]
+
+
+def document_vectors(texts: List[str], refresh: bool = False) -> List[np.ndarray]:
+    """CV vectors: pooled windows with ``EMBEDDING_LONG_DOCUMENTS``, a single truncated pass otherwise."""
+    if not settings.embedding_long_documents:
+        return embed_batch(texts, refresh=refresh)
+    return [document.vector for document in embed_documents(texts, refresh=refresh)]
@@ -0,0 +1,317 @@
+"""
+Near-duplicate CV detection.
+
+Candidates often apply to several roles with the same or a lightly edited
+CV.  The vector cache only catches byte-identical preprocessed text, so
+each copy would otherwise pay for spaCy and SBERT again.
+
+Every masked CV gets a 64-bit SimHash over word 3-shingles.  Two CVs whose
+fingerprints differ in few bits are near-duplicates; similarity is
+``1 - hamming / 64``.  The fingerprint is split into 4 bands of 16 bits and
+each band value indexes a Redis sorted set, so a lookup only compares
+against CVs in a few small buckets (about N / 65536 members each).  A
+lookup reads each band's own bucket and the 16 buckets one bit away from
+it: any stored CV within 7 bits (similarity ≥ 0.89) has at least one band
+that differs in at most one bit, so it is always found.  Lower thresholds
+are best-effort.
+
+Band members are scored by the time they were indexed.  Reads ignore
+members older than ``CV_DEDUP_TTL_SECONDS`` and every write trims them with
+ZREMRANGEBYSCORE, so a busy band stays bounded instead of living forever
+on a TTL that each write refreshes.
+
+When a new CV matches a stored one at ``CV_DEDUP_THRESHOLD`` or above, the
+consumer reuses the stored CV's preprocessed text.  Its SBERT vector is
+then a vector-cache hit, and any downstream result keyed by that text is
+reused as well.  A near-duplicate is only reused from the same candidate;
+another candidate's CV is reused only when the masked texts are identical
+(``maskedDigest``), so two applicants with similar CVs are each scored on
+their own.  The reuse is recorded on the new CV's entry (``reusedFrom``,
+``similarity``) for audit and is listed by ``GET /cv/duplicates``.
+
+Keys
+----
+``cvdup:doc:{applicationId}``  hash    simhash, candidateId, jobId, digest, maskedDigest, reusedFrom, similarity,
+                               indexedAt
+``cvdup:band:{i}:{value}``     zset    "{simhash}:{applicationId}" members sharing band i -> indexed at
+``cvdup:text:{digest}``        string  preprocessed text, shared by every CV that reused it
+
+Lookups and writes go through the cache client and circuit breaker; when
+Redis is unavailable every CV is processed in full.  The recruiter lookup
+(:func:`duplicates_of`) has no fallback and raises :class:`Unavailable`.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+from itertools import chain
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+import redis
+
+from src.config import settings
+from src.services import redis_client
+from src.utils import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+BITS = 64
+BANDS = 4
+BAND_BITS = BITS // BANDS
+SHINGLE_SIZE = 3
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_BAND_MASK = (1 << BAND_BITS) - 1
+_PROBES = BANDS * (BAND_BITS + 1)  # buckets read per lookup
+
+
+class Unavailable(Exception):
+    """Raised when the near-duplicate index cannot be read."""
+
+
+@dataclass
+class Match:
+    application_id: str
+    similarity: float
+    preprocessed: str
+
+
+def _get_client() -> redis.Redis:
+    return redis_client.get_cache_client()
+
+
+def _doc_key(application_id: str) -> str:
+    return f"cvdup:doc:{application_id}"
+
+
+def _band_key(band: int, value: int) -> str:
+    return f"cvdup:band:{band}:{value:04x}"
+
+
+def _band_keys(simhash: int) -> list[str]:
+    """The bucket of each band, where *simhash* is indexed."""
+    return [_band_key(i, (simhash >> (i * BAND_BITS)) & _BAND_MASK) for i in range(BANDS)]
+
+
+def _probe_keys(simhash: int) -> list[str]:
+    """Each band's bucket and the buckets one bit away from it."""
+    keys = []
+    for i in range(BANDS):
+        value = (simhash >> (i * BAND_BITS)) & _BAND_MASK
+        keys.append(_band_key(i, value))
+        keys.extend(_band_key(i, value ^ (1 << bit)) for bit in range(BAND_BITS))
+    return keys
+
+
+def _band_members(pipe, simhash: int, since: float) -> None:
+    """Queue reads of the live members of every probed bucket (one reply per key)."""
+    for key in _probe_keys(simhash):
+        pipe.zrangebyscore(key, since, "+inf")
+
+
+def _text_key(digest: str) -> str:
+    return f"cvdup:text:{digest}"
+
+
+def text_digest(preprocessed: str) -> str:
+    return hashlib.sha256(preprocessed.encode()).hexdigest()
+
+
+def fingerprint(text: str) -> int:
+    """64-bit SimHash of *text* over lowercase word 3-shingles, weighted by count."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = Counter([" ".join(tokens)])
+    else:
+        shingles = Counter(" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1))
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little") for s in shingles],
+        dtype=np.uint64,
+    )
+    weights = np.array(list(shingles.values()), dtype=np.int64)
+    # bits[i, j] is bit j of shingle i's hash (little-endian bit order)
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little").astype(np.int64)
+    votes = weights @ (2 * bits - 1)
+    return int(np.packbits(votes > 0, bitorder="little").view("<u8")[0])
+
+
+def similarity(a: int, b: int) -> float:
+    return 1 - (a ^ b).bit_count() / BITS
+
+
+def closest(simhash: int, others: list[int], threshold: float | None = None) -> tuple[int, float] | None:
+    """Index and similarity of the most similar fingerprint in *others* at or above the threshold."""
+    if not settings.cv_dedup_enabled:
+        return None
+    threshold = settings.cv_dedup_threshold if threshold is None else threshold
+    best = max(((i, similarity(simhash, other)) for i, other in enumerate(others)), key=lambda p: p[1], default=None)
+    return (best[0], round(best[1], 4)) if best is not None and best[1] >= threshold else None
+
+
+def _candidates(simhash: int, members: Iterable[str], exclude: str | None, threshold: float) -> list[tuple[str, float]]:
+    """Stored CVs at or above the threshold, most similar first."""
+    found: dict[str, float] = {}
+    for member in members:
+        hex_hash, application_id = member.split(":", 1)
+        score = similarity(simhash, int(hex_hash, 16))
+        if application_id != exclude and score >= threshold:
+            found[application_id] = max(score, found.get(application_id, 0.0))
+    return sorted(found.items(), key=lambda p: (-p[1], p[0]))
+
+
+@tracing.traced()
+def lookup_many(
+    fingerprints: list[int],
+    application_ids: list[str],
+    candidate_ids: list[str],
+    masked_digests: list[str],
+    threshold: float | None = None,
+) -> list[Match | None]:
+    """
+    Best stored CV each fingerprint may reuse, or None: a near-duplicate from
+    the same candidate, or another candidate's CV with identical masked text.
+    """
+    if not fingerprints or not settings.cv_dedup_enabled:
+        return [None] * len(fingerprints)
+    threshold = settings.cv_dedup_threshold if threshold is None else threshold
+    try:
+        client = _get_client()
+        since = time.time() - settings.cv_dedup_ttl_seconds
+        with metrics.stage("redis"), redis_client.breaker.guard():
+            pipe = client.pipeline(transaction=False)
+            for simhash in fingerprints:
+                _band_members(pipe, simhash, since)
+            replies = pipe.execute()
+            candidates = [
+                _candidates(simhash, chain.from_iterable(replies[n * _PROBES:(n + 1) * _PROBES]), exclude, threshold)
+                for n, (simhash, exclude) in enumerate(zip(fingerprints, application_ids))
+            ]
+
+            pipe = client.pipeline(transaction=False)
+            for found in candidates:
+                for other, _ in found:
+                    pipe.hmget(_doc_key(other), ["candidateId", "maskedDigest", "digest"])
+            docs = iter(pipe.execute())
+            chosen: list[tuple[str, float, str] | None] = []
+            for found, candidate_id, masked_digest in zip(candidates, candidate_ids, masked_digests):
+                best = None
+                for other, score in found:
+                    other_candidate, other_masked, digest = next(docs)
+                    if best is None and digest and (other_candidate == candidate_id or other_masked == masked_digest):
+                        best = (other, score, digest)
+                chosen.append(best)
+
+            pipe = client.pipeline(transaction=False)
+            for best in chosen:
+                if best is not None:
+                    pipe.get(_text_key(best[2]))
+            texts = iter(pipe.execute())
+    except redis_client.CircuitOpenError:
+        metrics.CV_DEDUP.labels("bypassed").inc(len(fingerprints))
+        return [None] * len(fingerprints)
+    except Exception:
+        metrics.CV_DEDUP.labels("error").inc(len(fingerprints))
+        logger.warning("Near-duplicate lookup failed — processing every CV in full", exc_info=True)
+        return [None] * len(fingerprints)
+
+    matches: list[Match | None] = []
+    for best in chosen:
+        text = next(texts) if best is not None else None
+        # An entry whose shared text has expired can't be reused
+        matches.append(Match(best[0], round(best[1], 4), text) if text else None)
+    return matches
+
+
+@tracing.traced()
+def record_many(entries: list[dict]) -> None:
+    """
+    Index processed CVs.  Each entry has ``applicationId``, ``candidateId``,
+    ``jobId``, ``simhash``, ``preprocessed``, ``maskedDigest`` (the
+    :func:`text_digest` of the masked text) and, when reused, ``reusedFrom``
+    and ``similarity``.
+    """
+    if not entries or not settings.cv_dedup_enabled:
+        return
+    ttl = settings.cv_dedup_ttl_seconds
+    now = int(time.time())
+    try:
+        pipe = _get_client().pipeline(transaction=False)
+        for entry in entries:
+            digest = text_digest(entry["preprocessed"])
+            simhash = entry["simhash"]
+            doc = {
+                "simhash": f"{simhash:016x}",
+                "candidateId": entry["candidateId"],
+                "jobId": entry["jobId"],
+                "digest": digest,
+                "maskedDigest": entry["maskedDigest"],
+                "indexedAt": now,
+            }
+            if entry.get("reusedFrom"):
+                doc.update(reusedFrom=entry["reusedFrom"], similarity=entry["similarity"])
+            pipe.hset(_doc_key(entry["applicationId"]), mapping=doc)
+            pipe.expire(_doc_key(entry["applicationId"]), ttl)
+            pipe.set(_text_key(digest), entry["preprocessed"], ex=ttl)
+            for key in _band_keys(simhash):
+                pipe.zadd(key, {f"{simhash:016x}:{entry['applicationId']}": now})
+                pipe.zremrangebyscore(key, "-inf", now - ttl - 1)
+                pipe.expire(key, ttl)  # only reached once the band stops receiving writes
+        with metrics.stage("redis"), redis_client.breaker.guard():
+            pipe.execute()
+    except redis_client.CircuitOpenError:
+        pass
+    except Exception:
+        logger.warning("Near-duplicate index write failed — continuing without it", exc_info=True)
+
+
+@tracing.traced()
+def duplicates_of(application_id: str, threshold: float | None = None) -> dict | None:
+    """
+    Near-duplicates of an indexed CV for recruiters; None when the CV is not
+    indexed.  Raises :class:`Unavailable` when Redis cannot be reached.
+    """
+    try:
+        return _duplicates_of(application_id, threshold)
+    except redis.RedisError as exc:
+        logger.warning("Near-duplicate lookup failed for applicationId=%s", application_id, exc_info=True)
+        raise Unavailable(str(exc)) from exc
+
+
+def _duplicates_of(application_id: str, threshold: float | None) -> dict | None:
+    threshold = settings.cv_dedup_threshold if threshold is None else threshold
+    client = redis_client.get_client()
+    doc = client.hgetall(_doc_key(application_id))
+    if not doc:
+        return None
+    simhash = int(doc["simhash"], 16)
+    pipe = client.pipeline(transaction=False)
+    _band_members(pipe, simhash, time.time() - settings.cv_dedup_ttl_seconds)
+    found = dict(_candidates(simhash, chain.from_iterable(pipe.execute()), application_id, threshold))
+
+    pipe = client.pipeline(transaction=False)
+    for other in found:
+        pipe.hgetall(_doc_key(other))
+    duplicates = [
+        {
+            "applicationId": other,
+            "candidateId": other_doc.get("candidateId"),
+            "jobId": other_doc.get("jobId"),
+            "similarity": round(found[other], 4),
+            "reusedFrom": other_doc.get("reusedFrom"),
+        }
+        for other, other_doc in zip(found, pipe.execute())
+        if other_doc  # the doc may expire a moment before its band members age out
+    ]
+    duplicates.sort(key=lambda d: (-d["similarity"], d["applicationId"]))
+    return {
+        "applicationId": application_id,
+        "candidateId": doc.get("candidateId"),
+        "jobId": doc.get("jobId"),
+        "reusedFrom": doc.get("reusedFrom"),
+        "similarity": float(doc["similarity"]) if "similarity" in doc else None,
+        "duplicates": duplicates,
+    }
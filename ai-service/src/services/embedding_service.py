@@ -1,54 +1,80 @@
 import logging
-from typing import List
+from typing import TYPE_CHECKING, List
 
-from sentence_transformers import SentenceTransformer
+import numpy as np
 
 from src.config import settings
+from src.utils import embedding_codec, metrics, model_store, tracing
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
-_model: SentenceTransformer | None = None
+_model: "SentenceTransformer | None" = None
 
 
+@tracing.traced()
 def load_model() -> None:
     global _model
-    logger.info("Loading SBERT model: %s", settings.sbert_model)
+    # Resolve first: with a pinned snapshot this switches Hugging Face offline before it is imported
+    source = model_store.resolve(settings.sbert_model)
+    # Importing sentence-transformers loads torch and transformers; defer it until the model is needed
+    from sentence_transformers import SentenceTransformer
+
+    logger.info("Loading SBERT model: %s", source)
     try:
-        _model = SentenceTransformer(settings.sbert_model)
-        # Warm-up pass so the first real request isn't slow
-        _model.encode("warmup")
+        _model = SentenceTransformer(source)
         logger.info("SBERT model loaded successfully")
     except Exception:
         logger.exception("Failed to load SBERT model '%s'", settings.sbert_model)
         raise
 
 
-def get_model() -> SentenceTransformer:
+def is_model_loaded() -> bool:
+    return _model is not None
+
+
+def get_model() -> "SentenceTransformer":
     if _model is None:
         raise RuntimeError("Embedding model is not loaded")
     return _model
 
 
-def embed(text: str) -> List[float]:
+@tracing.traced()
+def embed(text: str) -> np.ndarray:
+    """float32 vector for *text*, reduced as configured in :mod:`embedding_codec`."""
     from src.services import vector_cache
 
     cached = vector_cache.get(text)
     if cached is not None:
         return cached
-    vector = get_model().encode(text, convert_to_numpy=True).tolist()
+    metrics.MODEL_BATCH_SIZE.observe(1)
+    with metrics.stage("embed"):
+        vector = embedding_codec.reduce(get_model().encode(text, convert_to_numpy=True))
     vector_cache.put(text, vector)
     return vector
 
 
-def embed_batch(texts: List[str]) -> List[List[float]]:
+@tracing.traced()
+def embed_batch(texts: List[str], refresh: bool = False) -> List[np.ndarray]:
+    """
+    Embed many texts with one cache round trip, one model call and one
+    pipelined write.  ``refresh`` skips the cache lookup and overwrites the
+    entries, e.g. after a model upgrade.
+    """
     from src.services import vector_cache
 
-    results: List[List[float] | None] = [vector_cache.get(t) for t in texts]
-    miss_indices = [i for i, r in enumerate(results) if r is None]
-    if miss_indices:
-        miss_texts = [texts[i] for i in miss_indices]
-        vectors = get_model().encode(miss_texts, convert_to_numpy=True).tolist()
-        for i, vec in zip(miss_indices, vectors):
-            vector_cache.put(texts[i], vec)
-            results[i] = vec
+    results: List[np.ndarray | None] = [None] * len(texts) if refresh else vector_cache.get_many(texts)
+    # Deduplicate misses so repeated texts in a batch are encoded once
+    miss_texts = list(dict.fromkeys(t for t, r in zip(texts, results) if r is None))
+    if miss_texts:
+        metrics.MODEL_BATCH_SIZE.observe(len(miss_texts))
+        with metrics.stage("embed"):
+            vectors = embedding_codec.reduce(get_model().encode(
+                miss_texts, batch_size=settings.embedding_batch_size, convert_to_numpy=True
+            ))
+        encoded = dict(zip(miss_texts, vectors))
+        vector_cache.put_many(encoded.items())
+        results = [r if r is not None else encoded[t] for t, r in zip(texts, results)]
     return results  # type: ignore[return-value]
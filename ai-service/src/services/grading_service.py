@@ -0,0 +1,136 @@
+"""
+Batched short-answer grading for the exam engine (FR-56).
+
+Both grading transports — ``POST /api/v1/grade/short-answer`` and the
+MessagePack stream (:mod:`grading_stream`) — submit to one per-process
+:class:`Batcher`, so they score identically and concurrent answers share
+model calls: the batcher collects up to ``GRADING_BATCH_SIZE`` answers,
+waiting at most ``GRADING_BATCH_WAIT_MS`` once the first arrives, and
+grades them with :func:`grade_batch` on the CPU executor.
+
+A score is the answer's marks out of 100 under the same thresholds as
+``answer_scorer.score_answer``.  The answer key comes from the cache
+(``answerkey:{questionId}``) or, when the request carries ``idealAnswer``,
+is embedded and cached on first use.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from src.config import settings
+from src.services.answer_key_service import get_answer_key_embeddings
+from src.services.answer_scorer import award
+from src.services.embedding_service import embed_batch
+from src.utils import executors, metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+MAX_SCORE = 100.0
+
+
+@dataclass
+class GradeRequest:
+    question_id: str
+    candidate_answer: str
+    job_id: str
+    ideal_answer: Optional[str] = None
+
+
+class Overloaded(Exception):
+    """Raised when more than ``GRADING_MAX_PENDING`` answers are waiting."""
+
+
+@tracing.traced()
+def grade_batch(requests: List[GradeRequest]) -> List[Optional[float]]:
+    """Score 0–100 per request, or None when its question has no answer key."""
+    keys = get_answer_key_embeddings(
+        [r.question_id for r in requests],
+        {r.question_id: r.ideal_answer for r in requests if r.ideal_answer},
+    )
+    gradable = [i for i, r in enumerate(requests) if r.question_id in keys]
+    scores: List[Optional[float]] = [None] * len(requests)
+    if not gradable:
+        return scores
+
+    answers = np.stack(embed_batch([requests[i].candidate_answer for i in gradable])).astype(np.float32)
+    ideals = np.stack([keys[requests[i].question_id] for i in gradable]).astype(np.float32)
+    norms = np.linalg.norm(answers, axis=1) * np.linalg.norm(ideals, axis=1)
+    dots = np.einsum("ij,ij->i", answers, ideals)
+    similarity = np.divide(dots, norms, out=np.zeros_like(dots), where=norms != 0)
+    for i, value in zip(gradable, similarity.tolist()):
+        scores[i] = award(value, MAX_SCORE)
+    return scores
+
+
+class Batcher:
+    """Coalesces answers submitted from one event loop into :func:`grade_batch` calls."""
+
+    def __init__(self, max_batch: int, wait_seconds: float, max_pending: int) -> None:
+        self.max_batch = max(1, max_batch)
+        self.wait_seconds = wait_seconds
+        self.max_pending = max_pending
+        self._queue: asyncio.Queue[tuple[GradeRequest, asyncio.Future]] = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def submit(self, request: GradeRequest) -> Optional[float]:
+        if self._queue.qsize() >= self.max_pending:
+            raise Overloaded(f"{self._queue.qsize()} answers waiting")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((request, future))
+        metrics.QUEUE_DEPTH.labels("grading").set(self._queue.qsize())
+        return await future
+
+    def _drain(self, batch: list) -> None:
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            self._drain(batch)
+            if len(batch) < self.max_batch and self.wait_seconds > 0:
+                await asyncio.sleep(self.wait_seconds)
+                self._drain(batch)
+            metrics.QUEUE_DEPTH.labels("grading").set(self._queue.qsize())
+            live = [(request, future) for request, future in batch if not future.done()]
+            if not live:
+                continue
+            try:
+                with metrics.stage("grade"):
+                    scores = await executors.run(executors.CPU, grade_batch, [r for r, _ in live])
+            except Exception as exc:
+                logger.exception("Grading batch of %d failed", len(live))
+                for _, future in live:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), score in zip(live, scores):
+                if not future.done():
+                    future.set_result(score)
+
+    def close(self) -> None:
+        self._worker.cancel()
+
+
+_batchers: dict[asyncio.AbstractEventLoop, Batcher] = {}
+
+
+def get_batcher() -> Batcher:
+    """The batcher of the running event loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None:
+        for stale in [other for other in _batchers if other.is_closed()]:
+            del _batchers[stale]
+        batcher = _batchers[loop] = Batcher(
+            settings.grading_batch_size, settings.grading_batch_wait_ms / 1000, settings.grading_max_pending,
+        )
+    return batcher
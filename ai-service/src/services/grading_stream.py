@@ -0,0 +1,130 @@
+"""
+Binary grading transport for the exam engine.
+
+A TCP listener on ``GRADING_STREAM_PORT`` speaking length-prefixed
+MessagePack: every frame is a 4-byte big-endian length followed by one
+MessagePack map.
+
+    request   {"id": uint, "questionId": str, "candidateAnswer": str, "jobId": str, "idealAnswer"?: str}
+    response  {"id": uint, "score": float}  |  {"id": uint, "error": str}
+
+Field names and ``score`` are those of the exam engine's
+``AIGradingRequest``/``AIGradingResponse``; ``id`` is chosen by the caller.
+A connection stays open and carries any number of requests at once:
+responses are written as soon as their answer is scored — possibly out of
+order — and matched by ``id``.  Answers from every connection (and from
+the JSON endpoint) are graded together by ``grading_service.Batcher``.
+
+Errors: ``no_answer_key``, ``bad_request``, ``overloaded`` (more than
+``GRADING_MAX_PENDING`` answers waiting; retry with backoff) and
+``internal``.  A frame over :data:`MAX_FRAME_BYTES` or one that is not
+MessagePack closes the connection after in-flight answers are sent.
+"""
+
+import asyncio
+import logging
+import struct
+
+import msgpack
+
+from src.services import grading_service
+from src.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_FRAME_BYTES = 1 << 20
+_HEADER = struct.Struct(">I")
+
+_server: asyncio.AbstractServer | None = None
+
+
+def encode_frame(message: dict) -> bytes:
+    payload = msgpack.packb(message)
+    return _HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> dict:
+    """Next message; raises ``IncompleteReadError`` at end of stream and ``ValueError`` on a bad frame."""
+    (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"frame of {length} bytes exceeds {MAX_FRAME_BYTES}")
+    try:
+        return msgpack.unpackb(await reader.readexactly(length))
+    except (msgpack.UnpackException, ValueError) as exc:
+        raise ValueError(f"undecodable frame: {exc}") from None
+
+
+def _parse(message) -> grading_service.GradeRequest:
+    fields = {
+        "question_id": message.get("questionId"),
+        "candidate_answer": message.get("candidateAnswer"),
+        "job_id": message.get("jobId", ""),
+    }
+    if not all(isinstance(value, str) for value in fields.values()):
+        raise TypeError("questionId, candidateAnswer and jobId must be strings")
+    ideal_answer = message.get("idealAnswer")
+    return grading_service.GradeRequest(**fields, ideal_answer=ideal_answer if isinstance(ideal_answer, str) else None)
+
+
+async def _answer(message, writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+    request_id = message.get("id") if isinstance(message, dict) else None
+    response = {"id": request_id}
+    try:
+        score = await grading_service.get_batcher().submit(_parse(message))
+    except (AttributeError, TypeError):
+        response["error"] = "bad_request"
+    except grading_service.Overloaded:
+        response["error"] = "overloaded"
+    except Exception:
+        logger.exception("Grading failed for stream request id=%s", request_id)
+        response["error"] = "internal"
+    else:
+        if score is None:
+            response["error"] = "no_answer_key"
+        else:
+            response["score"] = score
+    metrics.GRADING_REQUESTS.labels("stream", response.get("error", "ok")).inc()
+    async with write_lock:
+        writer.write(encode_frame(response))
+        await writer.drain()
+
+
+async def _serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    write_lock = asyncio.Lock()
+    in_flight: set[asyncio.Task] = set()
+    try:
+        while True:
+            message = await read_frame(reader)
+            task = asyncio.create_task(_answer(message, writer, write_lock))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+    except asyncio.IncompleteReadError:
+        pass  # client finished sending
+    except ValueError as exc:
+        logger.warning("Closing grading stream from %s: %s", writer.get_extra_info("peername"), exc)
+    except ConnectionError:
+        pass
+    finally:
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def start(host: str, port: int) -> asyncio.AbstractServer:
+    """Listen on *host*:*port*; ``reuse_port`` lets every uvicorn worker share the port."""
+    global _server
+    _server = await asyncio.start_server(_serve, host, port, reuse_port=True)
+    logger.info("Grading stream listening on %s", ", ".join(str(s.getsockname()) for s in _server.sockets))
+    return _server
+
+
+async def stop() -> None:
+    global _server
+    if _server is not None:
+        _server.close()
+        await _server.wait_closed()
+        _server = None
@@ -0,0 +1,78 @@
+"""
+Idempotent event processing for the Kafka consumer (FR-63).
+
+Offsets are only committed after processing, so rebalances and crashes
+redeliver records that were already handled.  Each successfully processed
+event is recorded in Redis under ``processed:{topic}:{applicationId}:{hash}``
+with a TTL; redelivered events with the same key are skipped with one
+EXISTS per record, pipelined per poll.
+
+The content hash covers the raw payload and, for CV events, the size and
+modification time of the CV file, so a re-upload to the same path is not
+mistaken for a duplicate.  Setting ``KAFKA_REPLAY_MODE=true`` bypasses the
+check to force reprocessing while still recording keys.
+
+Lookups go through the shared cache client and circuit breaker in
+:mod:`redis_client`; when Redis is unavailable every record is processed.
+"""
+
+import hashlib
+import logging
+import os
+
+import redis
+
+from src.config import settings
+from src.services import redis_client
+from src.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+
+def _get_client() -> redis.Redis:
+    return redis_client.get_cache_client()
+
+
+def event_key(topic: str, application_id: str, raw: bytes, file_path: str | None = None) -> str:
+    digest = hashlib.sha256(raw)
+    if file_path:
+        try:
+            st = os.stat(file_path)
+            digest.update(f"|{st.st_size}|{st.st_mtime_ns}".encode())
+        except OSError:
+            pass  # extraction will report the missing file
+    return f"processed:{topic}:{application_id}:{digest.hexdigest()}"
+
+
+@tracing.traced()
+def already_processed(keys: list[str]) -> list[bool]:
+    """Return, for each key, whether it was processed before (always False in replay mode)."""
+    if not keys or settings.kafka_replay_mode:
+        return [False] * len(keys)
+    try:
+        pipe = _get_client().pipeline(transaction=False)
+        for key in keys:
+            pipe.exists(key)
+        with redis_client.breaker.guard():
+            return [bool(n) for n in pipe.execute()]
+    except redis_client.CircuitOpenError:
+        pass
+    except Exception:
+        logger.warning("Idempotency lookup failed — processing all records", exc_info=True)
+    return [False] * len(keys)
+
+
+@tracing.traced()
+def mark_processed(keys: list[str]) -> None:
+    if not keys:
+        return
+    try:
+        pipe = _get_client().pipeline(transaction=False)
+        for key in keys:
+            pipe.set(key, "1", ex=settings.idempotency_ttl_seconds)
+        with redis_client.breaker.guard():
+            pipe.execute()
+    except redis_client.CircuitOpenError:
+        logger.debug("Redis circuit open — %d processed event keys not recorded", len(keys))
+    except Exception:
+        logger.warning("Failed to record %d processed event keys", len(keys), exc_info=True)
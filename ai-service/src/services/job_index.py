@@ -0,0 +1,187 @@
+"""
+Per-job CV vector index and bulk re-scoring.
+
+Every CV the consumer embeds is also recorded against its job, so when a
+recruiter edits a job description the whole applicant pool can be
+re-scored without re-embedding any CV: the new description is embedded
+once, the job's CV vectors are mapped from its on-disk matrix (see
+``job_matrix_store``), and every relevance score comes out of a single
+matrix-vector product — over the int8 values themselves when vectors are
+stored quantized.  Scores use the
+same scale as ``similarity_service.score_cv_against_job``.
+
+Only scores that changed (at 2 d.p.) since the last published re-score
+are returned and published, as one record on ``CV_SCORES_UPDATED`` keyed by
+job id.  The published scores are stored only once the broker has
+acknowledged the record, so a failed publish is retried in full by the next
+re-score, and a re-score with ``publish=False`` is a preview that leaves
+them untouched.
+
+Keys
+----
+``jobcv:{jobId}:candidates``  hash  applicationId -> candidateId
+``jobcv:{jobId}:scores``      hash  applicationId -> last published cvScore
+"""
+
+import json
+import logging
+import time
+from typing import Iterable
+
+import numpy as np
+import redis
+
+from src.config import settings
+from src.services import job_matrix_store, redis_client
+from src.services.embedding_service import embed
+from src.utils import embedding_codec, metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+TOPIC_CV_SCORES_UPDATED = "CV_SCORES_UPDATED"
+JOB_INDEX_TTL_SECONDS = 60 * 60 * 24 * 90  # 90 days
+PUBLISH_TIMEOUT_SECONDS = 30.0
+
+_producer = None
+
+
+class PublishFailed(Exception):
+    """Raised when changed scores could not be delivered to ``CV_SCORES_UPDATED``."""
+
+
+class Unavailable(Exception):
+    """Raised when the job's candidate and score hashes cannot be read or written."""
+
+
+def _get_client() -> redis.Redis:
+    return redis_client.get_client()
+
+
+def _candidates_key(job_id: str) -> str:
+    return f"jobcv:{job_id}:candidates"
+
+
+def _scores_key(job_id: str) -> str:
+    return f"jobcv:{job_id}:scores"
+
+
+@tracing.traced()
+def add_many(entries: Iterable[tuple[str, str, str, np.ndarray]]) -> None:
+    """Record ``(jobId, applicationId, candidateId, vector)`` tuples; failures are logged, not raised."""
+    try:
+        by_job: dict[str, list[tuple[str, np.ndarray]]] = {}
+        pipe = _get_client().pipeline(transaction=False)
+        for job_id, application_id, candidate_id, vector in entries:
+            by_job.setdefault(job_id, []).append((application_id, vector))
+            pipe.hset(_candidates_key(job_id), application_id, candidate_id)
+        for job_id, rows in by_job.items():
+            job_matrix_store.append(job_id, rows)
+            pipe.expire(_candidates_key(job_id), JOB_INDEX_TTL_SECONDS)
+        with metrics.stage("redis"):
+            pipe.execute()
+    except Exception:
+        logger.warning("Job CV index write failed — job re-scoring will miss these CVs", exc_info=True)
+
+
+def load(job_id: str) -> tuple[list[str], dict[str, str], np.ndarray, dict[str, float]]:
+    """
+    Application ids, candidate ids, the ``(n, dim)`` vector matrix (read-only;
+    int8 when vectors are stored quantized) and last published scores.
+    """
+    application_ids, matrix = job_matrix_store.load(job_id)
+    pipe = _get_client().pipeline(transaction=False)
+    pipe.hgetall(_candidates_key(job_id))
+    pipe.hgetall(_scores_key(job_id))
+    try:
+        with metrics.stage("redis"), redis_client.breaker.guard():
+            candidates, scores = pipe.execute()
+    except (redis.RedisError, redis_client.CircuitOpenError) as exc:
+        logger.warning("Failed to load job CV index for jobId=%s", job_id, exc_info=True)
+        raise Unavailable(str(exc)) from exc
+    return application_ids, candidates, matrix, {a: float(s) for a, s in scores.items()}
+
+
+def remove(job_id: str, application_ids: list[str]) -> None:
+    """Forget withdrawn applications; compacts the job's matrix."""
+    job_matrix_store.delete(job_id, application_ids)
+    pipe = _get_client().pipeline(transaction=False)
+    for key in (_candidates_key(job_id), _scores_key(job_id)):
+        pipe.hdel(key, *application_ids)
+    try:
+        with redis_client.breaker.guard():
+            pipe.execute()
+    except (redis.RedisError, redis_client.CircuitOpenError) as exc:
+        logger.warning("Failed to remove applications from jobId=%s", job_id, exc_info=True)
+        raise Unavailable(str(exc)) from exc
+
+
+def relevance_scores(matrix: np.ndarray, job_vector: np.ndarray) -> np.ndarray:
+    """Cosine relevance of every row against the job, scaled to [0, 100] at 2 d.p."""
+    if matrix.dtype == np.int8:
+        job_vector = embedding_codec.quantize(job_vector)[0][0]
+    cosine = embedding_codec.cosine_scores(matrix, job_vector)
+    return np.round((cosine + 1) / 2 * 100, 2)
+
+
+@tracing.traced()
+def rescore(job_id: str, description: str, publish: bool = True) -> dict:
+    """
+    Re-score every indexed CV of *job_id* against *description*; returns the
+    changed scores.  Raises :class:`PublishFailed` when *publish* is set and
+    the broker does not acknowledge them, and :class:`Unavailable` when the
+    job's hashes cannot be read or updated.
+    """
+    job_vector = np.asarray(embed(description), dtype=np.float32)
+    application_ids, candidates, matrix, previous = load(job_id)
+
+    start = time.perf_counter()
+    with metrics.stage("rescore"):
+        scores = relevance_scores(matrix, job_vector) if application_ids else np.empty(0)
+    compute_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    changed = [
+        {
+            "applicationId": application_id,
+            "candidateId": candidates.get(application_id),
+            "cvScore": float(score),
+            "previousCvScore": previous.get(application_id),
+        }
+        for application_id, score in zip(application_ids, scores.tolist())
+        if previous.get(application_id) != score
+    ]
+    if changed and publish:
+        _publish(job_id, changed)
+        pipe = _get_client().pipeline(transaction=False)
+        pipe.hset(_scores_key(job_id), mapping={c["applicationId"]: c["cvScore"] for c in changed})
+        pipe.expire(_scores_key(job_id), JOB_INDEX_TTL_SECONDS)
+        try:
+            with redis_client.breaker.guard():
+                pipe.execute()
+        except (redis.RedisError, redis_client.CircuitOpenError) as exc:
+            logger.warning("Failed to store published scores for jobId=%s", job_id, exc_info=True)
+            raise Unavailable(str(exc)) from exc
+    logger.info(
+        "Job re-scored: jobId=%s cvs=%d changed=%d compute=%.1fms", job_id, len(application_ids), len(changed), compute_ms,
+    )
+    return {"jobId": job_id, "scored": len(application_ids), "changed": changed, "computeMs": compute_ms}
+
+
+def _get_producer():
+    global _producer
+    if _producer is None:
+        from kafka import KafkaProducer
+
+        _producer = KafkaProducer(bootstrap_servers=settings.kafka_bootstrap_servers, acks="all", linger_ms=50)
+    return _producer
+
+
+def _publish(job_id: str, changed: list[dict]) -> None:
+    """One record with every changed score; returns once the broker has acknowledged it."""
+    payload = json.dumps({"jobId": job_id, "scores": changed}).encode()
+    try:
+        _get_producer().send(TOPIC_CV_SCORES_UPDATED, key=job_id.encode(), value=payload).get(
+            timeout=PUBLISH_TIMEOUT_SECONDS,
+        )
+    except Exception as exc:
+        logger.error("CV_SCORES_UPDATED publish failed for jobId=%s: %s", job_id, exc)
+        raise PublishFailed(str(exc)) from exc
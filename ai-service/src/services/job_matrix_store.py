@@ -0,0 +1,230 @@
+"""
+On-disk, memory-mapped CV vector matrices, one per job.
+
+Layout under ``JOB_MATRIX_DIR``::
+
+    {jobId}/{generation}.vec   raw rows (float32, or int8 with EMBEDDING_QUANTIZATION=int8)
+    {jobId}/{generation}.idx   JSON header line, then one applicationId per row
+    {jobId}/lock               writer lock (flock)
+
+Both files are append-only: a new or re-uploaded CV appends its row to
+``.vec`` first and its id to ``.idx`` second, so a reader never sees an id
+without its row (trailing rows without an id are ignored).  The last row
+for an id wins.  Deleting ids — or enough re-uploads that superseded rows
+outweigh live ones — compacts the job into the next generation: both files
+are written under temporary names and renamed into place, ``.vec`` before
+``.idx``, and readers always open the highest generation that has an
+``.idx``.
+
+Readers map ``.vec`` read-only with ``np.memmap``, so every worker process
+shares one copy of a job's vectors through the page cache and loading is
+zero-copy.  Mappings are cached per process and re-opened when the files
+grow or the generation changes; a mapping of a superseded generation stays
+valid until it is dropped.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from src.config import settings
+from src.utils import embedding_codec
+
+logger = logging.getLogger(__name__)
+
+_GENERATION = re.compile(r"^(\d{8})\.idx$")
+# Word characters, dots and dashes, but never "." or ".."; no look-ahead so
+# FastAPI path validation can reuse it
+JOB_ID_PATTERN = r"^(?:[\w.-]*[\w-][\w.-]*|\.{3,})$"
+_SAFE_ID = re.compile(JOB_ID_PATTERN)
+COMPACT_MIN_GARBAGE = 64
+
+_maps: dict[str, tuple[tuple, list[str], np.ndarray]] = {}
+_maps_lock = threading.Lock()
+
+
+def _job_dir(job_id: str) -> Path:
+    if not _SAFE_ID.fullmatch(job_id):
+        raise ValueError(f"Unsupported job id for the matrix store: {job_id!r}")
+    return Path(settings.job_matrix_dir) / job_id
+
+
+def _generation(job_dir: Path) -> int | None:
+    """Highest complete generation of a job, or None."""
+    if not job_dir.is_dir():
+        return None
+    matches = (_GENERATION.match(name) for name in os.listdir(job_dir))
+    return max((int(m.group(1)) for m in matches if m), default=None)
+
+
+def _paths(job_dir: Path, generation: int) -> tuple[Path, Path]:
+    return job_dir / f"{generation:08d}.vec", job_dir / f"{generation:08d}.idx"
+
+
+@contextmanager
+def _locked(job_id: str) -> Iterator[Path]:
+    import fcntl
+
+    job_dir = _job_dir(job_id)
+    job_dir.mkdir(parents=True, exist_ok=True)
+    with open(job_dir / "lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield job_dir
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read_index(idx_path: Path) -> tuple[dict, list[str]]:
+    with open(idx_path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        ids = f.read().split("\n")
+    # The last element is "" after a complete line, or a line still being appended
+    return header, ids[:-1]
+
+
+def _encode_rows(vectors: list[np.ndarray], dtype: str) -> bytes:
+    matrix = np.stack([np.asarray(v, dtype=np.float32) for v in vectors])
+    if dtype == "int8":
+        return embedding_codec.quantize(matrix)[0].tobytes()
+    return matrix.tobytes()
+
+
+def _live_rows(ids: list[str]) -> dict[str, int]:
+    """applicationId -> row of its latest vector."""
+    return {application_id: row for row, application_id in enumerate(ids)}
+
+
+def _write_generation(job_dir: Path, generation: int, header: dict, ids: list[str], data: bytes) -> None:
+    vec_path, idx_path = _paths(job_dir, generation)
+    for path, content in ((vec_path, data), (idx_path, _index_bytes(header, ids))):
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)  # .vec lands before .idx, so readers only see complete generations
+    for old in range(generation):
+        for path in _paths(job_dir, old):
+            path.unlink(missing_ok=True)
+
+
+def _index_bytes(header: dict, ids: list[str]) -> bytes:
+    return (json.dumps(header) + "\n" + "".join(f"{i}\n" for i in ids)).encode()
+
+
+def _row_bytes(header: dict) -> int:
+    return header["dim"] * np.dtype(header["dtype"]).itemsize
+
+
+def _compact(job_dir: Path, generation: int, drop: frozenset[str] = frozenset()) -> None:
+    vec_path, idx_path = _paths(job_dir, generation)
+    header, ids = _read_index(idx_path)
+    raw = np.fromfile(vec_path, dtype=header["dtype"]).reshape(-1, header["dim"])[: len(ids)]
+    live = sorted((row, application_id) for application_id, row in _live_rows(ids).items() if application_id not in drop)
+    rows = [row for row, _ in live]
+    _write_generation(job_dir, generation + 1, header, [a for _, a in live], raw[rows].tobytes())
+    logger.info("Job matrix compacted: %s rows %d -> %d", job_dir.name, len(ids), len(live))
+
+
+def append(job_id: str, rows: Iterable[tuple[str, np.ndarray]]) -> None:
+    """Add or replace the vectors of ``(applicationId, vector)`` pairs."""
+    rows = list(rows)
+    if not rows:
+        return
+    dim = len(rows[0][1])
+    dtype = "int8" if settings.embedding_quantization == embedding_codec.INT8 else "float32"
+    with _locked(job_id) as job_dir:
+        generation = _generation(job_dir)
+        header, ids = _read_index(_paths(job_dir, generation)[1]) if generation is not None else (None, [])
+        if header is None or header["dim"] != dim:
+            if header is not None:
+                logger.warning(
+                    "Job matrix %s: vector dimension changed %d -> %d; starting a new matrix",
+                    job_id, header["dim"], dim,
+                )
+            generation = 0 if generation is None else generation + 1
+            header, ids = {"dim": dim, "dtype": dtype}, []
+            _write_generation(job_dir, generation, header, ids, b"")
+
+        vec_path, idx_path = _paths(job_dir, generation)
+        # Drop whatever a crashed writer left half-written before appending
+        with open(vec_path, "r+b") as f:
+            f.truncate(len(ids) * _row_bytes(header))
+            f.seek(0, os.SEEK_END)
+            f.write(_encode_rows([v for _, v in rows], header["dtype"]))
+        with open(idx_path, "r+b") as f:
+            f.truncate(f.read().rfind(b"\n") + 1)
+            f.seek(0, os.SEEK_END)
+            f.write("".join(f"{application_id}\n" for application_id, _ in rows).encode())
+
+        total = len(ids) + len(rows)
+        garbage = total - len(_live_rows(ids + [a for a, _ in rows]))
+        if garbage > max(COMPACT_MIN_GARBAGE, total - garbage):
+            _compact(job_dir, generation)
+
+
+def delete(job_id: str, application_ids: Iterable[str]) -> None:
+    """Remove rows and compact the job's matrix."""
+    drop = frozenset(application_ids)
+    with _locked(job_id) as job_dir:
+        generation = _generation(job_dir)
+        if generation is None:
+            return
+        _, ids = _read_index(_paths(job_dir, generation)[1])
+        if drop & set(ids):
+            _compact(job_dir, generation, drop)
+
+
+def load(job_id: str) -> tuple[list[str], np.ndarray]:
+    """
+    Application ids and the matching ``(n, dim)`` read-only matrix.
+
+    A zero-copy view of the shared mapping unless superseded rows are still
+    waiting for compaction, in which case the live rows are gathered.
+    """
+    job_dir = _job_dir(job_id)
+    generation = _generation(job_dir)
+    if generation is None:
+        return [], np.empty((0, 0), dtype=np.float32)
+    vec_path, idx_path = _paths(job_dir, generation)
+    try:
+        key = (generation, idx_path.stat().st_size, vec_path.stat().st_size)
+    except FileNotFoundError:  # compacted between listing and stat
+        return load(job_id)
+
+    with _maps_lock:
+        cached = _maps.get(job_id)
+    if cached is not None and cached[0] == key:
+        return cached[1], cached[2]
+
+    try:
+        header, ids = _read_index(idx_path)
+        rows = min(len(ids), key[2] // _row_bytes(header))
+        ids = ids[:rows]
+        if rows == 0:
+            matrix = np.empty((0, header["dim"]), dtype=header["dtype"])
+        else:
+            matrix = np.memmap(vec_path, dtype=header["dtype"], mode="r", shape=(rows, header["dim"]))
+    except FileNotFoundError:  # compacted between stat and open
+        return load(job_id)
+    live = _live_rows(ids)
+    if len(live) != len(ids):
+        ordered = sorted(live.items(), key=lambda item: item[1])
+        ids = [application_id for application_id, _ in ordered]
+        matrix = matrix[[row for _, row in ordered]]
+    with _maps_lock:
+        _maps[job_id] = (key, ids, matrix)
+    return ids, matrix
+
+
+def jobs() -> list[str]:
+    root = Path(settings.job_matrix_dir)
+    return sorted(p.name for p in root.iterdir() if _generation(p) is not None) if root.is_dir() else []
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import List, Optional
 
 from src.services.attribution_service import AttributionResult
+from src.utils import tracing
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,7 @@ def _fmt_contributors(items: List[tuple[str, float]], n: int = 3) -> str:
     return ", ".join(f'"{w}"' for w in top[:-1]) + f' and "{top[-1]}"'
 
 
+@tracing.traced()
 def generate(data: JustificationInput) -> Justification:
     name = data.candidate_name
     job = data.job_title
@@ -1,66 +1,76 @@
 import json
 import logging
 import threading
-from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable
 
-from kafka import KafkaConsumer
-from kafka.errors import KafkaError
 from pydantic import ValidationError
 
 from src.config import settings
 from src.models.events import CvUploadedEvent, ExamSubmittedEvent
+from src.services import idempotency, retry_queue
+from src.utils import metrics, tracing
+
+if TYPE_CHECKING:
+    from kafka import KafkaConsumer
 
 logger = logging.getLogger(__name__)
 
 TOPIC_CV_UPLOADED = "CV_UPLOADED"
 TOPIC_EXAM_SUBMITTED = "EXAM_SUBMITTED"
-TOPIC_DEAD_LETTER = "AI_DEAD_LETTER"
+TOPIC_DEAD_LETTER = retry_queue.TOPIC_DEAD_LETTER
 
 _consumer_thread: threading.Thread | None = None
+_executor: ThreadPoolExecutor | None = None
+
+
+def _make_consumer(topics: list[str]) -> "KafkaConsumer":
+    from kafka import ConsumerRebalanceListener, KafkaConsumer
+
+    class _RebalanceListener(ConsumerRebalanceListener):
+        def on_partitions_revoked(self, revoked):
+            _forget_partitions(revoked)
 
+        def on_partitions_assigned(self, assigned):
+            pass
 
-def _make_consumer(topics: list[str]) -> KafkaConsumer:
-    return KafkaConsumer(
-        *topics,
+    consumer = KafkaConsumer(
         bootstrap_servers=settings.kafka_bootstrap_servers,
         group_id="ai-service",
         auto_offset_reset="earliest",
         enable_auto_commit=False,
+        max_poll_records=settings.kafka_max_poll_records,
         value_deserializer=lambda b: b,
     )
+    consumer.subscribe(topics, listener=_RebalanceListener())
+    return consumer
 
 
-def _make_dlq_producer():
+def _make_failure_producer():
     from kafka import KafkaProducer
     return KafkaProducer(
         bootstrap_servers=settings.kafka_bootstrap_servers,
-        value_serializer=lambda v: json.dumps(v).encode(),
+        acks="all",
+        linger_ms=50,
     )
 
 
-def _send_to_dlq(producer, topic: str, raw: bytes, reason: str) -> None:
-    try:
-        producer.send(TOPIC_DEAD_LETTER, {"source_topic": topic, "reason": reason, "payload": raw.decode(errors="replace")})
-        producer.flush()
-    except KafkaError:
-        logger.exception("Failed to send message to dead-letter queue")
-
-
-def _process_cv_uploaded(event: CvUploadedEvent) -> None:
-    logger.info("CV_UPLOADED received: applicationId=%s", event.applicationId)
+def _extract_and_mask(event: CvUploadedEvent) -> str | None:
+    """Extract and PII-mask one CV; returns None when extraction fails."""
     from src.utils.text_extractor import extract_text
-    from src.utils.nlp_pipeline import preprocess
     from src.utils.pii_masker import mask
 
     try:
-        raw_text = extract_text(event.cvFilePath)
+        with metrics.stage("extract_text"):
+            raw_text = extract_text(event.cvFilePath)
     except Exception as exc:
         logger.error("Text extraction failed for applicationId=%s: %s", event.applicationId, exc)
         # FR-21 callback with failure status wired here in FR-66+
-        return
+        return None
 
     # FR-75: mask PII before any ML processing or caching
-    mask_result = mask(raw_text)
+    with metrics.stage("mask"):
+        mask_result = mask(raw_text)
     if mask_result.detections:
         logger.info(
             "PII detections for applicationId=%s: %s",
@@ -68,13 +78,109 @@ def _process_cv_uploaded(event: CvUploadedEvent) -> None:
             ", ".join(f"{lbl}×{cnt}" for lbl, cnt in mask_result.detections),
         )
     # raw_text kept for display-only use (e.g. feedback PDF); masked_text goes to ML
-    masked_text = mask_result.masked_text
+    return mask_result.masked_text
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.cv_batch_workers, thread_name_prefix="cv-extract")
+    return _executor
+
+
+def _process_cv_batch(events: list[CvUploadedEvent]) -> None:
+    """
+    Run the CV pipeline over a micro-batch of events from one poll.
 
-    preprocessed = preprocess(masked_text)
-    logger.info("CV preprocessed: applicationId=%s chars=%d", event.applicationId, len(preprocessed))
+    Extraction and masking fan out across a thread pool; preprocessing and
+    embedding then run once for the whole batch (one ``nlp.pipe`` pass, one
+    model call, one pipelined cache write); long CVs are embedded as pooled
+    windows (see ``chunked_embedding``).  Near-duplicates of CVs already
+    seen (in the index or earlier in this batch) reuse that CV's
+    preprocessed text instead of going through spaCy and SBERT again (see
+    ``cv_dedup`` for which CVs may be reused).
+    Vectors are recorded per job so a job edit can re-score every CV.
+    """
+    from src.services import cv_dedup, job_index
+    from src.services.chunked_embedding import document_vectors
+    from src.utils.nlp_pipeline import preprocess_batch
+
+    logger.info("CV_UPLOADED batch received: size=%d", len(events))
+    masked = list(_get_executor().map(tracing.in_current_context(_extract_and_mask), events))
+    ready = [(e, text) for e, text in zip(events, masked) if text is not None]
+    if not ready:
+        return
+
+    with metrics.stage("fingerprint"):
+        fingerprints = [cv_dedup.fingerprint(text) for _, text in ready]
+        masked_digests = [cv_dedup.text_digest(text) for _, text in ready]
+    matches = cv_dedup.lookup_many(
+        fingerprints, [e.applicationId for e, _ in ready], [e.candidateId for e, _ in ready], masked_digests,
+    )
+    # Near-duplicates within the batch follow the first copy from the same
+    # candidate; another candidate's copy only when the masked text is identical
+    batch_source: dict[int, tuple[int, float]] = {}
+    fresh: list[int] = []
+    for i, match in enumerate(matches):
+        if match is not None:
+            continue
+        eligible = [
+            j for j in fresh
+            if ready[j][0].candidateId == ready[i][0].candidateId or masked_digests[j] == masked_digests[i]
+        ]
+        best = cv_dedup.closest(fingerprints[i], [fingerprints[j] for j in eligible])
+        if best is not None:
+            batch_source[i] = (eligible[best[0]], best[1])
+        else:
+            fresh.append(i)
+
+    with metrics.stage("preprocess"):
+        fresh_texts = preprocess_batch([ready[i][1] for i in fresh])
+    preprocessed: list[str] = [""] * len(ready)
+    for i, text in zip(fresh, fresh_texts):
+        preprocessed[i] = text
+    entries = []
+    for i, (event, _) in enumerate(ready):
+        entry = {
+            "applicationId": event.applicationId,
+            "candidateId": event.candidateId,
+            "jobId": event.jobId,
+            "simhash": fingerprints[i],
+            "maskedDigest": masked_digests[i],
+        }
+        if matches[i] is not None:
+            source, score = matches[i].application_id, matches[i].similarity
+            preprocessed[i] = matches[i].preprocessed
+        elif i in batch_source:
+            j, score = batch_source[i]
+            source = ready[j][0].applicationId
+            preprocessed[i] = preprocessed[j]
+        else:
+            source = None
+            metrics.CV_DEDUP.labels("new").inc()
+            logger.info("CV preprocessed: applicationId=%s chars=%d", event.applicationId, len(preprocessed[i]))
+        if source is not None:
+            metrics.CV_DEDUP.labels("reused").inc()
+            entry.update(reusedFrom=source, similarity=score)
+            logger.info(
+                "CV near-duplicate: applicationId=%s reuses applicationId=%s (similarity=%.3f)",
+                event.applicationId, source, score,
+            )
+        entries.append({**entry, "preprocessed": preprocessed[i]})
+
+    vectors = document_vectors(preprocessed)
+    cv_dedup.record_many(entries)
+    job_index.add_many(
+        (event.jobId, event.applicationId, event.candidateId, vector) for (event, _), vector in zip(ready, vectors)
+    )
+    logger.info("CV batch embedded: size=%d (%d near-duplicates reused)", len(ready), len(ready) - len(fresh))
     # FR-66 similarity scoring wired here
 
 
+def _process_cv_uploaded(event: CvUploadedEvent) -> None:
+    _process_cv_batch([event])
+
+
 def _process_exam_submitted(event: ExamSubmittedEvent) -> None:
     logger.info("EXAM_SUBMITTED received: applicationId=%s", event.applicationId)
     # FR-70+ short-answer grading pipeline wired here
@@ -86,27 +192,186 @@ _HANDLERS: dict[str, tuple[type, Callable]] = {
     TOPIC_EXAM_SUBMITTED: (ExamSubmittedEvent, _process_exam_submitted),
 }
 
+# Topics whose events are handled together per poll rather than one by one
+_BATCH_HANDLERS: dict[str, Callable[[list], None]] = {
+    TOPIC_CV_UPLOADED: _process_cv_batch,
+}
 
-def _consume_loop() -> None:
-    consumer = _make_consumer([TOPIC_CV_UPLOADED, TOPIC_EXAM_SUBMITTED])
-    dlq = _make_dlq_producer()
-    logger.info("Kafka consumer started, topics: %s, %s", TOPIC_CV_UPLOADED, TOPIC_EXAM_SUBMITTED)
 
-    for message in consumer:
-        topic = message.topic
+def _event_key(topic: str, message, event) -> str:
+    file_path = event.cvFilePath if isinstance(event, CvUploadedEvent) else None
+    return idempotency.event_key(topic, event.applicationId, message.value, file_path)
+
+
+def _handle_one(topic: str, message, event) -> Exception | None:
+    """Run one event's handler in a span continuing the producer's trace; returns the error, if any."""
+    parent = tracing.extract_kafka(message.headers)
+    with tracing.span(
+        f"kafka.process {topic}", parent=parent, kind="consumer", **{"messaging.kafka.offset": message.offset},
+    ):
+        try:
+            _HANDLERS[topic][1](event)
+        except Exception as exc:
+            logger.exception("Unhandled error processing event on topic %s", message.topic)
+            return exc
+    return None
+
+
+def _handle_batch(topic: str, items: list[tuple]) -> None:
+    """Run a batch handler in one span linked to the trace of every record in it."""
+    links = [tracing.link_to(tracing.extract_kafka(message.headers)) for message, *_ in items]
+    with tracing.span(
+        f"kafka.process_batch {topic}",
+        links=[link for link in links if link is not None],
+        kind="consumer",
+        **{"messaging.batch.message_count": len(items)},
+    ):
+        _BATCH_HANDLERS[topic]([event for _, event, _ in items])
+
+
+def _process_records(records: list, failures: retry_queue.FailurePublisher) -> list[tuple]:
+    """
+    Validate one poll's records and dispatch them.
+
+    Malformed records are dead-lettered straight away and events that were
+    already processed — or that repeat an earlier record of the same poll —
+    are skipped.  Returns the ``(message, exception)``
+    pairs whose handler raised so the caller can park them on a retry topic.
+    """
+    valid: list[tuple] = []
+    batch_keys: set[str] = set()
+    for message in records:
+        topic = retry_queue.source_topic(message.topic)
         raw: bytes = message.value
         try:
             payload = json.loads(raw)
-            model_cls, handler = _HANDLERS[topic]
+            model_cls, _ = _HANDLERS[topic]
             event = model_cls(**payload)
-            handler(event)
-            consumer.commit()
         except (json.JSONDecodeError, ValidationError, KeyError) as exc:
-            logger.error("Malformed event on topic %s: %s", topic, exc)
-            _send_to_dlq(dlq, topic, raw, str(exc))
-            consumer.commit()
+            logger.error("Malformed event on topic %s: %s", message.topic, exc)
+            metrics.KAFKA_RECORDS.labels(topic, "malformed").inc()
+            failures.dead_letter(message, str(exc))
+            continue
+        key = _event_key(topic, message, event)
+        if key in batch_keys:
+            metrics.KAFKA_RECORDS.labels(topic, "duplicate").inc()
+            logger.info("Skipping repeated event in batch on topic %s: applicationId=%s", message.topic, event.applicationId)
+            continue
+        batch_keys.add(key)
+        valid.append((message, topic, event, key))
+
+    seen = idempotency.already_processed([key for *_, key in valid])
+    batches: dict[str, list[tuple]] = {}
+    failed: list[tuple] = []
+    done: list[str] = []
+    for (message, topic, event, key), duplicate in zip(valid, seen):
+        if duplicate:
+            metrics.KAFKA_RECORDS.labels(topic, "duplicate").inc()
+            logger.info("Skipping redelivered event on topic %s: applicationId=%s", message.topic, event.applicationId)
+            continue
+        if topic in _BATCH_HANDLERS:
+            batches.setdefault(topic, []).append((message, event, key))
+            continue
+        exc = _handle_one(topic, message, event)
+        if exc is None:
+            done.append(key)
+        else:
+            failed.append((message, exc))
+
+    for topic, items in batches.items():
+        try:
+            _handle_batch(topic, items)
+            done.extend(key for *_, key in items)
         except Exception:
-            logger.exception("Unhandled error processing event on topic %s — offset NOT committed", topic)
+            logger.exception(
+                "Batch of %d events on topic %s failed — retrying events one by one", len(items), topic,
+            )
+            # Isolate the poison record(s) so the rest of the batch still completes
+            for message, event, key in items:
+                exc = _handle_one(topic, message, event)
+                if exc is None:
+                    done.append(key)
+                else:
+                    failed.append((message, exc))
+
+    idempotency.mark_processed(done)
+    processed = set(done)
+    for message, topic, _, key in valid:
+        if key in processed:
+            metrics.KAFKA_RECORDS.labels(topic, "processed").inc()
+    for message, _ in failed:
+        metrics.KAFKA_RECORDS.labels(retry_queue.source_topic(message.topic), "failed").inc()
+    return failed
+
+
+def _take_due_records(consumer, polled: dict, gate: retry_queue.PartitionGate) -> list:
+    """Flatten a poll, holding back retry partitions whose head record is not yet due."""
+    records = []
+    for tp, messages in polled.items():
+        for message in messages:
+            delay = retry_queue.remaining_delay_ms(message)
+            if delay > 0:
+                gate.hold(consumer, tp, message.offset, delay)
+                break
+            records.append(message)
+    return records
+
+
+def _record_lag(consumer, polled: dict) -> None:
+    """Export lag from fetch metadata already held by the client (no broker round trip)."""
+    for tp in polled:
+        highwater = consumer.highwater(tp)
+        if highwater is None:
+            continue
+        lag = highwater - consumer.position(tp)
+        metrics.KAFKA_LAG.labels(tp.topic, str(tp.partition)).set(max(lag, 0))
+
+
+def _forget_partitions(revoked) -> None:
+    """Drop the lag series of partitions moved to another consumer so they stop reporting a stale value."""
+    for tp in revoked:
+        labels = (tp.topic, str(tp.partition))
+        # In multiprocess mode the last value stays in this worker's file; zero it before removing
+        metrics.KAFKA_LAG.labels(*labels).set(0)
+        metrics.KAFKA_LAG.remove(*labels)
+
+
+def _rewind_unparked(consumer, polled: dict, unparked: list) -> None:
+    """Seek each partition back to its earliest record that could not be parked, so it is not committed."""
+    lost = {id(message) for message in unparked}
+    for tp, messages in polled.items():
+        offsets = [m.offset for m in messages if id(m) in lost]
+        if offsets:
+            logger.warning("Rewinding %s to offset %d: retry/dead-letter publish failed", tp, min(offsets))
+            consumer.seek(tp, min(offsets))
+
+
+def _consume_loop() -> None:
+    topics = [TOPIC_CV_UPLOADED, TOPIC_EXAM_SUBMITTED]
+    retry_topics = [rt for t in topics for rt in retry_queue.retry_topics(t)]
+    consumer = _make_consumer(topics + retry_topics)
+    failures = retry_queue.FailurePublisher(_make_failure_producer())
+    gate = retry_queue.PartitionGate()
+    logger.info("Kafka consumer started, topics: %s (+%d retry topics)", ", ".join(topics), len(retry_topics))
+
+    while True:
+        gate.release_due(consumer)
+        polled = consumer.poll(
+            timeout_ms=settings.kafka_poll_timeout_ms,
+            max_records=settings.kafka_max_poll_records,
+        )
+        if not polled:
+            continue
+        records = _take_due_records(consumer, polled, gate)
+        metrics.QUEUE_DEPTH.labels("kafka_batch").set(len(records))
+        for message, exc in _process_records(records, failures):
+            failures.retry(message, exc)
+        # Failed records are parked on retry topics; one that could not be parked
+        # is redelivered (records already handled after it are skipped as duplicates)
+        _rewind_unparked(consumer, polled, failures.confirm())
+        consumer.commit()
+        metrics.QUEUE_DEPTH.labels("kafka_batch").set(0)
+        _record_lag(consumer, polled)
 
 
 def start_consumer() -> None:
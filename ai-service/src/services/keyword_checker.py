@@ -3,6 +3,8 @@ import os
 from dataclasses import dataclass, field
 from typing import List
 
+from src.utils import tracing
+
 logger = logging.getLogger(__name__)
 
 PENALTY_PER_MISSING = float(os.getenv("KEYWORD_PENALTY_PERCENT", "5.0"))
@@ -15,6 +17,7 @@ class KeywordCheckResult:
     penalty_applied: float
 
 
+@tracing.traced()
 def check_keywords(
     candidate_answer: str,
     required_keywords: List[str],
@@ -0,0 +1,161 @@
+"""
+Incremental per-job leaderboard (FR-67).
+
+Keeps each job's ranking in a Redis sorted set so one candidate's CV or
+exam score can be updated in O(log n) instead of re-ranking the whole batch
+through ``POST /rank/batch``.  Final scores use the same 40/40/20 formula as
+the batch endpoint; hard-filter failures score 0 and therefore rank below
+every passing candidate (who score at least 20).  Candidates with equal
+final scores are listed in reverse lexicographic order of candidate id,
+which is how ZREVRANGE orders equal scores.
+
+Keys
+----
+``leaderboard:{jobId}``         sorted set  candidateId -> finalScore
+``leaderboard:{jobId}:scores``  hash        candidateId -> JSON component scores
+"""
+
+import json
+import logging
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+import redis
+
+from src.services import redis_client
+from src.services.ranking_engine import final_score
+from src.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_TTL_SECONDS = 60 * 60 * 24 * 30  # 30 days
+
+
+class Unavailable(Exception):
+    """Raised when the leaderboard cannot be read or written."""
+
+
+@contextmanager
+def _store(action: str, job_id: str) -> Iterator[None]:
+    try:
+        yield
+    except redis.RedisError as exc:
+        logger.warning("Failed to %s leaderboard for jobId=%s", action, job_id, exc_info=True)
+        raise Unavailable(str(exc)) from exc
+
+
+def _get_client() -> redis.Redis:
+    return redis_client.get_client()
+
+
+def _board_key(job_id: str) -> str:
+    return f"leaderboard:{job_id}"
+
+
+def _scores_key(job_id: str) -> str:
+    return f"leaderboard:{job_id}:scores"
+
+
+def _entry(candidate_id: str, rank: int, components: dict[str, Any], final: float) -> dict[str, Any]:
+    return {
+        "candidateId": candidate_id,
+        "rank": rank,
+        "cvScore": components.get("cvScore", 0.0),
+        "examScore": components.get("examScore", 0.0),
+        "hardFilterPassed": components.get("hardFilterPassed", True),
+        "finalScore": final,
+    }
+
+
+@tracing.traced()
+def update(
+    job_id: str,
+    candidate_id: str,
+    cv_score: float | None = None,
+    exam_score: float | None = None,
+    hard_filter_passed: bool | None = None,
+) -> dict[str, Any]:
+    """
+    Merge the given component scores into a candidate's entry and re-score it.
+
+    Components left as ``None`` keep their stored value (a new candidate
+    starts at cvScore 0, examScore 0, hard filter passed).  The read-merge-
+    write runs as a WATCH/MULTI transaction so concurrent updates for the
+    same job do not lose components.
+    """
+    board_key, scores_key = _board_key(job_id), _scores_key(job_id)
+    client = _get_client()
+    merged: dict[str, Any] = {}
+
+    def _apply(pipe) -> None:
+        raw = pipe.hget(scores_key, candidate_id)
+        components = json.loads(raw) if raw else {"cvScore": 0.0, "examScore": 0.0, "hardFilterPassed": True}
+        if cv_score is not None:
+            components["cvScore"] = cv_score
+        if exam_score is not None:
+            components["examScore"] = exam_score
+        if hard_filter_passed is not None:
+            components["hardFilterPassed"] = hard_filter_passed
+        final = final_score(components["cvScore"], components["examScore"], components["hardFilterPassed"])
+        merged.update(components=components, final=final)
+
+        pipe.multi()
+        pipe.hset(scores_key, candidate_id, json.dumps(components))
+        pipe.zadd(board_key, {candidate_id: final})
+        pipe.expire(scores_key, LEADERBOARD_TTL_SECONDS)
+        pipe.expire(board_key, LEADERBOARD_TTL_SECONDS)
+        # Ranked inside the transaction, so a concurrent delete cannot leave it unranked
+        pipe.zrevrank(board_key, candidate_id)
+
+    with _store("update", job_id):
+        rank = client.transaction(_apply, scores_key)[-1]
+    entry = _entry(candidate_id, rank + 1, merged["components"], merged["final"])
+    logger.info(
+        "Leaderboard updated: jobId=%s candidateId=%s finalScore=%.2f rank=%s",
+        job_id, candidate_id, entry["finalScore"], entry["rank"],
+    )
+    return entry
+
+
+@tracing.traced()
+def top(job_id: str, offset: int = 0, limit: int = 50) -> dict[str, Any]:
+    """Return one page of the leaderboard, best first (ranks are 1-based)."""
+    client = _get_client()
+    board_key = _board_key(job_id)
+    pipe = client.pipeline(transaction=False)
+    pipe.zrevrange(board_key, offset, offset + limit - 1, withscores=True)
+    pipe.zcard(board_key)
+    components: list[str | None] = []
+    with _store("read", job_id):
+        members, total = pipe.execute()
+        if members:
+            components = client.hmget(_scores_key(job_id), [cid for cid, _ in members])
+    entries = [
+        _entry(cid, offset + i + 1, json.loads(raw) if raw else {}, score)
+        for i, ((cid, score), raw) in enumerate(zip(members, components))
+    ]
+    return {"jobId": job_id, "total": total, "offset": offset, "limit": limit, "entries": entries}
+
+
+@tracing.traced()
+def rank_of(job_id: str, candidate_id: str) -> dict[str, Any] | None:
+    """Return a candidate's 1-based rank and scores, or None if not on the leaderboard."""
+    pipe = _get_client().pipeline(transaction=False)
+    pipe.zrevrank(_board_key(job_id), candidate_id)
+    pipe.zscore(_board_key(job_id), candidate_id)
+    pipe.hget(_scores_key(job_id), candidate_id)
+    with _store("read", job_id):
+        rank, score, raw = pipe.execute()
+    if rank is None:
+        return None
+    return _entry(candidate_id, rank + 1, json.loads(raw) if raw else {}, score)
+
+
+@tracing.traced()
+def remove(job_id: str, candidate_id: str) -> bool:
+    pipe = _get_client().pipeline(transaction=True)
+    pipe.zrem(_board_key(job_id), candidate_id)
+    pipe.hdel(_scores_key(job_id), candidate_id)
+    with _store("update", job_id):
+        removed, _ = pipe.execute()
+    return bool(removed)
@@ -1,40 +1,71 @@
+"""
+Candidate feedback reports.
+
+A report is content-addressed: its file name carries a hash of every input
+and :data:`TEMPLATE_VERSION`, so asking again with unchanged scores,
+attribution, justification and notes returns the existing file without
+rendering::
+
+    {STORAGE_DIR}/{applicationId}_feedback_{digest[:16]}.pdf
+
+Reports are rendered under ``tmp/`` and renamed into place, so a reader
+never sees a partial PDF.  Once an application's report changes, the
+superseded files are removed by :func:`sweep` after
+``PDF_SWEEP_GRACE_SECONDS`` — long enough for anyone handed the old path
+to finish reading it.
+"""
+
+import argparse
+import hashlib
+import json
 import logging
 import os
-from dataclasses import dataclass
+import re
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import asdict
 from pathlib import Path
 from typing import Optional
 
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.platypus import (
-    Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle,
-)
-
+from src.config import settings
 from src.services.attribution_service import AttributionResult
 from src.services.justification_engine import Justification
+from src.utils import metrics, tracing
 
 logger = logging.getLogger(__name__)
 
+# Created on first use, not at import
 STORAGE_DIR = Path(os.getenv("PDF_STORAGE_DIR", "./reports"))
-STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+
+# Part of every report's digest: bump when the layout changes so cached reports are re-rendered
+TEMPLATE_VERSION = 1
+
+_REPORT_NAME = re.compile(r"^(?P<application>.+)_feedback(?:_(?P<digest>[0-9a-f]{16}))?\.pdf$")
 
 # Colours
-PRIMARY = colors.HexColor("#1a3c5e")
-ACCENT = colors.HexColor("#2e86c1")
-LIGHT_BG = colors.HexColor("#eaf4fb")
+PRIMARY = "#1a3c5e"
+ACCENT = "#2e86c1"
+LIGHT_BG = "#eaf4fb"
+
+
+def _pyplot():
+    # matplotlib and its Agg backend are only loaded once a report is rendered
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
 
 
 def _build_attribution_chart(attribution: AttributionResult, tmp_path: Path) -> Path:
     items = sorted(attribution.raw_weights[:10], key=lambda x: x[1])
     words = [w for w, _ in items]
     weights = [s for _, s in items]
-    bar_colors = [ACCENT.hexval() if s > 0 else "#e74c3c" for s in weights]
+    bar_colors = [ACCENT if s > 0 else "#e74c3c" for s in weights]
 
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(7, max(3, len(words) * 0.4)))
     ax.barh(words, weights, color=bar_colors)
     ax.axvline(0, color="black", linewidth=0.8)
@@ -52,6 +83,38 @@ def _score_row(label: str, value: float, max_val: float = 100) -> list:
     return [label, f"{value:.1f} / {max_val:.0f}"]
 
 
+def report_digest(
+    application_id: str,
+    candidate_name: str,
+    job_title: str,
+    cv_score: float,
+    exam_score: float,
+    final_score: float,
+    hard_filter_passed: bool,
+    attribution: AttributionResult,
+    justification: Justification,
+    recruiter_notes: Optional[str] = None,
+) -> str:
+    """SHA-256 of everything that ends up in the report, including the template version."""
+    inputs = {
+        "template": TEMPLATE_VERSION,
+        "applicationId": application_id,
+        "candidateName": candidate_name,
+        "jobTitle": job_title,
+        "scores": [cv_score, exam_score, final_score, hard_filter_passed],
+        "attribution": asdict(attribution),
+        "justification": asdict(justification),
+        "recruiterNotes": (recruiter_notes or "").strip(),
+    }
+    # default=str: LIME weights may be NumPy scalars
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def report_path(application_id: str, digest: str) -> Path:
+    return STORAGE_DIR / f"{application_id}_feedback_{digest[:16]}.pdf"
+
+
+@tracing.traced()
 def generate_pdf(
     application_id: str,
     candidate_name: str,
@@ -64,9 +127,63 @@ def generate_pdf(
     justification: Justification,
     recruiter_notes: Optional[str] = None,
 ) -> Path:
-    out_path = STORAGE_DIR / f"{application_id}_feedback.pdf"
+    """Path of the report for these inputs, rendering it only if it does not exist yet."""
+    digest = report_digest(
+        application_id, candidate_name, job_title, cv_score, exam_score, final_score,
+        hard_filter_passed, attribution, justification, recruiter_notes,
+    )
+    out_path = report_path(application_id, digest)
+    try:
+        # Refresh the mtime so the sweeper treats this report as the current one
+        os.utime(out_path)
+    except FileNotFoundError:
+        pass
+    else:
+        metrics.FEEDBACK_REPORTS.labels("cached").inc()
+        return out_path
+
     tmp_dir = STORAGE_DIR / "tmp"
-    tmp_dir.mkdir(exist_ok=True)
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    work_dir = Path(tempfile.mkdtemp(prefix=f"{digest[:16]}.", dir=tmp_dir))
+    try:
+        part_path = work_dir / "report.pdf"
+        _render(
+            part_path, work_dir, candidate_name, job_title, cv_score, exam_score, final_score,
+            hard_filter_passed, attribution, justification, recruiter_notes,
+        )
+        with open(part_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(part_path, out_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    metrics.FEEDBACK_REPORTS.labels("rendered").inc()
+    logger.info("PDF generated: %s", out_path)
+    sweep(application_id)
+    return out_path
+
+
+def _render(
+    out_path: Path,
+    work_dir: Path,
+    candidate_name: str,
+    job_title: str,
+    cv_score: float,
+    exam_score: float,
+    final_score: float,
+    hard_filter_passed: bool,
+    attribution: AttributionResult,
+    justification: Justification,
+    recruiter_notes: Optional[str],
+) -> None:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import (
+        Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle,
+    )
+
+    primary, accent, light_bg = (colors.HexColor(c) for c in (PRIMARY, ACCENT, LIGHT_BG))
 
     doc = SimpleDocTemplate(
         str(out_path),
@@ -77,8 +194,8 @@ def generate_pdf(
         bottomMargin=2 * cm,
     )
     styles = getSampleStyleSheet()
-    h1 = ParagraphStyle("h1", parent=styles["Heading1"], textColor=PRIMARY, fontSize=16)
-    h2 = ParagraphStyle("h2", parent=styles["Heading2"], textColor=ACCENT, fontSize=12)
+    h1 = ParagraphStyle("h1", parent=styles["Heading1"], textColor=primary, fontSize=16)
+    h2 = ParagraphStyle("h2", parent=styles["Heading2"], textColor=accent, fontSize=12)
     body = styles["BodyText"]
     body.leading = 16
 
@@ -102,11 +219,11 @@ def generate_pdf(
     ]
     tbl = Table(score_data, colWidths=[9 * cm, 6 * cm])
     tbl.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), PRIMARY),
+        ("BACKGROUND", (0, 0), (-1, 0), primary),
         ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
         ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("BACKGROUND", (0, 1), (-1, -1), LIGHT_BG),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, LIGHT_BG]),
+        ("BACKGROUND", (0, 1), (-1, -1), light_bg),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, light_bg]),
         ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
         ("FONTSIZE", (0, 0), (-1, -1), 10),
         ("PADDING", (0, 0), (-1, -1), 6),
@@ -116,7 +233,7 @@ def generate_pdf(
 
     # — Attribution Chart —
     story.append(Paragraph("CV Feature Attribution", h2))
-    chart_path = _build_attribution_chart(attribution, tmp_dir)
+    chart_path = _build_attribution_chart(attribution, work_dir)
     story.append(Image(str(chart_path), width=14 * cm, height=7 * cm))
     story.append(Spacer(1, 0.6 * cm))
 
@@ -132,6 +249,61 @@ def generate_pdf(
         story.append(Paragraph("Recruiter Notes", h2))
         story.append(Paragraph(recruiter_notes.strip(), body))
 
-    doc.build(story)
-    logger.info("PDF generated: %s", out_path)
-    return out_path
+    with metrics.stage("pdf"):
+        doc.build(story)
+
+
+def sweep(application_id: Optional[str] = None, grace_seconds: Optional[float] = None) -> int:
+    """
+    Delete superseded reports — every one but the most recently generated or
+    served per application — and abandoned renders under ``tmp/``, once
+    untouched for *grace_seconds*.  Limited to one application when given.
+    Returns the number of files removed.
+    """
+    grace = settings.pdf_sweep_grace_seconds if grace_seconds is None else grace_seconds
+    cutoff = time.time() - grace
+    by_application: dict[str, list[tuple[float, Path]]] = {}
+    try:
+        entries = list(os.scandir(STORAGE_DIR))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        match = _REPORT_NAME.match(entry.name)
+        if match is None or (application_id is not None and match["application"] != application_id):
+            continue
+        try:
+            by_application.setdefault(match["application"], []).append((entry.stat().st_mtime, Path(entry.path)))
+        except FileNotFoundError:
+            continue  # removed by a concurrent sweep
+
+    stale = [path for reports in by_application.values() for mtime, path in sorted(reports)[:-1] if mtime < cutoff]
+    if application_id is None and (STORAGE_DIR / "tmp").is_dir():
+        for entry in os.scandir(STORAGE_DIR / "tmp"):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    stale.append(Path(entry.path))
+            except FileNotFoundError:
+                continue
+    for path in stale:
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+    if stale:
+        logger.info("Swept %d superseded feedback report file(s)", len(stale))
+    return len(stale)
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Feedback report maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sweep_parser = sub.add_parser("sweep", help="remove superseded reports and abandoned renders")
+    sweep_parser.add_argument("--grace-seconds", type=float, default=None)
+    args = parser.parse_args(argv)
+    print(sweep(grace_seconds=args.grace_seconds))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Columnar ranking engine for ``POST /rank/batch`` (FR-67).
+
+Scores are computed on NumPy columns instead of per-candidate objects.
+Ordering is by final score descending with hard-filter failures always
+last; ties keep request order.  When only the top ``k`` candidates are
+needed, ``argpartition`` selects them in O(n) before sorting just those k.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.utils import tracing
+
+CV_WEIGHT = 0.4
+EXAM_WEIGHT = 0.4
+HARD_FILTER_WEIGHT = 0.2
+
+
+def final_score(cv_score: float, exam_score: float, hard_filter_passed: bool) -> float:
+    """40/40/20 weighted final score (FR-28) for a single candidate."""
+    if not hard_filter_passed:
+        return 0.0
+    return round(cv_score * CV_WEIGHT + exam_score * EXAM_WEIGHT + 100 * HARD_FILTER_WEIGHT, 2)
+
+
+def final_scores(cv: np.ndarray, exam: np.ndarray, passed: np.ndarray) -> np.ndarray:
+    """Vectorised :func:`final_score` over whole columns."""
+    scores = np.round(cv * CV_WEIGHT + exam * EXAM_WEIGHT + 100 * HARD_FILTER_WEIGHT, 2)
+    return np.where(passed, scores, 0.0)
+
+
+def rank_order(final: np.ndarray, passed: np.ndarray, top_k: int | None = None) -> np.ndarray:
+    """
+    Return row indices in ranked order.
+
+    Failures sort after every passing candidate regardless of score, and
+    equal scores keep their input order.  With ``top_k`` only the first k
+    indices are returned.
+    """
+    n = len(final)
+    # Smaller key ranks higher; failures get +inf so they always land last
+    key = np.where(passed, -final, np.inf)
+    if top_k is None or top_k >= n:
+        return np.argsort(key, kind="stable")
+    if top_k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    kth = key[np.argpartition(key, top_k - 1)[top_k - 1]]
+    better = np.flatnonzero(key < kth)
+    # Fill the remaining slots with the earliest rows tied at the boundary
+    ties = np.flatnonzero(key == kth)[: top_k - len(better)]
+    chosen = np.concatenate([better, ties])
+    return chosen[np.argsort(key[chosen], kind="stable")]
+
+
+@dataclass
+class RankedBatch:
+    candidate_ids: list[str]
+    cv: np.ndarray
+    exam: np.ndarray
+    passed: np.ndarray
+    final: np.ndarray
+    order: np.ndarray
+
+    def rows(self):
+        """Yield ranked rows as plain dicts matching ``CandidateResult``."""
+        ids = self.candidate_ids
+        idx = self.order.tolist()
+        cv = self.cv[self.order].tolist()
+        exam = self.exam[self.order].tolist()
+        passed = self.passed[self.order].tolist()
+        final = self.final[self.order].tolist()
+        for i, c, e, p, f in zip(idx, cv, exam, passed, final):
+            yield {
+                "candidateId": ids[i],
+                "cvScore": c,
+                "examScore": e,
+                "hardFilterPassed": p,
+                "finalScore": f,
+            }
+
+
+@tracing.traced()
+def rank(
+    candidate_ids: list[str],
+    cv_scores: list[float],
+    exam_scores: list[float],
+    hard_filter_passed: list[bool],
+    top_k: int | None = None,
+) -> RankedBatch:
+    cv = np.asarray(cv_scores, dtype=np.float64)
+    exam = np.asarray(exam_scores, dtype=np.float64)
+    passed = np.asarray(hard_filter_passed, dtype=bool)
+    final = final_scores(cv, exam, passed)
+    return RankedBatch(
+        candidate_ids=candidate_ids,
+        cv=cv,
+        exam=exam,
+        passed=passed,
+        final=final,
+        order=rank_order(final, passed, top_k),
+    )
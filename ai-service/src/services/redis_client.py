@@ -0,0 +1,193 @@
+"""
+Shared Redis access layer.
+
+Every Redis-backed module gets its client from here instead of building its
+own ``redis.Redis``:
+
+* :func:`get_client` — general-purpose client (bias reports, leaderboard)
+  on one bounded, blocking connection pool with ``REDIS_SOCKET_TIMEOUT_MS``.
+* :func:`get_cache_client` — the same server through a second pool whose
+  per-call socket timeout is the much tighter ``REDIS_CACHE_TIMEOUT_MS``;
+  used by the vector cache and idempotency store, whose callers can always
+  fall back to recomputing.
+* :func:`get_async_client` — ``redis.asyncio`` client for ``async def`` routes.
+
+redis-py fixes socket timeouts per pool, so the timeout class is chosen by
+picking the client.  Cache calls also run through :data:`breaker`: after
+``REDIS_BREAKER_FAILURES`` consecutive connection errors or timeouts the
+circuit opens.  While it is open, cache calls fail immediately with
+:class:`CircuitOpenError` instead of each paying a timeout.  After
+``REDIS_BREAKER_COOLDOWN_SECONDS`` a single probe call is let through.  If
+the probe succeeds the circuit closes; if it fails the cooldown restarts.
+The state is reported on ``/health``.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+import redis
+import redis.asyncio
+
+from src.config import settings
+from src.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Only availability failures count against the breaker; a ResponseError means Redis answered
+AVAILABILITY_ERRORS = (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)
+
+_lock = threading.Lock()
+_clients: dict[str, redis.Redis] = {}
+_async_client: redis.asyncio.Redis | None = None
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Redis while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(self, name: str, failure_threshold: int, cooldown_seconds: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            metrics.REDIS_SHORT_CIRCUITS.labels(self.name).inc()
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Redis circuit '%s' closed", self.name)
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+            metrics.REDIS_CIRCUIT_OPEN.labels(self.name).set(0)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(
+                        "Redis circuit '%s' opened after %d failures — bypassing for %.0fs",
+                        self.name, self._failures, self.cooldown_seconds,
+                    )
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                metrics.REDIS_CIRCUIT_OPEN.labels(self.name).set(1)
+
+    @contextmanager
+    def guard(self):
+        """Run a block of Redis calls through the breaker; raises :class:`CircuitOpenError` when open."""
+        if not self.allow():
+            raise CircuitOpenError(f"Redis circuit '{self.name}' is open")
+        try:
+            yield
+        except AVAILABILITY_ERRORS:
+            self.record_failure()
+            raise
+        except Exception:
+            self.record_success()
+            raise
+        self.record_success()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = self._state
+            retry_in = max(0.0, self.cooldown_seconds - (time.monotonic() - self._opened_at))
+            return {
+                "state": state,
+                "consecutiveFailures": self._failures,
+                "retryInSeconds": round(retry_in, 1) if state == OPEN else 0.0,
+            }
+
+
+breaker = CircuitBreaker(
+    "cache",
+    failure_threshold=settings.redis_breaker_failures,
+    cooldown_seconds=settings.redis_breaker_cooldown_seconds,
+)
+
+
+def _pool_kwargs(socket_timeout_ms: int) -> dict:
+    return {
+        "decode_responses": True,
+        "max_connections": settings.redis_max_connections,
+        "timeout": settings.redis_pool_timeout_ms / 1000,  # wait for a free connection
+        "socket_timeout": socket_timeout_ms / 1000,
+        "socket_connect_timeout": settings.redis_connect_timeout_ms / 1000,
+        "socket_keepalive": True,
+        "health_check_interval": 30,
+    }
+
+
+def _client(kind: str, socket_timeout_ms: int) -> redis.Redis:
+    client = _clients.get(kind)
+    if client is None:
+        with _lock:
+            client = _clients.get(kind)
+            if client is None:
+                pool = redis.BlockingConnectionPool.from_url(settings.redis_url, **_pool_kwargs(socket_timeout_ms))
+                client = _clients[kind] = redis.Redis(connection_pool=pool)
+    return client
+
+
+def get_client() -> redis.Redis:
+    return _client("default", settings.redis_socket_timeout_ms)
+
+
+def get_cache_client() -> redis.Redis:
+    return _client("cache", settings.redis_cache_timeout_ms)
+
+
+def get_async_client() -> redis.asyncio.Redis:
+    global _async_client
+    if _async_client is None:
+        pool = redis.asyncio.BlockingConnectionPool.from_url(
+            settings.redis_url, **_pool_kwargs(settings.redis_cache_timeout_ms),
+        )
+        _async_client = redis.asyncio.Redis(connection_pool=pool)
+    return _async_client
+
+
+async def ping() -> float | None:
+    """
+    Round-trip time in ms through the async client, or None when Redis cannot
+    be reached for any reason.  The health check bypasses :data:`breaker`:
+    it neither waits on an open circuit nor opens, closes or probes it.
+    """
+    try:
+        start = time.perf_counter()
+        await get_async_client().ping()
+        return round((time.perf_counter() - start) * 1000, 2)
+    except Exception:
+        logger.debug("Redis ping failed", exc_info=True)
+        return None
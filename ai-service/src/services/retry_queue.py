@@ -0,0 +1,170 @@
+"""
+Retry topics and dead-letter publishing for the Kafka consumer (FR-63).
+
+A record whose handler raises is parked on ``{topic}_RETRY_{n}`` instead of
+blocking its partition.  Each retry level has a fixed, bounded exponential
+delay so records within one retry topic stay in due-time order.  Once a
+record has used up ``kafka_retry_max_attempts`` it goes to the dead-letter
+topic.  Attempt count, due time and last error travel in message headers,
+alongside the original record's trace context.
+
+Sends are asynchronous while a poll's records are handled; the consume
+loop then calls :meth:`FailurePublisher.confirm` once per batch, which
+flushes the producer and returns the records whose park or dead-letter
+failed, so their offsets are not committed.
+"""
+
+import json
+import logging
+import time
+from typing import Any
+
+from src.config import settings
+from src.utils import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+TOPIC_DEAD_LETTER = "AI_DEAD_LETTER"
+
+HEADER_ATTEMPT = "x-attempt"
+HEADER_NOT_BEFORE = "x-not-before-ms"
+HEADER_SOURCE_TOPIC = "x-source-topic"
+HEADER_ERROR = "x-error"
+
+_RETRY_SUFFIX = "_RETRY_"
+
+
+def retry_topic(topic: str, level: int) -> str:
+    return f"{topic}{_RETRY_SUFFIX}{level}"
+
+
+def retry_topics(topic: str) -> list[str]:
+    """All retry topics a record from *topic* can pass through."""
+    return [retry_topic(topic, n) for n in range(1, settings.kafka_retry_max_attempts)]
+
+
+def source_topic(topic: str) -> str:
+    """Map a retry topic back to the topic its handler is registered for."""
+    return topic.split(_RETRY_SUFFIX, 1)[0]
+
+
+def backoff_ms(level: int) -> int:
+    """Bounded exponential delay before retry *level* (1-based)."""
+    return min(settings.kafka_retry_backoff_ms * 2 ** (level - 1), settings.kafka_retry_backoff_max_ms)
+
+
+def _headers(message) -> dict[str, str]:
+    return {k: v.decode(errors="replace") for k, v in (message.headers or [])}
+
+
+def attempts_made(message) -> int:
+    return int(_headers(message).get(HEADER_ATTEMPT, "1"))
+
+
+def remaining_delay_ms(message) -> int:
+    """Milliseconds until a retry record is due; 0 for records on source topics."""
+    not_before = _headers(message).get(HEADER_NOT_BEFORE)
+    if not_before is None:
+        return 0
+    return max(0, int(not_before) - int(time.time() * 1000))
+
+
+class FailurePublisher:
+    """Non-blocking producer for retry and dead-letter records."""
+
+    def __init__(self, producer, confirm_timeout: float = 30.0) -> None:
+        self._producer = producer
+        self._confirm_timeout = confirm_timeout
+        self._sent: list[tuple[Any, Any]] = []  # (source record, send future or None when enqueueing failed)
+
+    def dead_letter(self, message, reason: str) -> None:
+        topic = source_topic(message.topic)
+        metrics.KAFKA_DEAD_LETTERS.labels(topic).inc()
+        envelope = {
+            "source_topic": topic,
+            "reason": reason,
+            "attempts": attempts_made(message),
+            "payload": message.value.decode(errors="replace"),
+        }
+        headers = tracing.carry_kafka_headers(message.headers)
+        self._send(message, TOPIC_DEAD_LETTER, json.dumps(envelope).encode(), headers)
+
+    def retry(self, message, exc: BaseException) -> None:
+        """Park a failed record on the next retry topic, or dead-letter it when attempts run out."""
+        attempts = attempts_made(message)
+        if attempts >= settings.kafka_retry_max_attempts:
+            logger.error(
+                "Giving up on record from %s after %d attempts: %s", message.topic, attempts, exc,
+            )
+            self.dead_letter(message, f"max attempts exceeded: {exc}")
+            return
+
+        topic = source_topic(message.topic)
+        metrics.KAFKA_RETRIES.labels(topic).inc()
+        due = int(time.time() * 1000) + backoff_ms(attempts)
+        headers = [
+            (HEADER_ATTEMPT, str(attempts + 1).encode()),
+            (HEADER_NOT_BEFORE, str(due).encode()),
+            (HEADER_SOURCE_TOPIC, topic.encode()),
+            (HEADER_ERROR, str(exc)[:256].encode()),
+            *tracing.carry_kafka_headers(message.headers),
+        ]
+        self._send(message, retry_topic(topic, attempts), message.value, headers)
+
+    def confirm(self) -> list:
+        """
+        Wait for every send since the last call; returns the source records
+        that were not delivered (enqueueing raised, delivery failed or timed out).
+        """
+        sent, self._sent = self._sent, []
+        if not sent:
+            return []
+        try:
+            self._producer.flush(timeout=self._confirm_timeout)
+        except Exception:
+            logger.exception("Flushing %d retry/dead-letter records failed", len(sent))
+        failed = []
+        for message, future in sent:
+            if future is None:
+                failed.append(message)
+                continue
+            try:
+                future.get(timeout=0)
+            except Exception as exc:
+                logger.error("Delivery of record from %s@%s failed: %s", message.topic, message.offset, exc)
+                failed.append(message)
+        return failed
+
+    def close(self, timeout: float = 10.0) -> None:
+        self._producer.flush(timeout=timeout)
+        self._producer.close(timeout=timeout)
+
+    def _send(self, message, target: str, value: bytes, headers: list) -> None:
+        try:
+            future = self._producer.send(target, value=value, key=message.key, headers=headers)
+        except Exception:
+            logger.exception("Failed to enqueue record from %s for %s", message.topic, target)
+            future = None
+        self._sent.append((message, future))
+
+
+class PartitionGate:
+    """Pauses retry partitions whose head record is not yet due and resumes them later."""
+
+    def __init__(self) -> None:
+        self._resume_at: dict[Any, float] = {}
+
+    def hold(self, consumer, tp, offset: int, delay_ms: int) -> None:
+        consumer.seek(tp, offset)
+        consumer.pause(tp)
+        self._resume_at[tp] = time.monotonic() + delay_ms / 1000
+
+    def release_due(self, consumer) -> None:
+        now = time.monotonic()
+        due = [tp for tp, at in self._resume_at.items() if at <= now]
+        if due:
+            assigned = consumer.assignment()
+            # Partitions revoked by a rebalance while paused need no resume
+            consumer.resume(*(tp for tp in due if tp in assigned))
+            for tp in due:
+                del self._resume_at[tp]
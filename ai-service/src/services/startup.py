@@ -0,0 +1,160 @@
+"""
+Warm startup orchestrator and readiness state.
+
+``main.startup_event`` calls :func:`begin`, which returns at once so the
+server can answer ``/health`` (liveness) while a background thread:
+
+1. loads SBERT and spaCy (from ``MODEL_DIR`` snapshots when pinned) and
+   opens a connection in each shared Redis pool, concurrently;
+2. runs warm-up batches through SBERT at each of
+   ``WARMUP_TOKEN_LENGTHS`` and one ``nlp.pipe`` pass, so the first real
+   requests don't pay for lazy kernel selection and allocator growth;
+3. starts the Kafka consumer.
+
+``GET /health/ready`` returns 503 until steps 1 and 2 have finished.  A
+Redis failure does not block readiness — every Redis path has a fallback —
+it is reported as ``unavailable``.  Model failures leave the service
+unready.
+
+Under ``python -m src.supervisor`` the parent calls :func:`warm_start`
+without Redis before forking, so workers inherit loaded, warmed models and
+only open their own Redis connections.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from src.config import settings
+from src.utils import model_store, tracing
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+UNAVAILABLE = "unavailable"
+
+MODEL_STEPS = ("sbert", "spacy")
+OPTIONAL_STEPS = ("redis",)
+
+_WARMUP_WORDS = (
+    "experienced first officer with a valid atpl and boeing 737 type rating "
+    "logged 3200 flight hours including crew resource management training "
+    "and line operations across regional and international routes"
+).split()
+
+_lock = threading.Lock()
+_steps: dict[str, dict] = {name: {"status": PENDING} for name in (*MODEL_STEPS, *OPTIONAL_STEPS, "warmup")}
+
+
+def _set(name: str, status: str, **details) -> None:
+    with _lock:
+        _steps[name] = {"status": status, **details}
+
+
+def _run_step(name: str, fn: Callable[[], None], failed_status: str = FAILED) -> bool:
+    with _lock:
+        if _steps[name]["status"] == READY:
+            return True
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as exc:
+        logger.exception("Startup step '%s' failed", name)
+        _set(name, failed_status, error=f"{type(exc).__name__}: {exc}")
+        return False
+    seconds = round(time.perf_counter() - start, 3)
+    _set(name, READY, seconds=seconds)
+    logger.info("Startup step '%s' ready in %.2fs", name, seconds)
+    return True
+
+
+def _load_sbert() -> None:
+    from src.services import embedding_service
+
+    if not embedding_service.is_model_loaded():
+        embedding_service.load_model()
+
+
+def _load_spacy() -> None:
+    from src.utils import nlp_pipeline
+
+    nlp_pipeline.load_model()
+
+
+def _connect_redis() -> None:
+    from src.services import redis_client
+
+    # One round trip per pool opens its first connection (DNS, TCP, AUTH) ahead of traffic
+    redis_client.get_client().ping()
+    redis_client.get_cache_client().ping()
+
+
+def _warmup_texts(tokens: int, count: int) -> list[str]:
+    words = (_WARMUP_WORDS * (tokens // len(_WARMUP_WORDS) + 1))[:tokens]
+    # Vary each text slightly so tokenizer caches don't make the batch unrepresentative
+    return [" ".join(words[i % len(words):] + words[:i % len(words)]) for i in range(count)]
+
+
+def _warm_up_models() -> None:
+    from src.services import embedding_service
+    from src.utils import nlp_pipeline
+
+    model = embedding_service.get_model()
+    for tokens in settings.warmup_token_lengths:
+        texts = _warmup_texts(tokens, settings.embedding_batch_size)
+        # Straight to the model: warm-up vectors must not land in the shared vector cache
+        model.encode(texts, batch_size=settings.embedding_batch_size, convert_to_numpy=True)
+    nlp_pipeline.preprocess_batch(_warmup_texts(max(settings.warmup_token_lengths, default=64), 4))
+
+
+@tracing.traced()
+def warm_start(include_redis: bool = True) -> bool:
+    """Run the startup steps (skipping any already done in this process); True once models are warm."""
+    model_store.enforce_offline()
+    steps = [("sbert", _load_sbert, FAILED), ("spacy", _load_spacy, FAILED)]
+    if include_redis:
+        steps.append(("redis", _connect_redis, UNAVAILABLE))
+    with ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix="startup") as pool:
+        results = dict(zip(
+            (name for name, *_ in steps),
+            pool.map(lambda step: _run_step(*step), steps),
+        ))
+    if results["sbert"] and results["spacy"]:
+        _run_step("warmup", _warm_up_models)
+    return models_ready()
+
+
+def begin(on_ready: Callable[[], None] | None = None) -> None:
+    """Start :func:`warm_start` in the background and call *on_ready* once the service is ready."""
+
+    def _run() -> None:
+        start = time.perf_counter()
+        if warm_start():
+            logger.info("Service ready in %.2fs", time.perf_counter() - start)
+            if on_ready is not None:
+                on_ready()
+        else:
+            logger.error("Startup incomplete — readiness stays 503: %s", report()["steps"])
+
+    threading.Thread(target=_run, daemon=True, name="warm-start").start()
+
+
+def models_ready() -> bool:
+    with _lock:
+        return all(_steps[name]["status"] == READY for name in (*MODEL_STEPS, "warmup"))
+
+
+def is_ready() -> bool:
+    with _lock:
+        optional_done = all(_steps[name]["status"] != PENDING for name in OPTIONAL_STEPS)
+    return optional_done and models_ready()
+
+
+def report() -> dict:
+    with _lock:
+        steps = {name: dict(step) for name, step in _steps.items()}
+    return {"ready": is_ready(), "steps": steps}
@@ -1,42 +1,87 @@
 import hashlib
-import json
 import logging
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 
+import numpy as np
 import redis
 
-from src.config import settings
+from src.services import redis_client
+from src.utils import embedding_codec, metrics, tracing
 
 logger = logging.getLogger(__name__)
 
-_client: redis.Redis | None = None
 CACHE_TTL_SECONDS = 60 * 60 * 24 * 7  # 7 days
 
 
 def _get_client() -> redis.Redis:
-    global _client
-    if _client is None:
-        _client = redis.from_url(settings.redis_url, decode_responses=True)
-    return _client
+    return redis_client.get_cache_client()
 
 
 def _cache_key(text: str) -> str:
     digest = hashlib.sha256(text.encode()).hexdigest()
-    return f"emb:{digest}"
+    # Reduced vectors live under their own prefix so configurations never mix
+    signature = embedding_codec.signature()
+    return f"emb:{signature}:{digest}" if signature else f"emb:{digest}"
 
 
-def get(text: str) -> Optional[List[float]]:
+@tracing.traced()
+def get(text: str) -> Optional[np.ndarray]:
     try:
-        raw = _get_client().get(_cache_key(text))
+        with metrics.stage("redis"), redis_client.breaker.guard():
+            raw = _get_client().get(_cache_key(text))
         if raw:
-            return json.loads(raw)
+            metrics.CACHE_LOOKUPS.labels("hit").inc()
+            return embedding_codec.unpack(raw)
+        metrics.CACHE_LOOKUPS.labels("miss").inc()
+    except redis_client.CircuitOpenError:
+        metrics.CACHE_LOOKUPS.labels("bypassed").inc()
     except Exception:
+        metrics.CACHE_LOOKUPS.labels("error").inc()
         logger.warning("Vector cache GET failed — falling back to inference", exc_info=True)
     return None
 
 
-def put(text: str, vector: List[float]) -> None:
+@tracing.traced()
+def put(text: str, vector: np.ndarray) -> None:
     try:
-        _get_client().setex(_cache_key(text), CACHE_TTL_SECONDS, json.dumps(vector))
+        with metrics.stage("redis"), redis_client.breaker.guard():
+            _get_client().setex(_cache_key(text), CACHE_TTL_SECONDS, embedding_codec.pack(vector))
+    except redis_client.CircuitOpenError:
+        pass
     except Exception:
         logger.warning("Vector cache PUT failed — continuing without cache", exc_info=True)
+
+
+@tracing.traced()
+def get_many(texts: List[str]) -> List[Optional[np.ndarray]]:
+    """Look up several texts with a single MGET round trip."""
+    if not texts:
+        return []
+    try:
+        with metrics.stage("redis"), redis_client.breaker.guard():
+            raws = _get_client().mget([_cache_key(t) for t in texts])
+        hits = sum(1 for raw in raws if raw)
+        metrics.CACHE_LOOKUPS.labels("hit").inc(hits)
+        metrics.CACHE_LOOKUPS.labels("miss").inc(len(raws) - hits)
+        return [embedding_codec.unpack(raw) if raw else None for raw in raws]
+    except redis_client.CircuitOpenError:
+        metrics.CACHE_LOOKUPS.labels("bypassed").inc(len(texts))
+    except Exception:
+        metrics.CACHE_LOOKUPS.labels("error").inc(len(texts))
+        logger.warning("Vector cache MGET failed — falling back to inference", exc_info=True)
+    return [None] * len(texts)
+
+
+@tracing.traced()
+def put_many(items: Iterable[Tuple[str, np.ndarray]]) -> None:
+    """Store several vectors with one pipelined write."""
+    try:
+        pipe = _get_client().pipeline(transaction=False)
+        for text, vector in items:
+            pipe.setex(_cache_key(text), CACHE_TTL_SECONDS, embedding_codec.pack(vector))
+        with metrics.stage("redis"), redis_client.breaker.guard():
+            pipe.execute()
+    except redis_client.CircuitOpenError:
+        pass
+    except Exception:
+        logger.warning("Vector cache pipelined PUT failed — continuing without cache", exc_info=True)
@@ -0,0 +1,101 @@
+"""
+Per-worker status snapshots for multi-process mode.
+
+Each worker process periodically writes a small JSON snapshot to
+``settings.worker_state_dir``; ``GET /health/workers`` reads them back so a
+single request reports the state of every worker behind the shared socket.
+Snapshots older than three heartbeat intervals are reported as ``DOWN``.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import psutil
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL_SECONDS = 5.0
+STALE_AFTER_SECONDS = HEARTBEAT_INTERVAL_SECONDS * 3
+
+_heartbeat_thread: threading.Thread | None = None
+
+
+def _state_dir() -> Path:
+    return Path(settings.worker_state_dir)
+
+
+def clear() -> None:
+    """Remove snapshots left behind by a previous supervisor run."""
+    state_dir = _state_dir()
+    state_dir.mkdir(parents=True, exist_ok=True)
+    for path in state_dir.glob("worker-*.json"):
+        path.unlink(missing_ok=True)
+
+
+def snapshot(index: int) -> dict:
+    from src.services import kafka_consumer
+    from src.services.embedding_service import is_model_loaded
+
+    proc = psutil.Process()
+    mem = proc.memory_full_info()
+    consumer = kafka_consumer._consumer_thread
+    model_loaded = is_model_loaded()
+    return {
+        "index": index,
+        "pid": proc.pid,
+        "status": "UP" if model_loaded else "DEGRADED",
+        "modelLoaded": model_loaded,
+        "consumerAlive": consumer is not None and consumer.is_alive(),
+        "cpuUsagePercent": round(proc.cpu_percent(interval=None), 2),
+        "ramUsageMb": round(mem.rss / (1024 ** 2), 2),
+        # PSS splits copy-on-write pages shared with the supervisor across workers
+        "pssMb": round(getattr(mem, "pss", mem.rss) / (1024 ** 2), 2),
+        "threads": proc.num_threads(),
+        "updatedAt": time.time(),
+    }
+
+
+def _write(index: int) -> None:
+    path = _state_dir() / f"worker-{index}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(snapshot(index)))
+    os.replace(tmp, path)
+
+
+def _heartbeat_loop(index: int) -> None:
+    while True:
+        try:
+            _write(index)
+        except Exception:
+            logger.warning("Failed to write worker %d status snapshot", index, exc_info=True)
+        time.sleep(HEARTBEAT_INTERVAL_SECONDS)
+
+
+def start_heartbeat(index: int) -> None:
+    global _heartbeat_thread
+    _state_dir().mkdir(parents=True, exist_ok=True)
+    _heartbeat_thread = threading.Thread(
+        target=_heartbeat_loop, args=(index,), daemon=True, name="worker-heartbeat",
+    )
+    _heartbeat_thread.start()
+
+
+def collect() -> list[dict]:
+    """Read every worker snapshot, marking stale ones as DOWN."""
+    now = time.time()
+    workers = []
+    for path in sorted(_state_dir().glob("worker-*.json")):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if now - data.get("updatedAt", 0) > STALE_AFTER_SECONDS:
+            data["status"] = "DOWN"
+        workers.append(data)
+    return workers
@@ -0,0 +1,218 @@
+"""
+Multi-process worker mode.
+
+    python -m src.supervisor --workers 8 --threads 2
+
+The supervisor loads and warms the SBERT and spaCy models once, binds the listening socket and
+then forks N workers.  Each worker serves HTTP on the shared socket and runs
+its own Kafka consumer thread in the ``ai-service`` group, so partitions are
+spread across processes.  Model weights loaded before the fork are shared
+copy-on-write; ``gc.freeze()`` keeps the collector from touching (and so
+copying) the objects allocated before the fork.
+
+Torch runs single-threaded in the supervisor so no OpenMP pool exists at
+fork time; each worker then sets its own intra-op thread count.  Workers
+that exit unexpectedly are restarted after an exponential delay per worker
+(``WORKER_RESTART_BACKOFF_SECONDS``, doubling up to
+``WORKER_RESTART_BACKOFF_MAX_SECONDS``); after ``WORKER_CRASH_LIMIT``
+crashes within ``WORKER_CRASH_WINDOW_SECONDS`` the supervisor stops every
+worker and exits non-zero so the orchestrator can surface the crash loop.
+
+Prometheus metrics run in multiprocess mode: every worker writes to
+``PROMETHEUS_MULTIPROC_DIR`` (defaulting to a directory under
+``worker_state_dir``) and ``/metrics`` aggregates them.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import shutil
+import socket
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the AI service as a pre-forked worker pool")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.worker_processes or os.cpu_count() or 1)
+    parser.add_argument("--threads", type=int, default=settings.worker_torch_threads,
+                        help="torch intra-op threads per worker")
+    return parser.parse_args(argv)
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _prepare_metrics_dir() -> None:
+    """Point prometheus_client at a clean shared directory before anything imports it."""
+    metrics_dir = Path(os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", str(Path(settings.worker_state_dir) / "metrics"),
+    ))
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    metrics_dir.mkdir(parents=True)
+
+
+def _mark_worker_dead(pid: int) -> None:
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(pid)
+
+
+class RestartPolicy:
+    """Restart delays for crashed workers and the crash-loop cut-off."""
+
+    def __init__(self, base: float, max_delay: float, limit: int, window: float) -> None:
+        self.base = base
+        self.max_delay = max_delay
+        self.limit = limit
+        self.window = window
+        self._crashes: deque[tuple[float, int]] = deque()  # (time, worker index)
+
+    def on_crash(self, index: int, now: float) -> float | None:
+        """Seconds to wait before restarting worker *index*, or None to give up."""
+        self._crashes.append((now, index))
+        while self._crashes and self._crashes[0][0] <= now - self.window:
+            self._crashes.popleft()
+        if len(self._crashes) >= self.limit:
+            return None
+        recent = sum(1 for _, i in self._crashes if i == index)
+        return min(self.base * 2 ** (recent - 1), self.max_delay)
+
+
+def _load_shared_model() -> None:
+    import torch
+
+    from src.services import startup
+
+    torch.set_num_threads(1)
+    # Redis is left to each worker: connections must not be shared across fork
+    if not startup.warm_start(include_redis=False):
+        raise SystemExit(f"Model warm start failed: {startup.report()['steps']}")
+    gc.collect()
+    gc.freeze()
+
+
+def _run_worker(index: int, sock: socket.socket, threads: int) -> None:
+    import torch
+    import uvicorn
+
+    from src.services import worker_registry
+
+    torch.set_num_threads(threads)
+    worker_registry.start_heartbeat(index)
+    config = uvicorn.Config("src.main:app", log_config=None, timeout_graceful_shutdown=10)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(index: int, sock: socket.socket, threads: int) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(index, sock, threads)
+        except Exception:
+            logger.exception("Worker %d crashed", index)
+            code = 1
+        finally:
+            os._exit(code)
+    logger.info("Started worker %d (pid=%d)", index, pid)
+    return pid
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    args = _parse_args(argv)
+
+    from src.services import worker_registry
+
+    worker_registry.clear()
+    _prepare_metrics_dir()
+    _load_shared_model()
+    sock = _bind(args.host, args.port)
+    logger.info("Supervisor listening on %s:%d with %d workers", args.host, args.port, args.workers)
+
+    workers = {_spawn(i, sock, args.threads): i for i in range(args.workers)}
+    stopping = False
+
+    def _shutdown(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        logger.info("Received signal %d — stopping %d workers", signum, len(workers))
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    policy = RestartPolicy(
+        settings.worker_restart_backoff_seconds, settings.worker_restart_backoff_max_seconds,
+        settings.worker_crash_limit, settings.worker_crash_window_seconds,
+    )
+    restarts: dict[int, float] = {}  # worker index -> monotonic time it is due to be re-forked
+    gave_up = False
+
+    while workers or (restarts and not stopping):
+        if restarts and not stopping:
+            now = time.monotonic()
+            for index in [i for i, due in restarts.items() if due <= now]:
+                del restarts[index]
+                workers[_spawn(index, sock, args.threads)] = index
+        if restarts and not stopping:
+            # Reap without blocking so pending restarts stay on schedule
+            pid, status = os.waitpid(-1, os.WNOHANG) if workers else (0, 0)
+            if pid == 0:
+                time.sleep(min(0.2, max(0.0, min(restarts.values()) - time.monotonic())))
+                continue
+        else:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+        index = workers.pop(pid, None)
+        if index is None:
+            continue
+        _mark_worker_dead(pid)
+        if stopping:
+            continue
+        delay = policy.on_crash(index, time.monotonic())
+        if delay is None:
+            logger.error(
+                "Worker %d (pid=%d) exited with status %d — %d crashes within %.0fs, giving up",
+                index, pid, status, policy.limit, policy.window,
+            )
+            gave_up = True
+            _shutdown(signal.SIGTERM, None)
+            continue
+        logger.warning("Worker %d (pid=%d) exited with status %d — restarting in %.1fs", index, pid, status, delay)
+        restarts[index] = time.monotonic() + delay
+
+    sock.close()
+    logger.info("Supervisor stopped")
+    if gave_up:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,188 @@
+"""
+Per-route admission control.
+
+Each expensive route family gets a :class:`RouteLimiter`: at most
+``concurrency`` requests run at once and at most ``queue`` more wait for a
+slot.  Anything beyond that is shed immediately with ``429`` and a
+``Retry-After`` estimate, and a request that waits longer than
+``ADMISSION_QUEUE_TIMEOUT_MS`` gets ``503`` — the caller can retry sooner
+than the queue would have served it.
+
+Admission runs as ASGI middleware, before the request body is read, so a
+flood of large ``/rank/batch`` payloads is rejected without parsing them.
+Routes not listed in :data:`ROUTES` (``/health``, ``/metrics``) are never
+limited.  Concurrency defaults to the size of the executor the route's
+handlers run on (see :mod:`src.utils.executors`); ``ADMISSION_LIMITS``
+overrides it per route, e.g. ``{"rank": [2, 8]}``.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+
+from starlette.responses import JSONResponse
+
+from src.config import settings
+from src.utils import metrics
+from src.utils.executors import CPU, IO, pool_size
+
+# (method or None for any, path prefix, limiter name, executor pool) — first match wins
+ROUTES: tuple[tuple[str | None, str, str, str], ...] = (
+    ("POST", "/rank/batch", "rank", CPU),
+    ("POST", "/bias/analyse", "bias_analyse", CPU),
+    ("POST", "/jobs/", "jobs", CPU),
+    # Handlers only await the grading batcher, so size for many concurrent waiters, not CPU work
+    ("POST", "/api/v1/grade/", "grade", IO),
+    (None, "/bias/", "bias", IO),
+    (None, "/rank/leaderboard/", "leaderboard", IO),
+    (None, "/cv/", "cv", IO),
+)
+
+_EWMA_ALPHA = 0.2
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted."""
+
+    def __init__(self, route: str, status_code: int, retry_after: int, reason: str) -> None:
+        super().__init__(f"{route}: {reason}")
+        self.route = route
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class RouteLimiter:
+    """FIFO concurrency limit with a bounded wait queue; used from one event loop."""
+
+    def __init__(self, name: str, concurrency: int, queue: int, queue_timeout: float) -> None:
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue = max(0, queue)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._service_seconds = 0.1  # EWMA of time a slot is held
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        backlog = self.in_flight + self.queued
+        return max(1, math.ceil(self._service_seconds * backlog / self.concurrency))
+
+    def _reject(self, status_code: int, reason: str) -> Overloaded:
+        metrics.ADMISSION_REJECTED.labels(self.name, reason).inc()
+        return Overloaded(self.name, status_code, self.retry_after(), reason)
+
+    def _update_depth(self) -> None:
+        metrics.QUEUE_DEPTH.labels(f"route:{self.name}").set(self.queued)
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the acquisition time to pass to :meth:`release`."""
+        if self.in_flight < self.concurrency and not self._waiters:
+            self.in_flight += 1
+            return time.perf_counter()
+        if self.queued >= self.queue:
+            raise self._reject(429, "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_depth()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                self._waiters.remove(waiter)
+                waiter.cancel()
+                raise self._reject(503, "queue_timeout")
+            # The slot was handed over just as the wait expired — keep it
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()
+            else:
+                self._waiters.remove(waiter)
+                waiter.cancel()
+            raise
+        finally:
+            self._update_depth()
+        return time.perf_counter()
+
+    def release(self, acquired_at: float) -> None:
+        held = time.perf_counter() - acquired_at
+        self._service_seconds += _EWMA_ALPHA * (held - self._service_seconds)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        # Hand the slot straight to the next waiter so in_flight never dips and lets a newcomer jump the queue
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._update_depth()
+                return
+        self.in_flight -= 1
+
+    def snapshot(self) -> dict:
+        return {
+            "inFlight": self.in_flight,
+            "queued": self.queued,
+            "concurrency": self.concurrency,
+            "queueLimit": self.queue,
+        }
+
+
+_limiters: dict[str, RouteLimiter] = {}
+
+
+def get_limiter(name: str, pool: str) -> RouteLimiter:
+    limiter = _limiters.get(name)
+    if limiter is None:
+        concurrency = pool_size(pool)
+        queue = concurrency * settings.admission_queue_factor
+        if name in settings.admission_limits:
+            concurrency, queue = settings.admission_limits[name]
+        limiter = _limiters[name] = RouteLimiter(
+            name, concurrency, queue, settings.admission_queue_timeout_ms / 1000,
+        )
+    return limiter
+
+
+def limiter_for(method: str, path: str) -> RouteLimiter | None:
+    for route_method, prefix, name, pool in ROUTES:
+        if (route_method is None or route_method == method) and path.startswith(prefix):
+            return get_limiter(name, pool)
+    return None
+
+
+def snapshot() -> dict:
+    return {name: limiter.snapshot() for name, limiter in _limiters.items()}
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that admits or sheds requests before the body is read."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        limiter = limiter_for(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            acquired_at = await limiter.acquire()
+        except Overloaded as exc:
+            response = JSONResponse(
+                {"detail": f"Service overloaded ({exc.reason}); retry later"},
+                status_code=exc.status_code,
+                headers={"Retry-After": str(exc.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(acquired_at)
@@ -0,0 +1,224 @@
+"""
+Compact embedding representation.
+
+Vectors are float32 NumPy arrays everywhere inside the service.  Two
+optional reductions apply to every vector leaving the model (see
+``embedding_service``), so CVs, job descriptions and answers always share
+one vector space:
+
+* ``EMBEDDING_PROJECTION_PATH`` — a PCA projection fitted on our own CV
+  vectors (``python -m src.utils.embedding_codec fit``), e.g. 384 → 128
+  dimensions.
+* ``EMBEDDING_QUANTIZATION=int8`` — symmetric scalar quantization with one
+  float32 scale per vector (``x ≈ scale * q``, ``q`` in [-127, 127]).
+  Stored vectors shrink 4× and bulk scoring runs on the int8 values
+  directly; cosine similarity is scale-invariant, so scales are only
+  needed to reconstruct.
+
+Serialised form (Redis values): ``f4:<base64 float32>`` or
+``i8:<base64 float32 scale + int8 values>``.  Legacy JSON lists still
+decode.  :func:`signature` names the active configuration, including a
+short hash of the projection's contents, and is part of vector-cache keys,
+so switching reductions — or refitting the projection in place — never
+mixes vector spaces.  The per-job matrices (``job_matrix_store``) are not
+keyed by it: after a refit, rebuild them with ``python -m src.backfill
+cvs`` before serving re-scores, or old rows are scored against job vectors
+from the new projection.
+
+:func:`agreement` measures what a reduction does to rankings (Spearman and
+top-k overlap against full precision); ``python -m
+benchmarks.embedding_agreement`` reports it per configuration.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+from functools import lru_cache
+
+import numpy as np
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+INT8 = "int8"
+_F4 = "f4:"
+_I8 = "i8:"
+
+
+@lru_cache(maxsize=4)
+def _load_projection(path: str) -> tuple[np.ndarray, np.ndarray]:
+    with np.load(path) as data:
+        return data["mean"].astype(np.float32), data["components"].astype(np.float32)
+
+
+def projection() -> tuple[np.ndarray, np.ndarray] | None:
+    """``(mean, components)`` of the configured PCA projection, or None."""
+    if not settings.embedding_projection_path:
+        return None
+    return _load_projection(settings.embedding_projection_path)
+
+
+@lru_cache(maxsize=4)
+def _projection_digest(path: str) -> str:
+    mean, components = _load_projection(path)
+    digest = hashlib.blake2b(digest_size=4)
+    digest.update(mean.tobytes())
+    digest.update(components.tobytes())
+    return digest.hexdigest()
+
+
+def signature() -> str:
+    """
+    Short name of the active reductions ("" for full-precision,
+    full-dimension vectors), e.g. ``p128.1f0c9a2e-i8``.
+    """
+    parts = []
+    proj = projection()
+    if proj is not None:
+        parts.append(f"p{proj[1].shape[0]}.{_projection_digest(settings.embedding_projection_path)}")
+    if settings.embedding_quantization == INT8:
+        parts.append("i8")
+    return "-".join(parts)
+
+
+def project(matrix: np.ndarray, proj: tuple[np.ndarray, np.ndarray] | None = None) -> np.ndarray:
+    proj = projection() if proj is None else proj
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if proj is None:
+        return matrix
+    mean, components = proj
+    return (matrix - mean) @ components.T
+
+
+def quantize(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-row symmetric int8 quantization; returns ``(q, scales)``."""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    scales = np.abs(matrix).max(axis=1) / 127
+    scales[scales == 0] = 1.0
+    q = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return q, scales.astype(np.float32)
+
+
+def dequantize(q: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    return q.astype(np.float32) * np.asarray(scales, dtype=np.float32)[..., None]
+
+
+def reduce(matrix: np.ndarray) -> np.ndarray:
+    """Apply the configured projection and quantization round trip to model output."""
+    reduced = project(matrix)
+    if settings.embedding_quantization == INT8:
+        reduced = dequantize(*quantize(reduced)).reshape(reduced.shape)
+    return reduced
+
+
+def pack(vector: np.ndarray) -> str:
+    vector = np.asarray(vector, dtype=np.float32)
+    if settings.embedding_quantization == INT8:
+        q, scales = quantize(vector)
+        return _I8 + base64.b64encode(scales.tobytes() + q.tobytes()).decode()
+    return _F4 + base64.b64encode(vector.tobytes()).decode()
+
+
+def unpack_raw(raw: str) -> tuple[np.ndarray, float | None]:
+    """Stored values without dequantizing: ``(int8 values, scale)`` or ``(float32 values, None)``."""
+    if raw.startswith(_I8):
+        data = base64.b64decode(raw[len(_I8):])
+        return np.frombuffer(data, dtype=np.int8, offset=4), float(np.frombuffer(data[:4], dtype=np.float32)[0])
+    if raw.startswith(_F4):
+        return np.frombuffer(base64.b64decode(raw[len(_F4):]), dtype=np.float32), None
+    return np.asarray(json.loads(raw), dtype=np.float32), None  # pre-codec JSON list
+
+
+def unpack(raw: str) -> np.ndarray:
+    values, scale = unpack_raw(raw)
+    return values.astype(np.float32) * scale if scale is not None else values
+
+
+def cosine_scores(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """Cosine of every row against *vector*; int8 inputs are scored in integer arithmetic."""
+    if matrix.dtype == np.int8:
+        matrix, vector = matrix.astype(np.int32), np.asarray(vector).astype(np.int32)
+        dots = (matrix @ vector).astype(np.float64)
+        norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix, dtype=np.int64)) * np.sqrt(int(vector @ vector))
+    else:
+        vector = np.asarray(vector, dtype=np.float32)
+        dots = (matrix @ vector).astype(np.float64)
+        norms = np.linalg.norm(matrix, axis=1).astype(np.float64) * float(np.linalg.norm(vector))
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms != 0)
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    # Average ranks for ties, as in Spearman's definition
+    order = np.argsort(values, kind="stable")
+    ranks = np.empty(len(values), dtype=np.float64)
+    ranks[order] = np.arange(len(values))
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=ranks)
+    return sums[inverse] / counts[inverse]
+
+
+def agreement(reference: np.ndarray, candidate: np.ndarray, k: int = 10) -> dict:
+    """Spearman rank correlation and top-k overlap of *candidate* scores against *reference*."""
+    reference, candidate = np.asarray(reference, dtype=np.float64), np.asarray(candidate, dtype=np.float64)
+    if len(reference) < 2:
+        return {"spearman": 1.0, "topKOverlap": 1.0, "k": min(k, len(reference))}
+    spearman = float(np.corrcoef(_ranks(reference), _ranks(candidate))[0, 1])
+    k = min(k, len(reference))
+    top_ref = set(np.argsort(-reference, kind="stable")[:k].tolist())
+    top_cand = set(np.argsort(-candidate, kind="stable")[:k].tolist())
+    return {"spearman": round(spearman, 6), "topKOverlap": len(top_ref & top_cand) / k, "k": k}
+
+
+def fit_projection(matrix: np.ndarray, dims: int) -> tuple[np.ndarray, np.ndarray, float]:
+    """PCA via SVD: ``(mean, components (dims, D), explained variance ratio)``."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if dims >= matrix.shape[1]:
+        raise ValueError(f"dims={dims} must be below the vector dimension {matrix.shape[1]}")
+    mean = matrix.mean(axis=0)
+    _, singular, vt = np.linalg.svd(matrix - mean, full_matrices=False)
+    variance = singular ** 2
+    return mean, vt[:dims].astype(np.float32), float(variance[:dims].sum() / variance.sum())
+
+
+def save_projection(path: str, mean: np.ndarray, components: np.ndarray) -> None:
+    np.savez(path, mean=mean, components=components)
+
+
+def _indexed_cv_vectors() -> np.ndarray:
+    """Every CV vector in the per-job matrices (our production corpus)."""
+    from src.services import job_matrix_store
+
+    matrices = [job_matrix_store.load(job_id)[1] for job_id in job_matrix_store.jobs()]
+    matrices = [m for m in matrices if len(m)]
+    if not matrices:
+        raise SystemExit(f"No CV vectors found under JOB_MATRIX_DIR={settings.job_matrix_dir}")
+    matrix = np.concatenate(matrices).astype(np.float32)
+    # int8 rows carry no scale; SBERT vectors are unit length, so renormalise
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms != 0)
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Fit a PCA projection on the indexed CV vectors")
+    parser.add_argument("command", choices=["fit"])
+    parser.add_argument("--dims", type=int, default=128)
+    parser.add_argument("--out", required=True, help="output .npz; point EMBEDDING_PROJECTION_PATH at it")
+    args = parser.parse_args(argv)
+
+    if settings.embedding_projection_path:
+        raise SystemExit("Unset EMBEDDING_PROJECTION_PATH: fit on full-dimension vectors")
+    matrix = _indexed_cv_vectors()
+    mean, components, explained = fit_projection(matrix, args.dims)
+    save_projection(args.out, mean, components)
+    logger.info(
+        "Fitted %d → %d projection on %d CV vectors (%.1f%% variance kept): %s",
+        matrix.shape[1], args.dims, len(matrix), explained * 100, args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()
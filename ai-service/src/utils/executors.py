@@ -0,0 +1,71 @@
+"""
+Bounded executors for route handlers.
+
+CPU-heavy handlers (ranking, bias analysis, grading, attribution) run on
+the ``cpu`` pool, sized to the core count; handlers that mostly wait on
+Redis run on the larger ``io`` pool.  Keeping them off Starlette's shared
+default thread pool means a burst of heavy requests cannot starve the
+light ones, and ``async`` routes such as ``/health`` never wait on either.
+
+Decorate a plain ``def`` handler with :func:`offload` (below the router
+decorator) to make FastAPI await it on the chosen pool::
+
+    @router.post("/batch")
+    @executors.offload(executors.CPU)
+    def rank_batch(body: BatchRankRequest): ...
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.config import settings
+
+CPU = "cpu"
+IO = "io"
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+
+
+def pool_size(pool: str) -> int:
+    if pool == CPU:
+        return settings.cpu_workers or os.cpu_count() or 1
+    return settings.io_workers
+
+
+def get_executor(pool: str) -> ThreadPoolExecutor:
+    executor = _executors.get(pool)
+    if executor is None:
+        executor = _executors.setdefault(
+            pool, ThreadPoolExecutor(max_workers=pool_size(pool), thread_name_prefix=f"{pool}-worker"),
+        )
+    return executor
+
+
+async def run(pool: str, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    """Run *fn* on *pool*, carrying context variables (trace context) across."""
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_executor(pool), call)
+
+
+def offload(pool: str) -> Callable[[Callable], Callable]:
+    """Turn a sync route handler into an async one that runs on *pool*."""
+
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await run(pool, fn, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def shutdown() -> None:
+    for executor in _executors.values():
+        executor.shutdown(wait=False, cancel_futures=True)
+    _executors.clear()
@@ -0,0 +1,108 @@
+"""
+Prometheus metrics for the AI pipeline.
+
+Exposed at ``GET /metrics``.  Metric updates are plain in-process counter
+and histogram operations, cheap enough to leave on in production.  Under
+``python -m src.supervisor`` each worker writes to ``PROMETHEUS_MULTIPROC_DIR``
+and the endpoint aggregates all of them.
+"""
+
+import time
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Seconds; spans fast regex work (mask) up to LIME and PDF rendering
+_STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+_BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+STAGE_LATENCY = Histogram(
+    "ai_pipeline_stage_seconds",
+    "Latency of individual pipeline stages",
+    ["stage"],
+    buckets=_STAGE_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "ai_vector_cache_lookups_total",
+    "Vector cache lookups by result (hit, miss, error, bypassed)",
+    ["result"],
+)
+MODEL_BATCH_SIZE = Histogram(
+    "ai_model_batch_size",
+    "Number of texts per SBERT encode call",
+    buckets=_BATCH_BUCKETS,
+)
+EMBEDDING_CHUNKS = Histogram(
+    "ai_embedding_chunks_per_document",
+    "Windows a document was split into for long-document embedding",
+    buckets=_BATCH_BUCKETS,
+)
+QUEUE_DEPTH = Gauge(
+    "ai_queue_depth",
+    "Items waiting to be processed",
+    ["queue"],
+    multiprocess_mode="livesum",
+)
+KAFKA_LAG = Gauge(
+    "ai_kafka_consumer_lag",
+    "Records between the consumer position and the partition high watermark",
+    ["topic", "partition"],
+    multiprocess_mode="livesum",
+)
+KAFKA_RECORDS = Counter(
+    "ai_kafka_records_total",
+    "Kafka records handled by outcome (processed, failed, duplicate, malformed)",
+    ["topic", "outcome"],
+)
+KAFKA_RETRIES = Counter(
+    "ai_kafka_retried_total",
+    "Records parked on a retry topic",
+    ["topic"],
+)
+KAFKA_DEAD_LETTERS = Counter(
+    "ai_kafka_dead_lettered_total",
+    "Records sent to the dead-letter topic",
+    ["topic"],
+)
+REDIS_CIRCUIT_OPEN = Gauge(
+    "ai_redis_circuit_open",
+    "1 while the Redis circuit breaker is open",
+    ["circuit"],
+    multiprocess_mode="max",
+)
+REDIS_SHORT_CIRCUITS = Counter(
+    "ai_redis_short_circuited_total",
+    "Redis calls skipped because the circuit breaker was open",
+    ["circuit"],
+)
+CV_DEDUP = Counter(
+    "ai_cv_dedup_total",
+    "CVs by near-duplicate outcome (new, reused, bypassed, error)",
+    ["result"],
+)
+GRADING_REQUESTS = Counter(
+    "ai_grading_requests_total",
+    "Short-answer grading requests by transport (http, stream) and outcome",
+    ["transport", "outcome"],
+)
+FEEDBACK_REPORTS = Counter(
+    "ai_feedback_reports_total",
+    "Feedback PDF requests by result (cached, rendered)",
+    ["result"],
+)
+ADMISSION_REJECTED = Counter(
+    "ai_admission_rejected_total",
+    "Requests shed by admission control by route and reason (queue_full, queue_timeout)",
+    ["route", "reason"],
+)
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block into ``ai_pipeline_stage_seconds{stage=name}``."""
+    histogram = STAGE_LATENCY.labels(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start)
@@ -0,0 +1,92 @@
+"""
+Pinned local model snapshots.
+
+When ``MODEL_DIR`` is set, SBERT and spaCy load from
+``$MODEL_DIR/<model name>`` and the Hugging Face libraries run offline, so
+pod start never touches the network.  With ``MODEL_DIR`` unset, models load
+by name as before (SBERT may download into the HF cache).
+
+Populate the directory once, at image build time::
+
+    MODEL_DIR=/app/models python -m src.utils.model_store
+"""
+
+import argparse
+import logging
+import os
+from pathlib import Path
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = "en_core_web_sm"
+
+
+def local_path(name: str) -> Path | None:
+    """Snapshot directory for *name*, or None when no snapshot is pinned."""
+    if not settings.model_dir:
+        return None
+    path = Path(settings.model_dir) / name.replace("/", "__")
+    return path if path.is_dir() else None
+
+
+def resolve(name: str) -> str:
+    """What to pass to the model loader: the snapshot path if pinned, else the model name."""
+    if not settings.model_dir:
+        return name
+    path = local_path(name)
+    if path is None:
+        raise FileNotFoundError(
+            f"Model '{name}' not found in MODEL_DIR={settings.model_dir}; run python -m src.utils.model_store"
+        )
+    enforce_offline()
+    return str(path)
+
+
+def enforce_offline() -> None:
+    """
+    Put the Hugging Face libraries in offline mode when ``MODEL_DIR`` is set.
+    They read these variables once, at import, so call this before anything
+    imports sentence_transformers.
+    """
+    if not settings.model_dir:
+        return
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+
+def snapshot(target: Path) -> None:
+    """Download the configured SBERT model and the spaCy pipeline into *target*."""
+    import spacy
+    from sentence_transformers import SentenceTransformer
+
+    target.mkdir(parents=True, exist_ok=True)
+
+    sbert_dir = target / settings.sbert_model.replace("/", "__")
+    logger.info("Saving SBERT model %s to %s", settings.sbert_model, sbert_dir)
+    SentenceTransformer(settings.sbert_model).save(str(sbert_dir))
+
+    try:
+        nlp = spacy.load(SPACY_MODEL)
+    except OSError:
+        from spacy.cli import download
+
+        download(SPACY_MODEL)
+        nlp = spacy.load(SPACY_MODEL)
+    logger.info("Saving spaCy pipeline %s to %s", SPACY_MODEL, target / SPACY_MODEL)
+    nlp.to_disk(target / SPACY_MODEL)
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Snapshot the service's models into a local directory")
+    parser.add_argument("--dir", default=settings.model_dir, help="target directory (default: MODEL_DIR)")
+    args = parser.parse_args(argv)
+    if not args.dir:
+        parser.error("set MODEL_DIR or pass --dir")
+    snapshot(Path(args.dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ import re
 from functools import lru_cache
 from pathlib import Path
 
+from src.utils import model_store, tracing
+
 logger = logging.getLogger(__name__)
 
 # Aviation / tech compound terms treated as single tokens during preprocessing.
@@ -19,29 +21,40 @@ _TERM_PLACEHOLDERS: list[tuple[str, str]] = [
     (term, term.replace(" ", "_")) for term in DOMAIN_TERMS
 ]
 
+PIPE_BATCH_SIZE = 32
+
 
 @lru_cache(maxsize=1)
 def _get_nlp():
     import spacy
 
     try:
-        return spacy.load("en_core_web_sm")
+        return spacy.load(model_store.resolve(model_store.SPACY_MODEL))
     except OSError:
         logger.warning("spaCy model 'en_core_web_sm' not found — run: python -m spacy download en_core_web_sm")
         raise
 
 
-def preprocess(text: str) -> str:
+def load_model() -> None:
+    _get_nlp()
+
+
+def is_model_loaded() -> bool:
+    return _get_nlp.cache_info().currsize > 0
+
+
+def _protect_terms(text: str) -> str:
     # 1. Lowercase
     text = text.lower()
 
     # 2. Protect domain compound terms with placeholder tokens
     for term, placeholder in _TERM_PLACEHOLDERS:
         text = text.replace(term, placeholder)
+    return text
+
 
+def _lemmatise(doc) -> str:
     # 3. spaCy: stop-word removal + lemmatization
-    nlp = _get_nlp()
-    doc = nlp(text)
     tokens = [
         token.lemma_
         for token in doc
@@ -54,3 +67,19 @@ def preprocess(text: str) -> str:
         result = result.replace(placeholder, term.replace(" ", "_"))
 
     return result
+
+
+@tracing.traced()
+def preprocess(text: str) -> str:
+    nlp = _get_nlp()
+    return _lemmatise(nlp(_protect_terms(text)))
+
+
+@tracing.traced()
+def preprocess_batch(texts: list[str]) -> list[str]:
+    """Preprocess many texts with a single ``nlp.pipe`` pass (same output as :func:`preprocess`)."""
+    if not texts:
+        return []
+    nlp = _get_nlp()
+    docs = nlp.pipe((_protect_terms(t) for t in texts), batch_size=PIPE_BATCH_SIZE)
+    return [_lemmatise(doc) for doc in docs]
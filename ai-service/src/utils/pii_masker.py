@@ -18,6 +18,8 @@ import re
 from dataclasses import dataclass
 from typing import NamedTuple
 
+from src.utils import tracing
+
 logger = logging.getLogger(__name__)
 
 
@@ -95,6 +97,7 @@ class MaskResult:
     detections: list[tuple[str, int]]   # [(label, count), ...]
 
 
+@tracing.traced()
 def mask(text: str) -> MaskResult:
     """
     Replace PII in *text* with type-specific placeholders.
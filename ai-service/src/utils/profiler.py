@@ -0,0 +1,82 @@
+"""
+Statistical stack sampler for on-demand profiling.
+
+A daemon thread reads ``sys._current_frames()`` every few milliseconds and
+counts whole stacks, so every thread is covered — HTTP handlers, the Kafka
+consumer, the CV extraction pool — without instrumenting any code.  Results
+are rendered as collapsed stacks (``thread;frame;frame count``), the input
+format of ``flamegraph.pl`` and speedscope.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType
+
+DEFAULT_INTERVAL_MS = 5
+
+Stack = tuple[tuple[CodeType, int], ...]
+
+
+class StackSampler:
+    """Samples all thread stacks between :meth:`start` and :meth:`stop`."""
+
+    def __init__(self, interval_ms: float = DEFAULT_INTERVAL_MS) -> None:
+        self._interval = interval_ms / 1000
+        self._samples: Counter[tuple[str, Stack]] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, daemon=True, name="stack-sampler")
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self._interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append((frame.f_code, frame.f_lineno))
+                    frame = frame.f_back
+                self._samples[(names.get(ident, str(ident)), tuple(reversed(stack)))] += 1
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self._samples.values())
+
+    def collapsed(self, only_through: CodeType | None = None) -> str:
+        """
+        Render collapsed stacks, heaviest first.
+
+        With *only_through*, keep only stacks that pass through that code
+        object (e.g. one endpoint function) — how single requests are profiled.
+        """
+        lines = Counter()
+        for (thread_name, stack), count in self._samples.items():
+            if only_through is not None and all(code is not only_through for code, _ in stack):
+                continue
+            frames = [thread_name] + [
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{lineno})" for code, lineno in stack
+            ]
+            lines[";".join(frames)] += count
+        return "".join(f"{stack} {count}\n" for stack, count in lines.most_common())
+
+
+def sample(seconds: float, interval_ms: float = DEFAULT_INTERVAL_MS) -> StackSampler:
+    """Sample every thread for *seconds* and return the stopped sampler."""
+    sampler = StackSampler(interval_ms).start()
+    time.sleep(seconds)
+    return sampler.stop()
@@ -3,6 +3,8 @@ import re
 import unicodedata
 from pathlib import Path
 
+from src.utils import tracing
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,6 +17,7 @@ def _normalize(text: str) -> str:
     return text.strip()
 
 
+@tracing.traced()
 def extract_text(file_path: str) -> str:
     path = Path(file_path)
     suffix = path.suffix.lower()
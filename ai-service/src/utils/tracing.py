@@ -0,0 +1,186 @@
+"""
+Distributed tracing for the AI pipeline (OpenTelemetry).
+
+Spans wrap the service and utility functions decorated with :func:`traced`.
+Trace context arrives on W3C ``traceparent``/``tracestate`` headers, both on
+HTTP requests (see the middleware in ``src.main``) and on Kafka records, and
+is carried forward when a record is parked on a retry topic.
+
+The exporter is picked by ``TRACING_EXPORTER``:
+
+* ``none`` (default) — tracing off; decorated functions call straight through
+* ``file``  — one JSON span per line appended to ``TRACING_FILE_PATH``
+* ``otlp``  — OTLP/HTTP to ``TRACING_OTLP_ENDPOINT``
+
+Head sampling is parent-based with a ``TRACING_SAMPLE_RATIO`` root ratio, so
+a trace sampled upstream (e.g. by the Spring backend) is always kept here.
+:func:`configure` must run in every process — under ``src.supervisor`` that
+is each worker's startup, after the fork.
+"""
+
+import functools
+import json
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, TypeVar
+
+from opentelemetry import context, propagate, trace
+from opentelemetry.propagators.textmap import Getter
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+TRACE_HEADERS = ("traceparent", "tracestate")
+
+_tracer = trace.get_tracer("eaa.ai-service")
+_enabled = False
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _KafkaHeaderGetter(Getter):
+    """Reads trace headers from kafka-python's ``[(str, bytes), ...]`` list."""
+
+    def get(self, carrier: list, key: str) -> list[str] | None:
+        values = [v.decode(errors="replace") for k, v in carrier if k == key]
+        return values or None
+
+    def keys(self, carrier: list) -> list[str]:
+        return [k for k, _ in carrier]
+
+
+_kafka_getter = _KafkaHeaderGetter()
+
+
+def _make_exporter(kind: str):
+    if kind == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        out = open(settings.tracing_file_path, "a", encoding="utf-8")
+        return ConsoleSpanExporter(
+            out=out,
+            formatter=lambda span: json.dumps(json.loads(span.to_json())) + "\n",
+        )
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    raise ValueError(f"Unknown tracing exporter {kind!r} (expected none, file or otlp)")
+
+
+def configure(exporter=None) -> None:
+    """
+    Install the tracer provider for this process.
+
+    *exporter* overrides the one chosen by settings (tests pass an in-memory
+    exporter).  Does nothing when tracing is disabled.
+    """
+    global _enabled
+    kind = settings.tracing_exporter.lower()
+    if exporter is None and kind == "none":
+        return
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": "eaa-ai-service"}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    if exporter is not None:
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    else:
+        provider.add_span_processor(BatchSpanProcessor(_make_exporter(kind)))
+    trace.set_tracer_provider(provider)
+    _enabled = True
+    logger.info("Tracing enabled: exporter=%s sampleRatio=%s", kind, settings.tracing_sample_ratio)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def traced(name: str | None = None) -> Callable[[F], F]:
+    """Decorator: run the function inside a span named ``module.function`` by default."""
+
+    def decorate(fn: F) -> F:
+        span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _tracer.start_as_current_span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+@contextmanager
+def span(
+    name: str,
+    parent: context.Context | None = None,
+    links: Iterable[trace.Link] = (),
+    kind: str = "internal",
+    **attributes,
+):
+    """
+    Open a span, optionally under an extracted *parent* context.
+
+    *kind* is a ``SpanKind`` name (``server``, ``consumer``, ...).  Yields the
+    span, or None when tracing is disabled.
+    """
+    if not _enabled:
+        yield None
+        return
+    with _tracer.start_as_current_span(
+        name,
+        context=parent,
+        kind=trace.SpanKind[kind.upper()],
+        links=list(links),
+        attributes=attributes,
+    ) as current:
+        yield current
+
+
+def in_current_context(fn: F) -> F:
+    """Bind *fn* to the caller's trace context so spans it opens on a pool thread keep their parent."""
+    if not _enabled:
+        return fn
+    ctx = context.get_current()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = context.attach(ctx)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            context.detach(token)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def extract_http(headers) -> context.Context:
+    return propagate.extract(headers)
+
+
+def extract_kafka(headers: list | None) -> context.Context:
+    if not _enabled:
+        return context.Context()
+    return propagate.extract(headers or [], getter=_kafka_getter)
+
+
+def link_to(ctx: context.Context) -> trace.Link | None:
+    """A span link to the remote span in *ctx*, or None when it carries no valid span."""
+    span_context = trace.get_current_span(ctx).get_span_context()
+    return trace.Link(span_context) if span_context.is_valid else None
+
+
+def carry_kafka_headers(headers: list | None) -> list[tuple[str, bytes]]:
+    """Trace headers of a consumed record, to copy onto a record produced from it."""
+    return [(k, v) for k, v in (headers or []) if k in TRACE_HEADERS]
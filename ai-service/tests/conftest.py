@@ -2,6 +2,8 @@
 import sys
 from unittest.mock import MagicMock
 
+import pytest
+
 # Stub sentence_transformers before any src.* import
 _st = MagicMock()
 _st.SentenceTransformer = MagicMock
@@ -16,3 +18,53 @@ sys.modules.setdefault("kafka.errors", MagicMock())
 _torch = MagicMock()
 _torch.cuda.is_available.return_value = False
 sys.modules.setdefault("torch", _torch)
+
+
+@pytest.fixture(autouse=True)
+def _closed_redis_circuit():
+    """Tests run without Redis; keep failures in one test from opening the breaker for the next."""
+    yield
+    from src.services import redis_client
+
+    redis_client.breaker.record_success()
+
+
+@pytest.fixture(autouse=True)
+def _job_matrix_dir(tmp_path, monkeypatch):
+    """Per-test on-disk job matrices, so nothing lands in the working tree."""
+    from src.config import settings
+    from src.services import job_matrix_store
+
+    monkeypatch.setattr(settings, "job_matrix_dir", str(tmp_path / "job_matrices"))
+    job_matrix_store._maps.clear()
+
+
+@pytest.fixture(autouse=True)
+def _restore_model_and_redis(monkeypatch):
+    """Undo any stub model or FakeRedis a test — or benchmark code it drives — installs process-wide."""
+    from src.services import embedding_service, redis_client
+
+    monkeypatch.setattr(embedding_service, "_model", embedding_service._model)
+    monkeypatch.setattr(redis_client, "_clients", dict(redis_client._clients))
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """One :class:`benchmarks.fakes.FakeRedis` behind both shared Redis clients, for this test only."""
+    from benchmarks import fakes
+    from src.services import redis_client
+
+    client = fakes.FakeRedis()
+    monkeypatch.setattr(redis_client, "_clients", {"default": client, "cache": client})
+    return client
+
+
+@pytest.fixture
+def stub_encoder(monkeypatch):
+    """A :class:`benchmarks.fakes.StubEncoder` in place of SBERT, for this test only."""
+    from benchmarks import fakes
+    from src.services import embedding_service
+
+    encoder = fakes.StubEncoder()
+    monkeypatch.setattr(embedding_service, "_model", encoder)
+    return encoder
@@ -0,0 +1,94 @@
+"""Tests for per-route admission control and the bounded executors."""
+import asyncio
+import inspect
+import threading
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.utils import admission, executors
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters(monkeypatch):
+    monkeypatch.setattr(admission, "_limiters", {})
+
+
+class TestRouteLimiter:
+    def test_sheds_with_429_when_queue_is_full(self):
+        async def scenario():
+            limiter = admission.RouteLimiter("t", concurrency=1, queue=1, queue_timeout=5)
+            held = await limiter.acquire()
+            queued = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            with pytest.raises(admission.Overloaded) as exc:
+                await limiter.acquire()
+            assert exc.value.status_code == 429
+            assert exc.value.retry_after >= 1
+
+            limiter.release(held)
+            limiter.release(await queued)
+            assert limiter.snapshot()["inFlight"] == 0
+
+        asyncio.run(scenario())
+
+    def test_queue_timeout_returns_503_and_frees_queue_slot(self):
+        async def scenario():
+            limiter = admission.RouteLimiter("t", concurrency=1, queue=1, queue_timeout=0.01)
+            await limiter.acquire()
+            with pytest.raises(admission.Overloaded) as exc:
+                await limiter.acquire()
+            assert exc.value.status_code == 503
+            assert limiter.queued == 0
+
+        asyncio.run(scenario())
+
+
+def test_full_route_is_shed_while_health_stays_served(monkeypatch):
+    release = asyncio.Event()
+    monkeypatch.setitem(admission._limiters, "rank", admission.RouteLimiter("rank", 1, 0, queue_timeout=5))
+
+    app = FastAPI()
+
+    @app.post("/rank/batch")
+    async def slow_rank():
+        await release.wait()
+        return {"status": "ok"}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "UP"}
+
+    app.add_middleware(admission.AdmissionMiddleware)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.ensure_future(client.post("/rank/batch"))
+            while admission._limiters["rank"].in_flight == 0:
+                await asyncio.sleep(0.001)
+
+            shed = await client.post("/rank/batch")
+            assert shed.status_code == 429
+            assert int(shed.headers["Retry-After"]) >= 1
+            assert (await client.get("/health")).status_code == 200
+
+            release.set()
+            assert (await first).status_code == 200
+            assert admission._limiters["rank"].in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_offload_runs_on_named_pool_and_keeps_signature():
+    def handler(job_id: str, limit: int = 5):
+        return threading.current_thread().name, job_id, limit
+
+    wrapped = executors.offload(executors.CPU)(handler)
+
+    assert inspect.iscoroutinefunction(wrapped)
+    assert inspect.signature(wrapped) == inspect.signature(handler)
+    thread, job_id, limit = asyncio.run(wrapped("j1", limit=3))
+    assert thread.startswith("cpu-worker")
+    assert (job_id, limit) == ("j1", 3)
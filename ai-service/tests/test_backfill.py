@@ -0,0 +1,138 @@
+"""Tests for the offline embedding backfill (workers run inline)."""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks import fakes
+from src import backfill
+from src.models.events import CvUploadedEvent
+from src.services import cv_dedup, job_index
+
+
+@pytest.fixture
+def encoder(fake_redis, stub_encoder, monkeypatch) -> fakes.StubEncoder:
+    monkeypatch.setattr(backfill, "_load_embedding_model", lambda: None)
+    return stub_encoder
+
+
+@pytest.fixture(autouse=True)
+def offline_pipeline():
+    """Files hold their own text; spaCy is not needed to lowercase it."""
+
+    def extract(path: str) -> str:
+        if "broken" in path:
+            raise ValueError("corrupt file")
+        with open(path) as f:
+            return f.read()
+
+    with patch("src.utils.text_extractor.extract_text", side_effect=extract), \
+            patch("src.utils.nlp_pipeline.preprocess_batch", side_effect=lambda texts: [t.lower() for t in texts]), \
+            patch("src.utils.nlp_pipeline.load_model"):
+        yield
+
+
+def _events(tmp_path, n: int, job_id: str = "j1") -> list[CvUploadedEvent]:
+    events = []
+    for i in range(n):
+        path = tmp_path / f"app{i}.pdf"
+        path.write_text(f"First Officer {i} with {i * 100} hours on the A320")
+        events.append(CvUploadedEvent(applicationId=f"app{i}", candidateId=f"c{i}", jobId=job_id, cvFilePath=str(path)))
+    return events
+
+
+def test_backfill_writes_cache_index_and_job_matrix(encoder, tmp_path):
+    checkpoint = backfill.Checkpoint(str(tmp_path / "ckpt"))
+    report = backfill.backfill_cvs(_events(tmp_path, 10), checkpoint, workers=0, batch_size=4)
+
+    assert report["done"] == 10 and report["failed"] == 0
+    ids, candidates, matrix, _ = job_index.load("j1")
+    assert sorted(ids) == [f"app{i}" for i in range(10)] and matrix.shape[0] == 10
+    assert candidates["app3"] == "c3"
+    assert cv_dedup.duplicates_of("app3") is not None
+    assert (tmp_path / "ckpt").read_text().splitlines()[0].startswith("app")
+
+
+def test_cli_runs_extraction_in_worker_processes_forked_before_the_model_loads(encoder, tmp_path, monkeypatch):
+    events = _events(tmp_path, 40)
+    manifest = tmp_path / "cvs.jsonl"
+    manifest.write_text("".join(e.model_dump_json() + "\n" for e in events))
+    start_pool = backfill.start_pool
+    order = []
+    monkeypatch.setattr(backfill, "start_pool", lambda workers: order.append("pool") or start_pool(workers))
+    monkeypatch.setattr(backfill, "_load_embedding_model", lambda: order.append("model"))
+
+    code = backfill.main(["cvs", "--manifest", str(manifest), "--workers", "2", "--batch-size", "16"])
+
+    assert code == 0 and order == ["pool", "model"]
+    ids, _, matrix, _ = job_index.load("j1")
+    assert sorted(ids) == sorted(e.applicationId for e in events) and matrix.shape[0] == 40
+
+
+def test_batches_are_sorted_by_length_across_the_window(encoder, tmp_path, monkeypatch):
+    events = []
+    for i, length in enumerate([3, 40, 7, 25, 1, 33, 12, 18]):
+        path = tmp_path / f"app{i}.pdf"
+        path.write_text("x" * length)
+        events.append(CvUploadedEvent(applicationId=f"app{i}", candidateId=f"c{i}", jobId="j1", cvFilePath=str(path)))
+    batches = []
+    monkeypatch.setattr(backfill, "_store_cvs", lambda batch, refresh: batches.append([len(p.preprocessed) for p in batch]))
+
+    report = backfill.backfill_cvs(events, backfill.Checkpoint(None), workers=0, batch_size=2)
+
+    assert report["done"] == 8
+    assert batches == [[40, 33], [25, 18], [12, 7], [3, 1]]
+
+
+def test_resume_skips_checkpointed_documents(encoder, tmp_path):
+    events = _events(tmp_path, 6)
+    backfill.backfill_cvs(events[:4], backfill.Checkpoint(str(tmp_path / "ckpt")), workers=0, batch_size=2)
+    calls = encoder.calls
+
+    report = backfill.backfill_cvs(events, backfill.Checkpoint(str(tmp_path / "ckpt")), workers=0, batch_size=8)
+    assert report["skipped"] == 4 and report["done"] == 2
+    assert encoder.calls - calls == 1
+
+
+def test_refresh_re_encodes_cached_vectors(encoder, tmp_path):
+    events = _events(tmp_path, 3)
+    backfill.backfill_cvs(events, backfill.Checkpoint(None), workers=0, batch_size=8)
+    calls = encoder.calls
+    backfill.backfill_cvs(events, backfill.Checkpoint(None), workers=0, batch_size=8)
+    assert encoder.calls == calls  # served from the vector cache
+    backfill.backfill_cvs(events, backfill.Checkpoint(None), workers=0, batch_size=8, refresh=True)
+    assert encoder.calls == calls + 1
+
+
+def test_failed_documents_are_reported_and_not_checkpointed(encoder, tmp_path):
+    events = _events(tmp_path, 3)
+    broken = tmp_path / "broken.pdf"
+    broken.write_text("")
+    events.append(CvUploadedEvent(applicationId="broken", candidateId="c9", jobId="j1", cvFilePath=str(broken)))
+    checkpoint = backfill.Checkpoint(str(tmp_path / "ckpt"))
+
+    report = backfill.backfill_cvs(events, checkpoint, workers=0, batch_size=8)
+    assert report["failed"] == 1 and report["done"] == 3
+    assert "broken" not in (tmp_path / "ckpt").read_text().splitlines()
+
+
+def test_cli_reads_a_directory_and_answer_key_manifest(encoder, tmp_path):
+    from src.services import answer_key_service, vector_cache
+
+    cvs = tmp_path / "cvs"
+    cvs.mkdir()
+    for i in range(3):
+        (cvs / f"app{i}.docx").write_text(f"captain {i}")
+    (cvs / "notes.txt").write_text("ignored")
+    assert [e.applicationId for e in backfill.events_from_dir(str(cvs), "j2")] == ["app0", "app1", "app2"]
+
+    manifest = tmp_path / "keys.jsonl"
+    manifest.write_text("".join(json.dumps({"questionId": f"q{i}", "idealAnswer": f"answer {i}"}) + "\n" for i in range(5)))
+    report_path = tmp_path / "report.json"
+    code = backfill.main([
+        "answer-keys", "--manifest", str(manifest), "--workers", "0", "--json", str(report_path),
+    ])
+
+    assert code == 0 and json.loads(report_path.read_text())["done"] == 5
+    assert vector_cache.get(answer_key_service._key("q4")) is not None
+    assert (tmp_path / ".backfill-answer-keys.ckpt").read_text().split() == [f"q{i}" for i in range(5)]
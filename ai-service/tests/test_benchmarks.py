@@ -0,0 +1,63 @@
+"""Tests for the offline benchmark harness (corpus, fakes, baseline comparison)."""
+from benchmarks import corpus, embedding_agreement, fakes, suite
+from src.services import redis_client, vector_cache
+from src.utils.pii_masker import mask
+
+
+def test_corpus_is_deterministic_and_carries_pii():
+    assert corpus.cv(3) == corpus.cv(3)
+    assert corpus.cv(3) != corpus.cv(4)
+    assert corpus.short_answer(1) == corpus.short_answer(1)
+    assert mask(corpus.cv(0)).detections
+
+
+def test_stub_encoder_is_deterministic_and_normalised():
+    encoder = fakes.StubEncoder()
+    a, b = encoder.encode(["same", "same"])
+    assert (a == b).all()
+    assert abs(float((a * a).sum()) - 1.0) < 1e-5
+
+
+def test_vector_cache_round_trips_through_fake_redis(monkeypatch):
+    monkeypatch.setattr(redis_client, "_clients", {"cache": fakes.FakeRedis()})
+    vector_cache.put_many([("a", [0.5, 0.25])])
+    hit, miss = vector_cache.get_many(["a", "b"])
+    assert hit.tolist() == [0.5, 0.25] and miss is None
+
+
+def test_compare_flags_only_cases_beyond_threshold():
+    baseline = {"results": {"fast": {"bestSeconds": 1.0}, "slow": {"bestSeconds": 1.0}, "gone": {"skipped": "x"}}}
+    current = {"results": {"fast": {"bestSeconds": 1.2}, "slow": {"bestSeconds": 1.5}, "gone": {"bestSeconds": 9}}}
+    regressions = suite.compare(current, baseline, threshold=0.25)
+    assert [r["case"] for r in regressions] == ["slow"]
+
+
+def test_cases_absent_from_the_baseline_are_reported():
+    baseline = {"results": {"old": {"bestSeconds": 1.0}, "gone": {"skipped": "x"}}}
+    current = {"results": {"old": {"bestSeconds": 1.0}, "gone": {"bestSeconds": 1.0},
+                           "new": {"bestSeconds": 1.0}, "optional": {"skipped": "x"}}}
+    assert suite.missing(current, baseline) == ["new"]
+
+
+def test_load_generator_drives_real_consume_loop(tmp_path, monkeypatch, stub_encoder):
+    from benchmarks import load_pipeline
+    from src.services import kafka_consumer as kc
+    from src.utils import nlp_pipeline
+
+    monkeypatch.setattr(nlp_pipeline, "preprocess_batch", lambda texts: [t.lower() for t in texts])
+    cv_paths = load_pipeline._write_cv_files(tmp_path, 3, "docx")
+    mix = load_pipeline._parse_mix("cv_uploaded=1,exam_submitted=1")
+
+    result = load_pipeline.run_rate(20, duration=1, mix=mix, cv_paths=cv_paths, drain=5)
+
+    assert result["published"] > 0
+    assert result["processed"] == result["published"]
+    assert result["latencyMs"]["p50"] >= 0
+    assert kc._make_consumer.__module__ == kc.__name__
+
+
+def test_embedding_agreement_reports_every_configuration():
+    report = embedding_agreement.run(n_cvs=40, n_jobs=3, dims=[8], k=5, real_model=False)
+    assert set(report["results"]) == {"float32", "int8", "pca8", "pca8+int8"}
+    assert report["results"]["int8"]["spearmanMean"] > 0.99
+    assert report["results"]["pca8+int8"]["bytesPerVector"] == 12
@@ -0,0 +1,107 @@
+"""Tests for FR-76 — bias statistics and permutation analysis."""
+import numpy as np
+import pytest
+import redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routers import bias
+from src.services import bias_engine, bias_service
+
+
+class TestStreamingAccumulators:
+    def test_merged_chunks_match_single_pass(self):
+        rng = np.random.default_rng(3)
+        scores = rng.uniform(0, 100, size=997)
+        cohorts = rng.choice(["A", "B", "C"], size=997).tolist()
+
+        merged: dict = {}
+        overall = (0, 0.0, 0.0)
+        for start in range(0, 997, 50):
+            chunk = slice(start, start + 50)
+            for name, acc in bias_service._aggregate(cohorts[chunk], scores[chunk]).items():
+                merged[name] = bias_service._merge(merged.get(name, (0, 0.0, 0.0)), acc)
+            overall = bias_service._merge(overall, bias_service._overall(scores[chunk]))
+
+        n, mean, m2 = overall
+        assert n == 997
+        assert np.isclose(mean, scores.mean())
+        assert np.isclose(m2 / n, scores.var())
+        for name, (count, cohort_mean, cohort_m2) in merged.items():
+            members = scores[np.array(cohorts) == name]
+            assert count == len(members)
+            assert np.isclose(cohort_mean, members.mean())
+            assert np.isclose(cohort_m2, ((members - members.mean()) ** 2).sum())
+
+    def test_report_flags_outlier_cohort(self):
+        candidates = (
+            [{"candidateId": str(i), "cohort": "A", "cvScore": 80.0} for i in range(10)]
+            + [{"candidateId": str(i), "cohort": "B", "cvScore": 78.0} for i in range(10, 20)]
+            + [{"candidateId": "x", "cohort": "C", "cvScore": 5.0}]
+        )
+        cohorts, scores = bias_service._columns(candidates)
+        report = bias_service._build_report(
+            "job", bias_service._aggregate(cohorts, scores), bias_service._overall(scores),
+        )
+        assert report["totalCandidates"] == 21
+        assert report["flaggedCohorts"] == ["C"]
+
+
+class TestStreamRouter:
+    @pytest.fixture
+    def client(self) -> TestClient:
+        app = FastAPI()
+        app.include_router(bias.router)
+        return TestClient(app)
+
+    def test_push_and_reset_round_trip(self, client, fake_redis):
+        body = {"candidates": [{"candidateId": "c1", "cohort": "A", "cvScore": 70}]}
+        assert client.post("/bias/stream/j1", json=body).json()["data"]["totalCandidates"] == 1
+        assert client.post("/bias/stream/j1", json=body).json()["data"]["totalCandidates"] == 2
+        assert client.delete("/bias/stream/j1").status_code == 200
+        assert bias_service.live_report("j1") is None
+
+    def test_redis_outage_returns_503(self, client, monkeypatch):
+        def down():
+            raise redis.exceptions.ConnectionError("down")
+
+        monkeypatch.setattr(bias_service, "_get_client", down)
+        body = {"candidates": [{"candidateId": "c1", "cohort": "A", "cvScore": 70}]}
+        for response in (client.post("/bias/stream/j1", json=body), client.delete("/bias/stream/j1")):
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+
+
+class TestPermutationEngine:
+    def _candidates(self, n: int = 600, boost: float = 15.0):
+        rng = np.random.default_rng(11)
+        out = []
+        for i in range(n):
+            uni = ["UM", "UTM", "USM"][i % 3]
+            region = ["North", "South"][i % 2]
+            score = float(rng.uniform(30, 70)) + (boost if (uni, region) == ("UM", "North") else 0.0)
+            out.append({"candidateId": str(i), "cohort": uni, "cvScore": score, "attributes": {"region": region}})
+        # A lone outlier should never be flagged on its own
+        out.append({"candidateId": "tiny", "cohort": "Tiny", "cvScore": 0.0, "attributes": {"region": "North"}})
+        return out
+
+    def test_flags_planted_intersection_but_not_tiny_cohort(self):
+        report = bias_engine.analyse("job", self._candidates(), ["cohort", "region"], permutations=500)
+        assert "UM × North" in report["flaggedCohorts"]
+        assert "Tiny" not in report["flaggedCohorts"]
+        dims = {s["dimension"] for s in report["cohortStats"]}
+        assert dims == {"cohort", "region", "cohort × region"}
+
+    def test_no_flags_without_bias_and_deterministic(self):
+        candidates = [c for c in self._candidates(boost=0.0) if c["candidateId"] != "tiny"]
+        first = bias_engine.analyse("job", candidates, ["cohort", "region"], permutations=300)
+        second = bias_engine.analyse("job", candidates, ["cohort", "region"], permutations=300)
+        assert first["flaggedCohorts"] == []
+        assert first["cohortStats"] == second["cohortStats"]
+
+    def test_bh_adjustment_is_monotone_and_capped(self):
+        p = np.array([0.01, 0.04, 0.03, 0.5])
+        adjusted = bias_engine._bh_adjust(p)
+        assert np.all(adjusted >= p)
+        assert np.all(adjusted <= 1.0)
+        assert adjusted[np.argsort(p)].tolist() == sorted(adjusted.tolist())
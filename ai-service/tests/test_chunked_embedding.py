@@ -0,0 +1,81 @@
+"""Tests for long-document (windowed and pooled) embedding."""
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from benchmarks import corpus, fakes
+from src.config import settings
+from src.services import chunked_embedding, embedding_service, redis_client
+
+
+@pytest.fixture
+def encoder(fake_redis, stub_encoder, monkeypatch) -> fakes.StubEncoder:
+    monkeypatch.setattr(settings, "embedding_chunk_tokens", 64)
+    monkeypatch.setattr(settings, "embedding_chunk_overlap_tokens", 8)
+    return stub_encoder
+
+
+def _long_text(pages: int = 3) -> str:
+    return " ".join(corpus.cv(i) for i in range(pages)).lower()
+
+
+def test_short_text_embeds_exactly_as_before(encoder):
+    [document] = chunked_embedding.embed_documents(["first officer a320"])
+    assert document.chunks == ["first officer a320"]
+    assert np.array_equal(document.vector, embedding_service.embed("first officer a320"))
+
+
+def test_windows_fit_the_model_and_overlap(encoder):
+    chunks = chunked_embedding.split(_long_text())
+    assert len(chunks) > 3
+    assert all(len(c.split()) <= 64 for c in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.split()[0] in previous.split()[-8:]
+
+
+def test_edit_only_moves_nearby_windows(encoder):
+    words = _long_text(6).split()
+    before = chunked_embedding.split(" ".join(words))
+    edited = words[: len(words) // 2] + ["inserted", "type", "rating"] + words[len(words) // 2:]
+    after = chunked_embedding.split(" ".join(edited))
+    assert len(set(after) - set(before)) <= 3
+
+
+def test_edited_document_re_encodes_only_changed_windows(encoder):
+    words = _long_text(6).split()
+    chunked_embedding.embed_documents([" ".join(words)])
+    edited = " ".join(words[: len(words) // 2] + ["inserted"] + words[len(words) // 2:])
+    with patch.object(encoder, "encode", wraps=encoder.encode) as encode:
+        chunked_embedding.embed_documents([edited])
+    encoded = encode.call_args.args[0]
+    assert 0 < len(encoded) <= 3 < len(chunked_embedding.split(edited))
+
+
+def test_pooling_and_kept_chunk_vectors(encoder, monkeypatch):
+    [mean] = chunked_embedding.embed_documents([_long_text()], keep_chunks=True)
+    weights = np.array([len(c) for c in mean.chunks], dtype=np.float64)
+    expected = (mean.chunk_vectors * weights[:, None]).sum(axis=0) / weights.sum()
+    assert mean.chunk_vectors.shape == (len(mean.chunks), fakes.EMBEDDING_DIM)
+    assert np.allclose(mean.vector, expected, atol=1e-6)
+
+    monkeypatch.setattr(settings, "embedding_pooling", chunked_embedding.MAX)
+    [peak] = chunked_embedding.embed_documents([_long_text()])
+    assert np.array_equal(peak.vector, mean.chunk_vectors.max(axis=0))
+
+
+def test_small_encode_groups_give_the_same_vectors(encoder, monkeypatch):
+    texts = [_long_text(2), "short cv", _long_text(3)]
+    reference = [d.vector for d in chunked_embedding.embed_documents(texts)]
+    monkeypatch.setattr(settings, "embedding_chunk_group", 2)
+    monkeypatch.setattr(redis_client, "_clients", {"default": fakes.FakeRedis(), "cache": fakes.FakeRedis()})
+    with patch.object(encoder, "encode", wraps=encoder.encode) as encode:
+        grouped = [d.vector for d in chunked_embedding.embed_documents(texts)]
+    assert max(len(c.args[0]) for c in encode.call_args_list) <= 2
+    assert all(np.allclose(a, b, atol=1e-6) for a, b in zip(reference, grouped))
+
+
+def test_window_count_is_capped(encoder, monkeypatch):
+    monkeypatch.setattr(settings, "embedding_max_chunks", 2)
+    [document] = chunked_embedding.embed_documents([_long_text()])
+    assert len(document.chunks) == 2
@@ -0,0 +1,168 @@
+"""Tests for near-duplicate CV detection and reuse."""
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks import corpus, fakes
+from src.models.events import CvUploadedEvent
+from src.services import cv_dedup, redis_client
+
+
+@pytest.fixture
+def store(fake_redis) -> fakes.FakeRedis:
+    return fake_redis
+
+
+def _edited(text: str) -> str:
+    # A light edit: one extra line and one changed word
+    return text.replace("Experience", "Work experience", 1) + "\\nAvailable to relocate."
+
+
+def _event(application_id: str, candidate_id: str = "c1") -> CvUploadedEvent:
+    return CvUploadedEvent(
+        applicationId=application_id, candidateId=candidate_id, jobId=f"job-{application_id}", cvFilePath="x",
+    )
+
+
+class TestFingerprint:
+    def test_light_edit_stays_above_threshold_and_other_cvs_fall_below(self):
+        cv = corpus.cv(1)
+        same = cv_dedup.similarity(cv_dedup.fingerprint(cv), cv_dedup.fingerprint(_edited(cv)))
+        other = cv_dedup.similarity(cv_dedup.fingerprint(cv), cv_dedup.fingerprint(corpus.cv(2)))
+        assert same >= 0.9
+        assert other < 0.9
+
+    def test_is_deterministic(self):
+        assert cv_dedup.fingerprint(corpus.cv(5)) == cv_dedup.fingerprint(corpus.cv(5))
+
+
+def _index(application_id: str, candidate_id: str, text: str, preprocessed: str) -> None:
+    cv_dedup.record_many([{
+        "applicationId": application_id, "candidateId": candidate_id, "jobId": "j1",
+        "simhash": cv_dedup.fingerprint(text), "maskedDigest": cv_dedup.text_digest(text), "preprocessed": preprocessed,
+    }])
+
+
+def test_lookup_reuses_indexed_text_and_skips_self(store):
+    _index("a1", "c1", corpus.cv(1), "pre one")
+
+    near = _edited(corpus.cv(1))
+    match, none_self = cv_dedup.lookup_many(
+        [cv_dedup.fingerprint(near), cv_dedup.fingerprint(corpus.cv(1))], ["a2", "a1"], ["c1", "c1"],
+        [cv_dedup.text_digest(near), cv_dedup.text_digest(corpus.cv(1))],
+    )
+
+    assert match.application_id == "a1"
+    assert match.preprocessed == "pre one"
+    assert none_self is None
+
+
+def test_lookup_finds_cvs_up_to_seven_bits_away_through_one_bit_probes(store):
+    simhash = cv_dedup.fingerprint(corpus.cv(1))
+    cv_dedup.record_many([{
+        "applicationId": "a1", "candidateId": "c1", "jobId": "j1", "simhash": simhash,
+        "maskedDigest": "m1", "preprocessed": "pre one",
+    }])
+    # Two flipped bits in three bands and one in the last: no band matches exactly
+    flips = [0, 1, 16, 17, 32, 33, 48]
+    near = simhash ^ sum(1 << bit for bit in flips)
+
+    match, = cv_dedup.lookup_many([near], ["a2"], ["c1"], ["m2"], threshold=0.89)
+    assert match is not None and match.application_id == "a1"
+
+
+def test_band_members_of_expired_docs_are_trimmed_on_write(store, monkeypatch):
+    ttl = cv_dedup.settings.cv_dedup_ttl_seconds
+    simhash = cv_dedup.fingerprint(corpus.cv(1))
+    monkeypatch.setattr(cv_dedup.time, "time", lambda: 1_000_000.0)
+    _index("old", "c1", corpus.cv(1), "pre old")
+    store.delete(cv_dedup._doc_key("old"))  # the doc's TTL ran out
+    band = cv_dedup._band_keys(simhash)[0]
+    assert store.zcard(band) == 1
+
+    monkeypatch.setattr(cv_dedup.time, "time", lambda: 1_000_000.0 + ttl + 1)
+    assert cv_dedup.lookup_many([simhash], ["new"], ["c1"], ["m"]) == [None]  # stale members are not read
+    _index("new", "c1", corpus.cv(1), "pre new")
+
+    for key in cv_dedup._band_keys(simhash):
+        assert store.zrangebyscore(key, "-inf", "+inf") == [f"{simhash:016x}:new"]
+
+
+def test_other_candidates_cvs_are_reused_only_when_identical(store):
+    _index("a1", "c1", corpus.cv(1), "pre one")
+    near, same = _edited(corpus.cv(1)), corpus.cv(1)
+
+    near_match, same_match = cv_dedup.lookup_many(
+        [cv_dedup.fingerprint(near), cv_dedup.fingerprint(same)], ["b1", "b2"], ["c2", "c2"],
+        [cv_dedup.text_digest(near), cv_dedup.text_digest(same)],
+    )
+
+    assert near_match is None
+    assert same_match.application_id == "a1"
+
+
+def test_consumer_reuses_near_duplicates_and_records_audit(store, stub_encoder, monkeypatch):
+    from src.services import kafka_consumer as kc
+
+    texts = {"a1": corpus.cv(1), "a2": _edited(corpus.cv(1)), "a3": corpus.cv(2), "a4": _edited(corpus.cv(2))}
+    monkeypatch.setattr(kc, "_extract_and_mask", lambda event: texts[event.applicationId])
+    preprocessed_calls = []
+    monkeypatch.setattr(
+        "src.utils.nlp_pipeline.preprocess_batch",
+        lambda batch: preprocessed_calls.append(len(batch)) or [t.lower() for t in batch],
+    )
+
+    kc._process_cv_batch([_event("a1")])
+    kc._process_cv_batch([_event("a2"), _event("a3"), _event("a4")])
+
+    # a2 reuses a1 from the index, a4 reuses a3 from the same batch
+    assert preprocessed_calls == [1, 1]
+    client = TestClient(_cv_app())
+    body = client.get("/cv/duplicates", params={"applicationId": "a1"}).json()["data"]
+    assert [d["applicationId"] for d in body["duplicates"]] == ["a2"]
+    assert body["duplicates"][0]["reusedFrom"] == "a1"
+    assert client.get("/cv/duplicates", params={"applicationId": "a4"}).json()["data"]["reusedFrom"] == "a3"
+    assert client.get("/cv/duplicates", params={"applicationId": "zz"}).status_code == 404
+
+
+def test_near_identical_cvs_of_different_candidates_are_processed_separately(store, stub_encoder, monkeypatch):
+    from src.services import kafka_consumer as kc
+
+    texts = {"a1": corpus.cv(1), "b1": _edited(corpus.cv(1)), "b2": corpus.cv(2), "c2": _edited(corpus.cv(2))}
+    monkeypatch.setattr(kc, "_extract_and_mask", lambda event: texts[event.applicationId])
+    preprocessed_calls = []
+    monkeypatch.setattr(
+        "src.utils.nlp_pipeline.preprocess_batch",
+        lambda batch: preprocessed_calls.append(len(batch)) or [t.lower() for t in batch],
+    )
+
+    kc._process_cv_batch([_event("a1", "alice")])
+    kc._process_cv_batch([_event("b1", "bob"), _event("b2", "bob"), _event("c2", "carol")])
+
+    # b1 is close to a1 from the index and c2 to b2 in the same batch, but all are different candidates
+    assert preprocessed_calls == [1, 3]
+    client = TestClient(_cv_app())
+    for application_id in texts:
+        assert client.get("/cv/duplicates", params={"applicationId": application_id}).json()["data"]["reusedFrom"] is None
+
+
+def test_redis_outage_processes_every_cv_in_full():
+    with patch.object(cv_dedup, "_get_client", side_effect=redis_client.AVAILABILITY_ERRORS[0]("down")):
+        assert cv_dedup.lookup_many([1, 2], ["a", "b"], ["c", "c"], ["d1", "d2"]) == [None, None]
+
+
+def test_duplicates_endpoint_returns_503_when_redis_is_down():
+    with patch.object(redis_client, "get_client", side_effect=redis_client.AVAILABILITY_ERRORS[0]("down")):
+        response = TestClient(_cv_app()).get("/cv/duplicates", params={"applicationId": "a1"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def _cv_app() -> FastAPI:
+    from src.routers import cv
+
+    app = FastAPI()
+    app.include_router(cv.router)
+    return app
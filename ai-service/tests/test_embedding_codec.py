@@ -0,0 +1,97 @@
+"""Tests for the compact (int8 / PCA-reduced) embedding representation."""
+import base64
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks import fakes
+from src.config import settings
+from src.services import job_index, redis_client, vector_cache
+from src.utils import embedding_codec
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    return fakes.StubEncoder().encode([f"cv text {i}" for i in range(200)])
+
+
+@pytest.fixture
+def int8(monkeypatch):
+    monkeypatch.setattr(settings, "embedding_quantization", embedding_codec.INT8)
+
+
+def test_float_pack_round_trips_exactly(vectors):
+    raw = embedding_codec.pack(vectors[0])
+    assert raw.startswith("f4:")
+    assert np.array_equal(embedding_codec.unpack(raw), vectors[0])
+
+
+def test_int8_pack_is_a_quarter_of_the_size_and_close(int8, vectors):
+    raw = embedding_codec.pack(vectors[0])
+    q, scale = embedding_codec.unpack_raw(raw)
+    assert raw.startswith("i8:") and q.dtype == np.int8 and scale > 0
+    assert len(base64.b64decode(raw[3:])) == 4 + vectors.shape[1]  # one float32 scale + one byte per dim
+    assert np.abs(embedding_codec.unpack(raw) - vectors[0]).max() <= scale / 2 + 1e-6
+
+
+def test_legacy_json_vectors_still_decode():
+    assert embedding_codec.unpack(json.dumps([0.5, 0.25])).tolist() == [0.5, 0.25]
+
+
+def test_int8_scoring_agrees_with_full_precision(vectors):
+    job = vectors[-1]
+    reference = embedding_codec.cosine_scores(vectors[:-1], job)
+    q, _ = embedding_codec.quantize(vectors[:-1])
+    quantized = embedding_codec.cosine_scores(q, embedding_codec.quantize(job)[0][0])
+
+    assert np.abs(quantized - reference).max() < 0.01
+    report = embedding_codec.agreement(reference, quantized, k=10)
+    assert report["spearman"] > 0.99 and report["topKOverlap"] >= 0.9
+
+
+def test_agreement_metrics():
+    reference = np.array([0.9, 0.8, 0.7, 0.6])
+    assert embedding_codec.agreement(reference, reference, k=2) == {"spearman": 1.0, "topKOverlap": 1.0, "k": 2}
+    reversed_ = embedding_codec.agreement(reference, reference[::-1], k=2)
+    assert reversed_["spearman"] == pytest.approx(-1.0) and reversed_["topKOverlap"] == 0.0
+
+
+def test_projection_fit_reduces_dimension(monkeypatch, tmp_path, vectors):
+    mean, components, explained = embedding_codec.fit_projection(vectors, 32)
+    assert components.shape == (32, vectors.shape[1]) and 0 < explained < 1
+
+    path = tmp_path / "proj.npz"
+    embedding_codec.save_projection(str(path), mean, components)
+    monkeypatch.setattr(settings, "embedding_projection_path", str(path))
+    assert embedding_codec.reduce(vectors[:3]).shape == (3, 32)
+    first = embedding_codec.signature()
+    assert first.startswith("p32.")
+
+    # Refitted contents get a new signature
+    refit = tmp_path / "refit.npz"
+    embedding_codec.save_projection(str(refit), mean + 0.01, components)
+    monkeypatch.setattr(settings, "embedding_projection_path", str(refit))
+    assert embedding_codec.signature().startswith("p32.") and embedding_codec.signature() != first
+
+
+def test_signature_separates_cache_entries(monkeypatch):
+    client = fakes.FakeRedis()
+    monkeypatch.setattr(redis_client, "_clients", {"cache": client})
+    vector_cache.put("same text", np.array([0.5, 0.25], dtype=np.float32))
+
+    monkeypatch.setattr(settings, "embedding_quantization", embedding_codec.INT8)
+    assert embedding_codec.signature() == "i8"
+    assert vector_cache.get("same text") is None
+
+
+def test_job_index_scores_int8_vectors_directly(int8, fake_redis, stub_encoder):
+    encoder = stub_encoder
+    vectors = embedding_codec.reduce(encoder.encode([f"cv text {i}" for i in range(5)]))
+    job_index.add_many(("j1", f"app-{i}", f"cand-{i}", v) for i, v in enumerate(vectors))
+
+    _, _, matrix, _ = job_index.load("j1")
+    assert matrix.dtype == np.int8
+    scores = job_index.relevance_scores(matrix, embedding_codec.reduce(encoder.encode("first officer")))
+    expected = job_index.relevance_scores(vectors, embedding_codec.reduce(encoder.encode("first officer")))
+    assert np.abs(scores - expected).max() < 1.0
@@ -0,0 +1,120 @@
+"""
+Short-answer grading over both transports, checked against the exam
+engine's AIGradingRequest/AIGradingResponse shapes (exam-engine
+internal/services/ai_client.go).
+"""
+import asyncio
+import json
+import struct
+
+import msgpack
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks import fakes
+from src.routers import grading
+from src.services import answer_key_service, grading_service, grading_stream
+
+# Exactly what the Go client marshals: json tags of AIGradingRequest
+GO_REQUEST = {"questionId": "q1", "candidateAnswer": "check the fuel quantity before taxi", "jobId": "j1"}
+
+
+@pytest.fixture
+def encoder(fake_redis, stub_encoder) -> fakes.StubEncoder:
+    answer_key_service.store_answer_key("q1", "check the fuel quantity before taxi")
+    answer_key_service.store_answer_key("q2", "declare an emergency and divert")
+    return stub_encoder
+
+
+def test_http_endpoint_speaks_the_go_client_shapes(encoder):
+    app = FastAPI()
+    app.include_router(grading.router)
+    with TestClient(app) as client:
+        resp = client.post(
+            "/api/v1/grade/short-answer", content=json.dumps(GO_REQUEST), headers={"Content-Type": "application/json"},
+        )
+        missing = client.post("/api/v1/grade/short-answer", json={**GO_REQUEST, "questionId": "unknown"})
+
+    assert resp.status_code == 200
+    assert resp.json() == {"score": 100.0}  # AIGradingResponse{Score float64 `json:"score"`}
+    assert missing.status_code == 404
+
+
+def test_ideal_answer_registers_a_missing_key(encoder):
+    request = grading_service.GradeRequest("q9", "hold short of the runway", "j1", ideal_answer="hold short of the runway")
+    assert grading_service.grade_batch([request]) == [100.0]
+    assert grading_service.grade_batch([grading_service.GradeRequest("q9", "x", "j1")])[0] is not None
+
+
+def test_batch_matches_single_answer_scoring(encoder):
+    from src.services.answer_scorer import score_answer
+
+    requests = [grading_service.GradeRequest(q, f"answer {i}", "j1") for i, q in enumerate(["q1", "q2"] * 3)]
+    scores = grading_service.grade_batch(requests)
+    ideal = {"q1": "check the fuel quantity before taxi", "q2": "declare an emergency and divert"}
+    for request, score in zip(requests, scores):
+        expected = score_answer(request.question_id, ideal[request.question_id], request.candidate_answer, 100.0)
+        assert score == expected.awarded_marks
+
+
+async def _exchange(port: int, frames: list[bytes]) -> list[dict]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for frame in frames:
+        writer.write(frame)
+    await writer.drain()
+    writer.write_eof()
+    responses = []
+    while True:
+        try:
+            responses.append(await grading_stream.read_frame(reader))
+        except asyncio.IncompleteReadError:
+            break
+    writer.close()
+    return responses
+
+
+def _run_stream(frames: list[bytes]) -> list[dict]:
+    async def scenario():
+        server = await grading_stream.start("127.0.0.1", 0)
+        try:
+            return await _exchange(server.sockets[0].getsockname()[1], frames)
+        finally:
+            await grading_stream.stop()
+
+    return asyncio.run(scenario())
+
+
+def test_stream_multiplexes_requests_on_one_connection_and_batches_them(encoder):
+    requests = [{"id": i, **GO_REQUEST, "candidateAnswer": f"answer {i}"} for i in range(20)]
+    requests.append({"id": 20, **GO_REQUEST})
+    calls_before = encoder.calls
+    responses = _run_stream([grading_stream.encode_frame(r) for r in requests])
+
+    by_id = {r["id"]: r for r in responses}
+    assert sorted(by_id) == list(range(21))
+    assert by_id[20] == {"id": 20, "score": 100.0}
+    assert all(isinstance(r["score"], float) for r in responses)
+    # Answers are encoded a batch at a time, not once per request
+    assert encoder.calls - calls_before <= 2
+
+
+def test_stream_reports_errors_per_request(encoder):
+    responses = _run_stream([
+        grading_stream.encode_frame({"id": 1, **GO_REQUEST, "questionId": "unknown"}),
+        grading_stream.encode_frame({"id": 2, "questionId": "q1"}),
+        grading_stream.encode_frame({"id": 3, **GO_REQUEST}),
+    ])
+    assert {r["id"]: r.get("error") for r in responses} == {1: "no_answer_key", 2: "bad_request", 3: None}
+
+
+def test_stream_closes_on_oversized_frame(encoder):
+    frames = [grading_stream.encode_frame({"id": 1, **GO_REQUEST}), struct.pack(">I", grading_stream.MAX_FRAME_BYTES + 1)]
+    responses = _run_stream(frames)
+    assert [r["id"] for r in responses] == [1]
+
+
+def test_frames_are_plain_length_prefixed_msgpack():
+    frame = grading_stream.encode_frame({"id": 7, "score": 50.0})
+    (length,) = struct.unpack(">I", frame[:4])
+    assert length == len(frame) - 4 and msgpack.unpackb(frame[4:]) == {"id": 7, "score": 50.0}
@@ -1,4 +1,5 @@
 """Tests for FR-77 — AI Service Health Endpoint."""
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -60,3 +61,38 @@ class TestHealthEndpoint:
         client = _client_with_model(model_loaded=True)
         resp = client.get("/health")  # no headers
         assert resp.status_code == 200
+
+
+class TestWorkersHealth:
+    def _client(self):
+        from src.routers import health
+
+        app = FastAPI()
+        app.include_router(health.router)
+        return TestClient(app)
+
+    def test_aggregates_worker_snapshots(self, tmp_path):
+        import time
+
+        from src.services import worker_registry
+
+        fresh = {"status": "UP", "pssMb": 100.0, "updatedAt": time.time()}
+        stale = {"status": "UP", "pssMb": 50.0, "updatedAt": time.time() - 3600}
+        (tmp_path / "worker-0.json").write_text(json.dumps({**fresh, "index": 0}))
+        (tmp_path / "worker-1.json").write_text(json.dumps({**stale, "index": 1}))
+
+        with patch.object(worker_registry.settings, "worker_state_dir", str(tmp_path)):
+            body = self._client().get("/health/workers").json()
+
+        assert body["status"] == "DEGRADED"
+        assert body["workerCount"] == 2
+        assert body["workersUp"] == 1
+        assert body["totalPssMb"] == 150.0
+        assert [w["status"] for w in body["workers"]] == ["UP", "DOWN"]
+
+    def test_down_when_no_workers_reported(self, tmp_path):
+        from src.services import worker_registry
+
+        with patch.object(worker_registry.settings, "worker_state_dir", str(tmp_path)):
+            body = self._client().get("/health/workers").json()
+        assert body["status"] == "DOWN"
@@ -0,0 +1,59 @@
+"""Cold-import budget for ``src.main``: heavy subsystems must load on first use, not at startup."""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+
+# Seconds for a cold ``import src.main``; override with IMPORT_BUDGET_SECONDS on slow runners
+BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "1.5"))
+
+DEFERRED_MODULES = (
+    "sentence_transformers",
+    "torch",
+    "transformers",
+    "kafka",
+    "matplotlib",
+    "reportlab",
+    "lime",
+    "sklearn",
+    "spacy",
+    "fitz",
+    "docx",
+)
+
+_PROBE = """
+import json, sys
+import src.main
+print(json.dumps([m for m in {modules!r} if m in sys.modules]))
+"""
+
+
+def _cold_import() -> tuple[list[str], float]:
+    # A fresh interpreter without the conftest stubs, so nothing is pre-imported
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(modules=DEFERRED_MODULES)],
+        cwd=SERVICE_ROOT,
+        env={**os.environ, "PYTHONPATH": str(SERVICE_ROOT)},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    # -X importtime lines: "import time: self [us] | cumulative | module"
+    cumulative_us = next(
+        int(line.split("|")[1])
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[-1].strip() == "src.main"
+    )
+    return loaded, cumulative_us / 1e6
+
+
+def test_cold_import_of_main_defers_heavy_dependencies_and_fits_budget():
+    loaded, seconds = _cold_import()
+
+    assert loaded == [], f"imported at startup: {loaded}"
+    assert seconds < BUDGET_SECONDS, f"import src.main took {seconds:.2f}s (budget {BUDGET_SECONDS}s)"
@@ -0,0 +1,155 @@
+"""Tests for the per-job CV vector index and bulk re-scoring."""
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks import fakes
+from src.services import job_index, redis_client, similarity_service
+
+
+@pytest.fixture
+def encoder(fake_redis, stub_encoder) -> fakes.StubEncoder:
+    return stub_encoder
+
+
+def _index(job_id: str, n: int, encoder: fakes.StubEncoder) -> None:
+    texts = [f"cv text {i}" for i in range(n)]
+    vectors = encoder.encode(texts).tolist()
+    job_index.add_many((job_id, f"app-{i}", f"cand-{i}", v) for i, v in enumerate(vectors))
+
+
+def test_bulk_scores_match_per_candidate_scoring(encoder):
+    _index("j1", 5, encoder)
+    with patch.object(job_index, "_publish"):
+        result = job_index.rescore("j1", "senior first officer")
+
+    by_app = {c["applicationId"]: c["cvScore"] for c in result["changed"]}
+    for i in range(5):
+        expected = similarity_service.score_cv_against_job(f"cv text {i}", "senior first officer")
+        assert by_app[f"app-{i}"] == pytest.approx(expected, abs=0.011)
+
+
+def test_only_changed_scores_are_published(encoder):
+    _index("j1", 20, encoder)
+    with patch.object(job_index, "_publish") as publish:
+        first = job_index.rescore("j1", "captain a320")
+        again = job_index.rescore("j1", "captain a320")
+        edited = job_index.rescore("j1", "captain a320 with instructor rating")
+
+    assert len(first["changed"]) == 20
+    assert first["changed"][0]["previousCvScore"] is None
+    assert again["changed"] == []
+    assert publish.call_count == 2  # nothing published for the unchanged re-score
+    assert all(c["previousCvScore"] is not None for c in edited["changed"])
+
+
+def test_preview_then_publish_sends_every_changed_score(encoder):
+    _index("j1", 5, encoder)
+    with patch.object(job_index, "_publish") as publish:
+        preview = job_index.rescore("j1", "captain a320", publish=False)
+        published = job_index.rescore("j1", "captain a320")
+        again = job_index.rescore("j1", "captain a320")
+
+    publish.assert_called_once()
+    assert len(preview["changed"]) == len(published["changed"]) == 5
+    assert len(publish.call_args.args[1]) == 5
+    assert again["changed"] == []
+
+
+def test_scores_are_only_stored_after_the_broker_acknowledges(encoder):
+    _index("j1", 5, encoder)
+    producer = MagicMock()
+    producer.send.return_value.get.side_effect = TimeoutError("no ack")
+    with patch.object(job_index, "_get_producer", return_value=producer):
+        with pytest.raises(job_index.PublishFailed):
+            job_index.rescore("j1", "captain a320")
+        producer.send.return_value.get.side_effect = None
+        retried = job_index.rescore("j1", "captain a320")
+
+    assert len(retried["changed"]) == 5
+    assert producer.send.return_value.get.call_args.kwargs == {"timeout": job_index.PUBLISH_TIMEOUT_SECONDS}
+    assert job_index.rescore("j1", "captain a320", publish=False)["changed"] == []
+
+
+def test_removed_applications_are_no_longer_scored(encoder):
+    _index("j1", 4, encoder)
+    job_index.remove("j1", ["app-1"])
+    with patch.object(job_index, "_publish"):
+        result = job_index.rescore("j1", "captain a320")
+
+    assert result["scored"] == 3
+    assert "app-1" not in {c["applicationId"] for c in result["changed"]}
+
+
+def test_two_thousand_applicants_rescore_well_under_a_second(encoder):
+    _index("big", 2000, encoder)
+    start = time.perf_counter()
+    with patch.object(job_index, "_publish"):
+        result = job_index.rescore("big", "aircraft maintenance engineer b1 licence")
+    elapsed = time.perf_counter() - start
+
+    assert result["scored"] == 2000
+    assert result["computeMs"] < 100
+    assert elapsed < 1.0
+
+
+def test_rescore_endpoint(encoder):
+    from src.routers import jobs
+
+    _index("j2", 3, encoder)
+    app = FastAPI()
+    app.include_router(jobs.router)
+    resp = TestClient(app).post("/jobs/j2/rescore", json={"description": "ground ops", "publish": False})
+
+    assert resp.status_code == 200
+    assert resp.json()["data"]["scored"] == 3
+
+    with patch.object(job_index, "_publish", side_effect=job_index.PublishFailed("no ack")):
+        resp = TestClient(app).post("/jobs/j2/rescore", json={"description": "ground ops"})
+    assert resp.status_code == 503
+
+    assert TestClient(app).delete("/jobs/j2/applications/app-1").status_code == 200
+    resp = TestClient(app).post("/jobs/j2/rescore", json={"description": "ground ops", "publish": False})
+    assert [c["applicationId"] for c in resp.json()["data"]["changed"]] == ["app-0", "app-2"]
+
+
+def test_endpoints_reject_unsafe_job_ids_and_report_redis_outages(encoder, monkeypatch):
+    from src.routers import jobs
+
+    app = FastAPI()
+    app.include_router(jobs.router)
+    client = TestClient(app)
+    for job_id in ("%2E", "%2E%2E", "a%20b", "a%0A"):
+        assert client.post(f"/jobs/{job_id}/rescore", json={"description": "ops"}).status_code == 422
+        assert client.delete(f"/jobs/{job_id}/applications/app-1").status_code == 422
+
+    def down(self):
+        raise redis.exceptions.ConnectionError("down")
+
+    monkeypatch.setattr(fakes.FakePipeline, "execute", down)
+    for response in (
+        client.post("/jobs/j3/rescore", json={"description": "ops"}),
+        client.delete("/jobs/j3/applications/app-1"),
+    ):
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+
+def test_open_breaker_fails_fast_with_503(encoder, monkeypatch):
+    from src.routers import jobs
+
+    _index("j4", 2, encoder)
+    app = FastAPI()
+    app.include_router(jobs.router)
+    client = TestClient(app)
+    execute = MagicMock()
+    monkeypatch.setattr(fakes.FakePipeline, "execute", execute)
+    monkeypatch.setattr(redis_client.breaker, "allow", lambda: False)
+
+    assert client.post("/jobs/j4/rescore", json={"description": "ops"}).status_code == 503
+    assert client.delete("/jobs/j4/applications/app-1").status_code == 503
+    execute.assert_not_called()
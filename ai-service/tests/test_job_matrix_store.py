@@ -0,0 +1,109 @@
+"""Tests for the memory-mapped per-job CV matrices."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.config import settings
+from src.services import job_matrix_store as store
+from src.utils import embedding_codec
+
+
+def _rows(prefix: str, n: int, dim: int = 4, start: float = 0.0) -> list[tuple[str, np.ndarray]]:
+    return [(f"{prefix}{i}", np.full(dim, start + i, dtype=np.float32)) for i in range(n)]
+
+
+def _files(job_id: str) -> list[str]:
+    return sorted(p.name for p in (Path(settings.job_matrix_dir) / job_id).iterdir() if p.name != "lock")
+
+
+def test_rows_round_trip_through_a_read_only_mapping():
+    store.append("j1", _rows("a", 3))
+    store.append("j1", _rows("b", 2, start=10))
+    ids, matrix = store.load("j1")
+
+    assert ids == ["a0", "a1", "a2", "b0", "b1"]
+    assert isinstance(matrix, np.memmap) and not matrix.flags.writeable
+    assert matrix[:, 0].tolist() == [0, 1, 2, 10, 11]
+
+
+def test_mapping_is_cached_until_the_files_change():
+    store.append("j1", _rows("a", 2))
+    assert store.load("j1")[1] is store.load("j1")[1]
+    store.append("j1", _rows("b", 1))
+    assert len(store.load("j1")[0]) == 3
+
+
+def test_reupload_replaces_the_row_and_compacts_when_garbage_dominates(monkeypatch):
+    monkeypatch.setattr(store, "COMPACT_MIN_GARBAGE", 1)
+    store.append("j1", _rows("a", 2))
+    store.append("j1", [("a0", np.full(4, 7, dtype=np.float32))])
+    ids, matrix = store.load("j1")
+    assert ids == ["a1", "a0"] and matrix[:, 0].tolist() == [1, 7]
+
+    store.append("j1", [("a0", np.full(4, 8, dtype=np.float32)), ("a1", np.full(4, 9, dtype=np.float32))])
+    assert _files("j1") == ["00000001.idx", "00000001.vec"]
+    ids, matrix = store.load("j1")
+    assert ids == ["a0", "a1"] and matrix[:, 0].tolist() == [8, 9]
+
+
+def test_delete_compacts_into_a_new_generation():
+    store.append("j1", _rows("a", 4))
+    before_ids, before = store.load("j1")
+    store.delete("j1", ["a1", "a3", "missing"])
+
+    ids, matrix = store.load("j1")
+    assert ids == ["a0", "a2"] and matrix[:, 0].tolist() == [0, 2]
+    assert _files("j1") == ["00000001.idx", "00000001.vec"]
+    assert before[:, 0].tolist() == [0, 1, 2, 3]  # an existing mapping outlives the old files
+
+
+def test_load_retries_when_compaction_removes_the_files_it_is_opening(monkeypatch):
+    store.append("j1", _rows("a", 3))
+    read_index = store._read_index
+
+    def compacted_underneath(path):
+        monkeypatch.setattr(store, "_read_index", read_index)
+        store.delete("j1", ["a1"])
+        return read_index(path)
+
+    monkeypatch.setattr(store, "_read_index", compacted_underneath)
+    ids, matrix = store.load("j1")
+    assert ids == ["a0", "a2"] and matrix[:, 0].tolist() == [0, 2]
+
+
+def test_readers_ignore_half_written_rows_and_ids():
+    store.append("j1", _rows("a", 2))
+    vec, idx = store._paths(Path(settings.job_matrix_dir) / "j1", 0)
+    with open(vec, "ab") as f:
+        f.write(np.ones(4, dtype=np.float32).tobytes()[:6])
+    with open(idx, "a") as f:
+        f.write("a2")
+    ids, matrix = store.load("j1")
+    assert ids == ["a0", "a1"] and matrix.shape == (2, 4)
+
+    store.append("j1", _rows("b", 1, start=5))  # the next writer drops both torn tails
+    ids, matrix = store.load("j1")
+    assert ids == ["a0", "a1", "b0"] and matrix[:, 0].tolist() == [0, 1, 5]
+
+
+def test_dimension_change_starts_a_new_matrix():
+    store.append("j1", _rows("a", 2, dim=4))
+    store.append("j1", _rows("b", 1, dim=8))
+    ids, matrix = store.load("j1")
+    assert ids == ["b0"] and matrix.shape == (1, 8)
+
+
+def test_int8_quantization_stores_int8_rows(monkeypatch):
+    monkeypatch.setattr(settings, "embedding_quantization", embedding_codec.INT8)
+    store.append("j1", [("a0", np.array([0.5, -1.0, 0.25], dtype=np.float32))])
+    _, matrix = store.load("j1")
+    assert matrix.dtype == np.int8 and matrix[0].tolist() == [64, -127, 32]
+
+
+def test_unsafe_job_ids_are_rejected():
+    for job_id in ("../etc", ".", "..", "j1\n"):
+        with pytest.raises(ValueError):
+            store.append(job_id, _rows("a", 1))
+    ids, matrix = store.load("unknown")
+    assert ids == [] and matrix.size == 0 and store.jobs() == []
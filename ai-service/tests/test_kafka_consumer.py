@@ -0,0 +1,224 @@
+"""Tests for FR-63 — micro-batched CV_UPLOADED handling, retry topics, DLQ and idempotency."""
+import json
+import time
+from collections import namedtuple
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.services import kafka_consumer as kc
+from src.services import retry_queue
+
+TopicPartition = namedtuple("TopicPartition", ["topic", "partition"])
+
+
+@pytest.fixture(autouse=True)
+def _no_redis():
+    """Keep the idempotency layer off the network unless a test patches it."""
+    with patch.object(kc.idempotency, "_get_client", side_effect=ConnectionError("no redis in tests")):
+        yield
+
+
+def _record(topic: str, payload, headers=None, offset: int = 0) -> SimpleNamespace:
+    raw = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    return SimpleNamespace(topic=topic, value=raw, key=None, headers=headers or [], offset=offset)
+
+
+def _cv(app_id: str) -> dict:
+    return {"applicationId": app_id, "candidateId": "c", "jobId": "j", "cvFilePath": f"/cv/{app_id}.pdf"}
+
+
+class TestCvBatch:
+    def test_cv_records_from_one_poll_are_embedded_together(self):
+        records = [_record(kc.TOPIC_CV_UPLOADED, _cv(str(i))) for i in range(5)]
+        with patch.object(kc, "_extract_and_mask", side_effect=lambda e: f"text {e.applicationId}"), \
+             patch("src.utils.nlp_pipeline.preprocess_batch", side_effect=lambda ts: [t.upper() for t in ts]) as pre, \
+             patch("src.services.chunked_embedding.document_vectors") as emb:
+            failed = kc._process_records(records, MagicMock())
+
+        assert failed == []
+        pre.assert_called_once_with([f"text {i}" for i in range(5)])
+        emb.assert_called_once_with([f"TEXT {i}" for i in range(5)])
+
+    def test_failed_extraction_is_dropped_from_batch(self):
+        events = [kc.CvUploadedEvent(**_cv(str(i))) for i in range(3)]
+        with patch.object(kc, "_extract_and_mask", side_effect=["a", None, "c"]), \
+             patch("src.utils.nlp_pipeline.preprocess_batch", side_effect=lambda ts: ts), \
+             patch("src.services.chunked_embedding.document_vectors") as emb:
+            kc._process_cv_batch(events)
+        emb.assert_called_once_with(["a", "c"])
+
+    def test_malformed_record_goes_to_dlq_without_failing_batch(self):
+        failures = MagicMock()
+        records = [_record(kc.TOPIC_CV_UPLOADED, b"{not json")]
+        assert kc._process_records(records, failures) == []
+        failures.dead_letter.assert_called_once()
+
+    def test_batch_failure_isolates_poison_record(self):
+        records = [_record(kc.TOPIC_CV_UPLOADED, _cv(str(i))) for i in range(3)]
+
+        def single(event):
+            if event.applicationId == "1":
+                raise RuntimeError("bad cv")
+
+        with patch.object(kc, "_BATCH_HANDLERS", {kc.TOPIC_CV_UPLOADED: MagicMock(side_effect=RuntimeError)}), \
+             patch.dict(kc._HANDLERS, {kc.TOPIC_CV_UPLOADED: (kc.CvUploadedEvent, single)}):
+            failed = kc._process_records(records, MagicMock())
+
+        assert [m for m, _ in failed] == [records[1]]
+
+    def test_retry_topic_records_use_source_handler(self):
+        handler = MagicMock()
+        record = _record(retry_queue.retry_topic(kc.TOPIC_EXAM_SUBMITTED, 2), {
+            "applicationId": "a", "candidateId": "c", "jobId": "j", "answers": {},
+        })
+        with patch.dict(kc._HANDLERS, {kc.TOPIC_EXAM_SUBMITTED: (kc.ExamSubmittedEvent, handler)}):
+            assert kc._process_records([record], MagicMock()) == []
+        handler.assert_called_once()
+
+
+class TestRetryQueue:
+    def _publisher(self):
+        producer = MagicMock()
+        return retry_queue.FailurePublisher(producer), producer
+
+    def test_first_failure_parks_on_retry_topic_with_headers(self):
+        publisher, producer = self._publisher()
+        publisher.retry(_record(kc.TOPIC_CV_UPLOADED, _cv("1")), RuntimeError("boom"))
+
+        target = producer.send.call_args.args[0]
+        headers = dict(producer.send.call_args.kwargs["headers"])
+        assert target == "CV_UPLOADED_RETRY_1"
+        assert headers[retry_queue.HEADER_ATTEMPT] == b"2"
+        assert headers[retry_queue.HEADER_SOURCE_TOPIC] == b"CV_UPLOADED"
+        producer.flush.assert_not_called()
+
+    def test_exhausted_record_is_dead_lettered(self):
+        publisher, producer = self._publisher()
+        attempts = str(retry_queue.settings.kafka_retry_max_attempts).encode()
+        record = _record("CV_UPLOADED_RETRY_3", _cv("1"), headers=[(retry_queue.HEADER_ATTEMPT, attempts)])
+        publisher.retry(record, RuntimeError("boom"))
+
+        assert producer.send.call_args.args[0] == retry_queue.TOPIC_DEAD_LETTER
+        envelope = json.loads(producer.send.call_args.kwargs["value"])
+        assert envelope["source_topic"] == "CV_UPLOADED"
+        assert envelope["attempts"] == retry_queue.settings.kafka_retry_max_attempts
+
+    def test_backoff_is_exponential_and_bounded(self):
+        base = retry_queue.settings.kafka_retry_backoff_ms
+        assert retry_queue.backoff_ms(1) == base
+        assert retry_queue.backoff_ms(2) == base * 2
+        assert retry_queue.backoff_ms(50) == retry_queue.settings.kafka_retry_backoff_max_ms
+
+    def test_confirm_reports_records_that_were_not_delivered(self):
+        publisher, producer = self._publisher()
+        delivered, undelivered = MagicMock(), MagicMock()
+        undelivered.get.side_effect = RuntimeError("broker down")
+        producer.send.side_effect = [delivered, undelivered, BufferError("queue full")]
+        records = [_record(kc.TOPIC_CV_UPLOADED, _cv(str(i)), offset=i) for i in range(3)]
+        for record in records:
+            publisher.retry(record, RuntimeError("boom"))
+
+        assert publisher.confirm() == records[1:]
+        producer.flush.assert_called_once()
+        assert publisher.confirm() == []
+
+    def test_unparked_record_is_not_committed(self):
+        consumer = MagicMock()
+        records = [_record(kc.TOPIC_CV_UPLOADED, _cv(str(i)), offset=10 + i) for i in range(4)]
+        kc._rewind_unparked(consumer, {"tp0": records[:2], "tp1": records[2:]}, [records[3], records[1]])
+        assert sorted(c.args for c in consumer.seek.call_args_list) == [("tp0", 11), ("tp1", 13)]
+
+    def test_revoked_partitions_stop_reporting_lag(self):
+        consumer = MagicMock()
+        kept, revoked = TopicPartition("LAG_TEST", 0), TopicPartition("LAG_TEST", 1)
+        consumer.highwater.return_value, consumer.position.return_value = 10, 4
+        kc._record_lag(consumer, {kept: [], revoked: []})
+
+        kc._forget_partitions([revoked])
+
+        series = {s.labels["partition"]: s.value for m in kc.metrics.KAFKA_LAG.collect() for s in m.samples
+                  if s.labels["topic"] == "LAG_TEST"}
+        assert series == {"0": 6}
+        kc._forget_partitions([kept])
+
+    def test_not_yet_due_partition_is_paused_and_rewound(self):
+        consumer = MagicMock()
+        future = str(int(time.time() * 1000) + 60_000).encode()
+        due = _record("CV_UPLOADED_RETRY_1", _cv("1"), offset=4)
+        waiting = _record("CV_UPLOADED_RETRY_1", _cv("2"), headers=[(retry_queue.HEADER_NOT_BEFORE, future)], offset=5)
+        later = _record("CV_UPLOADED_RETRY_1", _cv("3"), offset=6)
+
+        records = kc._take_due_records(consumer, {"tp": [due, waiting, later]}, retry_queue.PartitionGate())
+
+        assert records == [due]
+        consumer.seek.assert_called_once_with("tp", 5)
+        consumer.pause.assert_called_once_with("tp")
+
+
+class TestEmbedBatch:
+    def test_misses_are_deduplicated_and_written_once(self):
+        from src.services import embedding_service
+
+        model = MagicMock()
+        model.encode.return_value = np.array([[1.0], [2.0]])
+        with patch.object(embedding_service, "_model", model), \
+             patch("src.services.vector_cache.get_many", return_value=[None, np.array([9.0]), None, None]), \
+             patch("src.services.vector_cache.put_many") as put_many:
+            out = embedding_service.embed_batch(["a", "b", "c", "a"])
+
+        assert model.encode.call_args.args[0] == ["a", "c"]
+        assert {t: v.tolist() for t, v in put_many.call_args.args[0]} == {"a": [1.0], "c": [2.0]}
+        assert [v.tolist() for v in out] == [[1.0], [9.0], [2.0], [1.0]]
+
+
+class TestIdempotency:
+    def test_redelivered_events_are_skipped_and_new_ones_marked(self):
+        records = [_record(kc.TOPIC_CV_UPLOADED, _cv(str(i))) for i in range(3)]
+        handler = MagicMock()
+        with patch.object(kc, "_BATCH_HANDLERS", {kc.TOPIC_CV_UPLOADED: handler}), \
+             patch.object(kc.idempotency, "already_processed", return_value=[False, True, False]), \
+             patch.object(kc.idempotency, "mark_processed") as mark:
+            kc._process_records(records, MagicMock())
+
+        assert [e.applicationId for e in handler.call_args.args[0]] == ["0", "2"]
+        assert len(mark.call_args.args[0]) == 2
+
+    def test_repeated_event_in_one_poll_is_processed_once(self):
+        records = [_record(kc.TOPIC_CV_UPLOADED, _cv("0"), offset=i) for i in range(2)]
+        records.append(_record(kc.TOPIC_CV_UPLOADED, _cv("1"), offset=2))
+        handler = MagicMock()
+        with patch.object(kc, "_BATCH_HANDLERS", {kc.TOPIC_CV_UPLOADED: handler}), \
+             patch.object(kc.idempotency, "already_processed", side_effect=lambda keys: [False] * len(keys)) as lookup, \
+             patch.object(kc.idempotency, "mark_processed"):
+            kc._process_records(records, MagicMock())
+
+        assert len(lookup.call_args.args[0]) == 2
+        assert [e.applicationId for e in handler.call_args.args[0]] == ["0", "1"]
+
+    def test_failed_events_are_not_marked(self):
+        records = [_record(kc.TOPIC_EXAM_SUBMITTED, {
+            "applicationId": "a", "candidateId": "c", "jobId": "j", "answers": {},
+        })]
+        with patch.dict(kc._HANDLERS, {kc.TOPIC_EXAM_SUBMITTED: (kc.ExamSubmittedEvent, MagicMock(side_effect=RuntimeError))}), \
+             patch.object(kc.idempotency, "already_processed", return_value=[False]), \
+             patch.object(kc.idempotency, "mark_processed") as mark:
+            failed = kc._process_records(records, MagicMock())
+
+        assert len(failed) == 1
+        mark.assert_called_once_with([])
+
+    def test_key_changes_when_cv_file_is_rewritten(self, tmp_path):
+        cv = tmp_path / "cv.pdf"
+        cv.write_bytes(b"v1")
+        first = kc.idempotency.event_key("CV_UPLOADED", "a", b"{}", str(cv))
+        cv.write_bytes(b"version two")
+        assert kc.idempotency.event_key("CV_UPLOADED", "a", b"{}", str(cv)) != first
+
+    def test_replay_mode_bypasses_lookup(self):
+        with patch.object(kc.idempotency.settings, "kafka_replay_mode", True), \
+             patch.object(kc.idempotency, "_get_client") as client:
+            assert kc.idempotency.already_processed(["k1", "k2"]) == [False, False]
+        client.assert_not_called()
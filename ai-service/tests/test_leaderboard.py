@@ -0,0 +1,109 @@
+"""Tests for FR-67 — the incremental per-job leaderboard."""
+import pytest
+import redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks.fakes import FakePipeline
+from src.routers import leaderboard
+from src.services import leaderboard_service
+from src.services.ranking_engine import final_score
+
+
+@pytest.fixture(autouse=True)
+def board(fake_redis):
+    return fake_redis
+
+
+def _ids(page: dict) -> list[str]:
+    return [e["candidateId"] for e in page["entries"]]
+
+
+def test_partial_updates_merge_with_stored_components():
+    leaderboard_service.update("j1", "c1", cv_score=80)
+    entry = leaderboard_service.update("j1", "c1", exam_score=60)
+    assert (entry["cvScore"], entry["examScore"], entry["hardFilterPassed"]) == (80, 60, True)
+    assert entry["finalScore"] == final_score(80, 60, True)
+
+    entry = leaderboard_service.update("j1", "c1", hard_filter_passed=False)
+    assert (entry["cvScore"], entry["examScore"], entry["finalScore"]) == (80, 60, 0.0)
+
+
+def test_new_candidate_starts_from_zero_scores_and_a_passed_filter():
+    entry = leaderboard_service.update("j1", "c1", exam_score=50)
+    assert entry == {
+        "candidateId": "c1", "rank": 1, "cvScore": 0.0, "examScore": 50,
+        "hardFilterPassed": True, "finalScore": final_score(0, 50, True),
+    }
+
+
+def test_hard_filter_failures_rank_below_every_passing_candidate():
+    leaderboard_service.update("j1", "failed", cv_score=100, exam_score=100, hard_filter_passed=False)
+    leaderboard_service.update("j1", "weak", cv_score=0, exam_score=0)
+    leaderboard_service.update("j1", "strong", cv_score=90, exam_score=90)
+    assert _ids(leaderboard_service.top("j1")) == ["strong", "weak", "failed"]
+    assert leaderboard_service.rank_of("j1", "failed")["rank"] == 3
+
+
+def test_equal_scores_are_listed_in_reverse_candidate_id_order():
+    for cid in ("b", "c", "a"):
+        leaderboard_service.update("j1", cid, cv_score=50, exam_score=50)
+    assert _ids(leaderboard_service.top("j1")) == ["c", "b", "a"]
+    assert [leaderboard_service.rank_of("j1", cid)["rank"] for cid in ("a", "b", "c")] == [3, 2, 1]
+
+
+def test_pages_are_consecutive_with_one_based_ranks():
+    for i in range(7):
+        leaderboard_service.update("j1", f"c{i}", cv_score=10 * i)
+    first, second = leaderboard_service.top("j1", 0, 3), leaderboard_service.top("j1", 3, 3)
+    last = leaderboard_service.top("j1", 6, 3)
+
+    assert _ids(first) + _ids(second) + _ids(last) == [f"c{i}" for i in range(6, -1, -1)]
+    assert [e["rank"] for e in second["entries"]] == [4, 5, 6]
+    assert (last["total"], len(last["entries"])) == (7, 1)
+    assert leaderboard_service.top("j1", 10, 3)["entries"] == []
+
+
+def test_rank_of_and_remove():
+    leaderboard_service.update("j1", "c1", cv_score=10)
+    leaderboard_service.update("j1", "c2", cv_score=20)
+    assert leaderboard_service.rank_of("j1", "c1")["rank"] == 2
+    assert leaderboard_service.rank_of("j1", "missing") is None
+    assert leaderboard_service.rank_of("other-job", "c1") is None
+
+    assert leaderboard_service.remove("j1", "c2") is True
+    assert leaderboard_service.remove("j1", "c2") is False
+    assert leaderboard_service.rank_of("j1", "c1")["rank"] == 1
+    # A re-added candidate starts again from default components
+    assert leaderboard_service.update("j1", "c2", exam_score=30)["cvScore"] == 0.0
+
+
+def test_router_round_trip():
+    app = FastAPI()
+    app.include_router(leaderboard.router)
+    client = TestClient(app)
+
+    assert client.put("/rank/leaderboard/j1/candidates/c1", json={}).status_code == 422
+    assert client.put("/rank/leaderboard/j1/candidates/c1", json={"cvScore": 70}).json()["data"]["rank"] == 1
+    assert client.get("/rank/leaderboard/j1", params={"limit": 1}).json()["data"]["total"] == 1
+    assert client.delete("/rank/leaderboard/j1/candidates/c1").status_code == 200
+    assert client.get("/rank/leaderboard/j1/candidates/c1").status_code == 404
+
+
+def test_redis_outage_returns_503(monkeypatch):
+    app = FastAPI()
+    app.include_router(leaderboard.router)
+    client = TestClient(app)
+
+    def down(self):
+        raise redis.exceptions.ConnectionError("down")
+
+    monkeypatch.setattr(FakePipeline, "execute", down)
+    for response in (
+        client.put("/rank/leaderboard/j1/candidates/c1", json={"cvScore": 70}),
+        client.get("/rank/leaderboard/j1"),
+        client.get("/rank/leaderboard/j1/candidates/c1"),
+        client.delete("/rank/leaderboard/j1/candidates/c1"),
+    ):
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
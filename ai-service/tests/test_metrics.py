@@ -0,0 +1,34 @@
+"""Tests for the Prometheus /metrics endpoint."""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routers import metrics as metrics_router
+from src.utils import metrics
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(metrics_router.router)
+    return TestClient(app)
+
+
+def test_exposes_stage_histogram_and_counters():
+    with metrics.stage("mask"):
+        pass
+    metrics.CACHE_LOOKUPS.labels("hit").inc()
+
+    resp = _client().get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'ai_pipeline_stage_seconds_count{stage="mask"}' in resp.text
+    assert 'ai_vector_cache_lookups_total{result="hit"}' in resp.text
+
+
+def test_stage_records_even_when_block_raises():
+    before = metrics.STAGE_LATENCY.labels("embed")._sum.get()
+    try:
+        with metrics.stage("embed"):
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert metrics.STAGE_LATENCY.labels("embed")._sum.get() > before
@@ -0,0 +1,77 @@
+"""Tests for content-addressed feedback report generation."""
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.services import pdf_generator
+from src.services.attribution_service import AttributionResult
+from src.services.justification_engine import Justification
+
+pytest.importorskip("reportlab")
+
+ATTRIBUTION = AttributionResult(
+    top_positive=[("a320", 0.4)], top_negative=[("gap", -0.1)], raw_weights=[("a320", 0.4), ("gap", -0.1)],
+)
+JUSTIFICATION = Justification(
+    summary="Strong fit.", cv_commentary="Type rated.", exam_commentary="Good.", eligibility_commentary="Eligible.",
+    full_text="Strong fit.\n\nType rated.",
+)
+
+
+@pytest.fixture(autouse=True)
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_generator, "STORAGE_DIR", tmp_path)
+    return tmp_path
+
+
+def _generate(notes: str | None = None, application_id: str = "app-1"):
+    return pdf_generator.generate_pdf(
+        application_id, "Abebe Kebede", "First Officer", 78.5, 64.0, 74.2, True, ATTRIBUTION, JUSTIFICATION, notes,
+    )
+
+
+def test_unchanged_inputs_return_the_existing_report_without_rendering(storage):
+    first = _generate()
+    assert first.read_bytes().startswith(b"%PDF")
+    with patch.object(pdf_generator, "_render") as render:
+        assert _generate() == first
+    render.assert_not_called()
+    # Only the finished report is left behind: renders happen under tmp/ and are renamed in
+    assert sorted(p.name for p in storage.iterdir()) == sorted([first.name, "tmp"])
+    assert list((storage / "tmp").iterdir()) == []
+
+
+def test_digest_covers_every_input_and_the_template_version(monkeypatch):
+    args = ["app-1", "Abebe Kebede", "First Officer", 78.5, 64.0, 74.2, True, ATTRIBUTION, JUSTIFICATION, None]
+    base = pdf_generator.report_digest(*args)
+    assert pdf_generator.report_digest(*args[:3], 78.6, *args[4:]) != base
+    assert pdf_generator.report_digest(*args[:-1], "Call back") != base
+    assert pdf_generator.report_digest(*args[:-1], "  ") == base
+    monkeypatch.setattr(pdf_generator, "TEMPLATE_VERSION", pdf_generator.TEMPLATE_VERSION + 1)
+    assert pdf_generator.report_digest(*args) != base
+
+
+def test_superseded_reports_are_swept_after_the_grace_period(storage):
+    old = _generate()
+    other_application = _generate(application_id="app-2")
+    new = _generate("Invite to simulator check")
+    assert old.exists() and new != old  # still within the grace period
+
+    stale = time.time() - 3600
+    os.utime(old, (stale, stale))
+    os.utime(other_application, (stale, stale))
+    assert pdf_generator.sweep(grace_seconds=60) == 1
+    assert not old.exists() and new.exists() and other_application.exists()
+
+
+def test_served_report_becomes_current_again(storage):
+    first = _generate()
+    second = _generate("Hold for next intake")
+    stale = time.time() - 3600
+    os.utime(second, (stale, stale))
+    assert _generate() == first  # inputs reverted: the original report is served and touched
+
+    pdf_generator.sweep(grace_seconds=60)
+    assert first.exists() and not second.exists()
@@ -0,0 +1,127 @@
+"""Tests for the admin profiling endpoints."""
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.routers import profiling
+from src.utils import profiler
+
+TOKEN = "s3cret"
+ADMIN = {"X-Admin-Token": TOKEN}
+
+
+@pytest.fixture(autouse=True)
+def _admin(tmp_path):
+    with patch.object(profiling.settings, "admin_token", TOKEN), \
+            patch.object(profiling.settings, "worker_state_dir", str(tmp_path)):
+        yield
+
+
+@pytest.fixture
+def client() -> TestClient:
+    from src.main import app
+
+    return TestClient(app)  # startup (model, consumer) is not run
+
+
+def _busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestStackSampler:
+    def test_samples_other_threads_as_collapsed_stacks(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy")
+        worker.start()
+        try:
+            sampler = profiler.sample(0.1, interval_ms=2)
+        finally:
+            stop.set()
+            worker.join()
+
+        lines = sampler.collapsed().splitlines()
+        assert sampler.sample_count > 0
+        assert any(line.startswith("busy;") and "_busy_loop" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_only_through_filters_to_one_function(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_loop, args=(stop,))
+        worker.start()
+        try:
+            sampler = profiler.sample(0.05, interval_ms=2)
+        finally:
+            stop.set()
+            worker.join()
+
+        filtered = sampler.collapsed(only_through=_busy_loop.__code__).splitlines()
+        assert filtered and all("_busy_loop" in line for line in filtered)
+
+
+class TestProfilingEndpoints:
+    def test_requires_admin_token(self, client):
+        assert client.get("/admin/profile/cpu?seconds=0.01").status_code == 403
+        with patch.object(profiling.settings, "admin_token", ""):
+            assert client.get("/admin/profile/cpu?seconds=0.01", headers=ADMIN).status_code == 404
+
+    def test_cpu_profile_returns_collapsed_stacks(self, client):
+        resp = client.get("/admin/profile/cpu?seconds=0.05&intervalMs=1", headers=ADMIN)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        assert int(resp.headers["X-Profile-Samples"]) > 0
+
+    def test_concurrent_cpu_capture_is_rejected(self, client):
+        with profiling._cpu_lock:
+            assert client.get("/admin/profile/cpu?seconds=0.01", headers=ADMIN).status_code == 409
+
+    def test_memory_profile_reports_growth_and_stops_tracing(self, client):
+        import tracemalloc
+
+        resp = client.get("/admin/profile/memory?seconds=0.05&top=5", headers=ADMIN)
+        assert resp.status_code == 200
+        assert "allocations" in resp.json()["data"]
+        assert not tracemalloc.is_tracing()
+
+    def test_single_request_profile_is_stored_and_served(self, client):
+        from src.services import ranking_engine
+
+        real_rank = ranking_engine.rank
+
+        def slow_rank(*args, **kwargs):
+            deadline = time.perf_counter() + 0.05
+            while time.perf_counter() < deadline:
+                pass
+            return real_rank(*args, **kwargs)
+
+        body = {"jobId": "j", "candidates": [{"candidateId": "c", "cvScore": 1, "examScore": 1,
+                                               "hardFilterPassed": True}]}
+        with patch.object(ranking_engine, "rank", side_effect=slow_rank):
+            resp = client.post("/rank/batch", json=body, headers={**ADMIN, "X-Profile-Request": "1"})
+        assert resp.status_code == 200
+        profile_id = resp.headers["X-Profile-Id"]
+
+        profile = client.get(f"/admin/profile/requests/{profile_id}", headers=ADMIN)
+        assert profile.status_code == 200
+        assert "rank_batch" in profile.text
+
+    def test_only_the_newest_request_profiles_are_kept(self, client):
+        with patch.object(profiling.settings, "profile_max_stored", 3):
+            ids = [profiling.save_request_profile(f"main;work {i}\n") for i in range(5)]
+            for i, profile_id in enumerate(ids):
+                path = profiling._profile_dir() / f"{profile_id}.folded"
+                if path.exists():
+                    os.utime(path, ns=(i, i))
+            newest = profiling.save_request_profile("main;work 5\n")
+
+        stored = sorted(p.stem for p in profiling._profile_dir().glob("*.folded"))
+        assert len(stored) == 3 and {ids[4], newest} <= set(stored)
+        assert client.get(f"/admin/profile/requests/{newest}", headers=ADMIN).text == "main;work 5\n"
+
+    def test_profile_header_ignored_without_admin_token(self, client):
+        resp = client.get("/health", headers={"X-Profile-Request": "1"})
+        assert "X-Profile-Id" not in resp.headers
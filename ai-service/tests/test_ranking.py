@@ -0,0 +1,102 @@
+"""Tests for FR-67 — weighted batch ranking."""
+import json
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routers import ranking
+from src.services import ranking_engine
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(ranking.router)
+    return TestClient(app)
+
+
+def _cand(cid: str, cv: float, exam: float, passed: bool = True) -> dict:
+    return {"candidateId": cid, "cvScore": cv, "examScore": exam, "hardFilterPassed": passed}
+
+
+class TestRankBatch:
+    def test_sorted_descending_with_40_40_20_formula(self):
+        body = {"candidates": [_cand("a", 50, 50), _cand("b", 90, 80), _cand("c", 70, 60)]}
+        ranked = _client().post("/rank/batch", json=body).json()["ranked"]
+        assert [r["candidateId"] for r in ranked] == ["b", "c", "a"]
+        assert ranked[0]["finalScore"] == 88.0
+
+    def test_hard_filter_failures_last_with_zero_score(self):
+        body = {"candidates": [_cand("fail", 100, 100, passed=False), _cand("low", 0, 0)]}
+        ranked = _client().post("/rank/batch", json=body).json()["ranked"]
+        assert [r["candidateId"] for r in ranked] == ["low", "fail"]
+        assert ranked[1]["finalScore"] == 0.0
+
+    def test_ties_keep_request_order(self):
+        body = {"candidates": [_cand(str(i), 60, 60) for i in range(5)]}
+        ranked = _client().post("/rank/batch", json=body).json()["ranked"]
+        assert [r["candidateId"] for r in ranked] == ["0", "1", "2", "3", "4"]
+
+    def test_top_k(self):
+        body = {"candidates": [_cand(str(i), i, i) for i in range(20)], "topK": 3}
+        ranked = _client().post("/rank/batch", json=body).json()["ranked"]
+        assert [r["candidateId"] for r in ranked] == ["19", "18", "17"]
+
+    def test_ndjson_stream(self):
+        body = {"candidates": [_cand("a", 10, 10), _cand("b", 20, 20)]}
+        resp = _client().post("/rank/batch?stream=true", json=body)
+        assert resp.headers["content-type"].startswith(ranking.NDJSON_MEDIA_TYPE)
+        rows = [json.loads(line) for line in resp.text.splitlines()]
+        assert [r["candidateId"] for r in rows] == ["b", "a"]
+
+    def test_invalid_body_keeps_fastapi_422_format(self):
+        body = {"candidates": [_cand("a", 10, 10), _cand("b", 150, 20)]}
+        resp = _client().post("/rank/batch", json=body)
+        assert resp.status_code == 422
+        assert resp.json()["detail"][0]["loc"] == ["body", "candidates", 1, "cvScore"]
+        assert _client().post("/rank/batch", content=b"{not json", headers={"content-type": "application/json"}).status_code == 422
+
+    def test_values_pydantic_would_coerce_are_still_accepted(self):
+        body = {"candidates": [{**_cand("a", 10, 10), "cvScore": "90"}, _cand("b", 20, 20)], "topK": 1}
+        ranked = _client().post("/rank/batch", json=body).json()["ranked"]
+        assert [r["candidateId"] for r in ranked] == ["a"] and ranked[0]["cvScore"] == 90.0
+
+
+    def test_openapi_request_body_refs_resolve_to_components(self):
+        app = FastAPI()
+        app.include_router(ranking.router)
+        ranking.register_openapi_schemas(app)
+        spec = app.openapi()
+        body = spec["paths"]["/rank/batch"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+        refs = set()
+
+        def collect(node):
+            if isinstance(node, dict):
+                refs.update(v for k, v in node.items() if k == "$ref")
+                for v in node.values():
+                    collect(v)
+            elif isinstance(node, list):
+                for v in node:
+                    collect(v)
+
+        collect(spec)
+        assert body == {"$ref": "#/components/schemas/BatchRankRequest"}
+        assert {"BatchRankRequest", "CandidateInput"} <= spec["components"]["schemas"].keys()
+        assert refs and all(r.removeprefix("#/components/schemas/") in spec["components"]["schemas"] for r in refs)
+
+
+class TestRankOrder:
+    def test_top_k_matches_full_sort_prefix(self):
+        rng = np.random.default_rng(7)
+        final = rng.integers(20, 40, size=500).astype(float)  # many ties
+        passed = rng.random(500) > 0.2
+        full = ranking_engine.rank_order(final, passed)
+        for k in (1, 10, 137, 499):
+            assert ranking_engine.rank_order(final, passed, top_k=k).tolist() == full[:k].tolist()
+
+    def test_vectorised_scores_match_scalar_formula(self):
+        cv = np.array([0.0, 33.3, 72.5, 100.0])
+        exam = np.array([100.0, 66.6, 41.25, 0.0])
+        passed = np.array([True, True, True, False])
+        expected = [ranking_engine.final_score(c, e, p) for c, e, p in zip(cv, exam, passed)]
+        assert ranking_engine.final_scores(cv, exam, passed).tolist() == expected
@@ -0,0 +1,109 @@
+"""Tests for the shared Redis layer's circuit breaker."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+
+from src.services import redis_client, vector_cache
+
+
+def _breaker(threshold: int = 3, cooldown: float = 30.0) -> redis_client.CircuitBreaker:
+    return redis_client.CircuitBreaker("test", failure_threshold=threshold, cooldown_seconds=cooldown)
+
+
+def _fail(breaker: redis_client.CircuitBreaker) -> None:
+    with pytest.raises(redis.exceptions.ConnectionError):
+        with breaker.guard():
+            raise redis.exceptions.ConnectionError("down")
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_availability_failures(self):
+        breaker = _breaker(threshold=3)
+        for _ in range(3):
+            _fail(breaker)
+        assert breaker.state == redis_client.OPEN
+        with pytest.raises(redis_client.CircuitOpenError):
+            with breaker.guard():
+                pass
+
+    def test_response_errors_do_not_count(self):
+        breaker = _breaker(threshold=1)
+        with pytest.raises(redis.exceptions.ResponseError):
+            with breaker.guard():
+                raise redis.exceptions.ResponseError("WRONGTYPE")
+        assert breaker.state == redis_client.CLOSED
+
+    def test_single_probe_after_cooldown_closes_on_success(self):
+        breaker = _breaker(threshold=1, cooldown=0.0)
+        _fail(breaker)
+        assert breaker.allow() is True       # the probe
+        assert breaker.allow() is False      # everyone else waits for it
+        breaker.record_success()
+        assert breaker.state == redis_client.CLOSED
+
+    def test_failed_probe_reopens(self):
+        breaker = _breaker(threshold=1, cooldown=0.0)
+        _fail(breaker)
+        _fail(breaker)
+        assert breaker.snapshot()["state"] == redis_client.OPEN
+
+
+class TestCacheBypass:
+    def test_open_circuit_skips_redis_entirely(self):
+        client = MagicMock()
+        with patch.object(redis_client, "_clients", {"cache": client}), \
+                patch.object(redis_client, "breaker", _breaker(threshold=1)) as breaker:
+            _fail(breaker)
+            assert vector_cache.get_many(["a", "b"]) == [None, None]
+            assert vector_cache.get("a") is None
+            vector_cache.put_many([("a", [1.0])])
+        client.mget.assert_not_called()
+        client.get.assert_not_called()
+        client.pipeline.return_value.execute.assert_not_called()
+
+    def test_timeouts_trip_the_shared_breaker(self):
+        client = MagicMock()
+        client.mget.side_effect = redis.exceptions.TimeoutError("slow")
+        with patch.object(redis_client, "_clients", {"cache": client}), \
+                patch.object(redis_client, "breaker", _breaker(threshold=2)) as breaker:
+            vector_cache.get_many(["a"])
+            vector_cache.get_many(["a"])
+            vector_cache.get_many(["a"])
+            assert breaker.state == redis_client.OPEN
+        assert client.mget.call_count == 2
+
+
+def test_ping_bypasses_the_breaker_and_reports_any_error_as_unreachable():
+    import asyncio
+
+    client = MagicMock()
+    client.ping = MagicMock(side_effect=RuntimeError("attached to a different loop"))
+    with patch.object(redis_client, "get_async_client", return_value=client), \
+            patch.object(redis_client, "breaker", _breaker(threshold=1)) as breaker:
+        assert asyncio.run(redis_client.ping()) is None
+        assert breaker.snapshot()["consecutiveFailures"] == 0
+
+        _fail(breaker)
+
+        async def pong():
+            return True
+
+        client.ping = pong
+        assert asyncio.run(redis_client.ping()) is not None  # pinged even with the circuit open
+        assert breaker.state == redis_client.OPEN
+
+
+def test_health_reports_circuit_state():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from src.routers import health
+
+    app = FastAPI()
+    app.include_router(health.router)
+    with patch.object(redis_client, "breaker", _breaker(threshold=1)) as breaker:
+        _fail(breaker)
+        body = TestClient(app).get("/health").json()
+    assert body["redis"]["circuit"]["state"] == "open"
+    assert body["redis"]["reachable"] is False
@@ -0,0 +1,97 @@
+"""Tests for the warm startup orchestrator and the readiness probe."""
+import os
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.services import startup
+
+
+@pytest.fixture(autouse=True)
+def _fresh_steps(monkeypatch):
+    monkeypatch.setattr(startup, "_steps", {name: {"status": startup.PENDING} for name in startup._steps})
+
+
+@pytest.fixture
+def loaders(monkeypatch):
+    """Replace every step with a mock; the three load steps must overlap to pass the barrier."""
+    barrier = threading.Barrier(3, timeout=5)
+    mocks = {name: MagicMock(side_effect=lambda: barrier.wait()) for name in ("sbert", "spacy", "redis")}
+    mocks["warmup"] = MagicMock()
+    monkeypatch.setattr(startup, "_load_sbert", mocks["sbert"])
+    monkeypatch.setattr(startup, "_load_spacy", mocks["spacy"])
+    monkeypatch.setattr(startup, "_connect_redis", mocks["redis"])
+    monkeypatch.setattr(startup, "_warm_up_models", mocks["warmup"])
+    return mocks
+
+
+def _ready_client() -> TestClient:
+    from src.routers import health
+
+    app = FastAPI()
+    app.include_router(health.router)
+    return TestClient(app)
+
+
+def test_readiness_is_503_until_warm_start_completes(loaders):
+    client = _ready_client()
+    assert client.get("/health/ready").status_code == 503
+
+    assert startup.warm_start() is True
+
+    resp = client.get("/health/ready")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "READY"
+    loaders["warmup"].assert_called_once()
+
+
+def test_redis_failure_is_reported_but_does_not_block_readiness(loaders):
+    loaders["redis"].side_effect = ConnectionError("refused")
+    loaders["sbert"].side_effect = loaders["spacy"].side_effect = None
+
+    assert startup.warm_start() is True
+    assert startup.is_ready()
+    assert startup.report()["steps"]["redis"]["status"] == startup.UNAVAILABLE
+
+
+def test_model_failure_skips_warmup_and_stays_unready(loaders):
+    loaders["sbert"].side_effect = OSError("no snapshot")
+    loaders["spacy"].side_effect = loaders["redis"].side_effect = None
+
+    assert startup.warm_start() is False
+    loaders["warmup"].assert_not_called()
+    assert _ready_client().get("/health/ready").status_code == 503
+
+
+def test_completed_steps_are_not_repeated(loaders):
+    for mock in loaders.values():
+        mock.side_effect = None
+    startup.warm_start(include_redis=False)
+    assert not startup.is_ready()  # Redis is still pending, as in the supervisor parent
+
+    startup.warm_start()
+    assert loaders["sbert"].call_count == 1
+    assert loaders["redis"].call_count == 1
+    assert startup.is_ready()
+
+
+def test_pinned_snapshots_switch_hugging_face_offline_before_loading(loaders, monkeypatch, tmp_path):
+    for name in ("HF_HUB_OFFLINE", "TRANSFORMERS_OFFLINE"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(startup.settings, "model_dir", str(tmp_path))
+    seen = []
+    loaders["sbert"].side_effect = lambda: seen.append(os.environ.get("HF_HUB_OFFLINE"))
+    loaders["spacy"].side_effect = loaders["redis"].side_effect = None
+
+    startup.warm_start()
+    assert seen == ["1"] and os.environ["TRANSFORMERS_OFFLINE"] == "1"
+
+
+def test_warmup_texts_hit_requested_lengths():
+    texts = startup._warmup_texts(100, 3)
+    assert len(texts) == 3
+    assert all(len(t.split()) == 100 for t in texts)
+    assert len(set(texts)) == 3
@@ -0,0 +1,46 @@
+"""Tests for the supervisor's worker restart policy."""
+import signal
+
+import pytest
+
+from src import supervisor
+from src.supervisor import RestartPolicy
+
+
+def test_restart_delay_doubles_per_recent_crash_of_the_same_worker():
+    policy = RestartPolicy(base=1.0, max_delay=5.0, limit=100, window=60.0)
+    assert [policy.on_crash(0, t) for t in range(4)] == [1.0, 2.0, 4.0, 5.0]
+    assert policy.on_crash(1, 4) == 1.0  # another worker starts from the base delay
+
+
+def test_crashes_outside_the_window_are_forgotten():
+    policy = RestartPolicy(base=1.0, max_delay=60.0, limit=100, window=10.0)
+    policy.on_crash(0, 0)
+    policy.on_crash(0, 1)
+    assert policy.on_crash(0, 30) == 1.0
+
+
+def test_gives_up_after_limit_crashes_within_the_window():
+    policy = RestartPolicy(base=0.1, max_delay=1.0, limit=3, window=10.0)
+    assert policy.on_crash(0, 0) is not None
+    assert policy.on_crash(1, 1) is not None
+    assert policy.on_crash(0, 2) is None
+    assert RestartPolicy(0.1, 1.0, 3, 10.0).on_crash(0, 0) is not None
+
+
+def test_supervisor_exits_when_workers_crash_in_a_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(signal, "signal", lambda *_: None)  # keep pytest's handlers
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path / "metrics"))
+    monkeypatch.setattr(supervisor.settings, "worker_state_dir", str(tmp_path))
+    monkeypatch.setattr(supervisor.settings, "worker_restart_backoff_seconds", 0.01)
+    monkeypatch.setattr(supervisor.settings, "worker_crash_limit", 4)
+    monkeypatch.setattr(supervisor, "_load_shared_model", lambda: None)
+    monkeypatch.setattr(supervisor, "_run_worker", lambda *_: (_ for _ in ()).throw(RuntimeError("boom")))
+    spawned = []
+    spawn = supervisor._spawn
+    monkeypatch.setattr(supervisor, "_spawn", lambda *a: spawned.append(a[0]) or spawn(*a))
+
+    with pytest.raises(SystemExit) as exit_info:
+        supervisor.main(["--host", "127.0.0.1", "--port", "0", "--workers", "2"])
+    assert exit_info.value.code == 1
+    assert len(spawned) == 5  # two workers plus three restarts before the fourth crash
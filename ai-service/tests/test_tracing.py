@@ -0,0 +1,106 @@
+"""Tests for trace propagation across HTTP, Kafka and the retry topics."""
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from src.services import kafka_consumer as kc
+from src.services import retry_queue
+from src.utils import tracing
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+_exporter = InMemorySpanExporter()
+
+
+@pytest.fixture(autouse=True)
+def _tracing_on():
+    # The global tracer provider can only be installed once per process
+    if tracing.trace.get_tracer_provider().__class__.__name__ != "TracerProvider":
+        with patch.object(tracing.settings, "tracing_sample_ratio", 1.0):
+            tracing.configure(_exporter)
+    tracing._enabled = True
+    _exporter.clear()
+    with patch.object(kc.idempotency, "_get_client", side_effect=ConnectionError("no redis in tests")):
+        yield
+    tracing._enabled = False
+
+
+def _spans(name: str) -> list:
+    return [s for s in _exporter.get_finished_spans() if s.name == name]
+
+
+def _record(topic: str, payload: dict, headers: list) -> SimpleNamespace:
+    return SimpleNamespace(topic=topic, value=json.dumps(payload).encode(), key=None, headers=headers, offset=7)
+
+
+class TestTracing:
+    def test_traced_functions_nest_under_the_current_span(self):
+        @tracing.traced()
+        def inner():
+            return 1
+
+        with tracing.span("outer"):
+            assert inner() == 1
+
+        (outer,) = _spans("outer")
+        (child,) = _spans("test_tracing.inner")
+        assert child.parent.span_id == outer.context.span_id
+
+    def test_decorator_calls_straight_through_when_disabled(self):
+        tracing._enabled = False
+
+        @tracing.traced()
+        def work():
+            return "ok"
+
+        assert work() == "ok"
+        assert _exporter.get_finished_spans() == ()
+
+    def test_kafka_record_continues_producer_trace(self):
+        record = _record(kc.TOPIC_EXAM_SUBMITTED, {"applicationId": "a1", "candidateId": "c", "jobId": "j", "answers": {}},
+                         [("traceparent", TRACEPARENT.encode())])
+        kc._process_records([record], MagicMock())
+
+        (span,) = _spans("kafka.process EXAM_SUBMITTED")
+        assert format(span.context.trace_id, "032x") == TRACE_ID
+        assert format(span.parent.span_id, "016x") == PARENT_ID
+
+    def test_cv_batch_span_links_every_record_trace(self):
+        records = [
+            _record(kc.TOPIC_CV_UPLOADED,
+                    {"applicationId": str(i), "candidateId": "c", "jobId": "j", "cvFilePath": f"/cv/{i}.pdf"},
+                    [("traceparent", f"00-{TRACE_ID[:-1]}{i}-{PARENT_ID}-01".encode())])
+            for i in range(3)
+        ]
+        with patch.object(kc, "_process_cv_batch"):
+            kc._process_records(records, MagicMock())
+
+        (span,) = _spans("kafka.process_batch CV_UPLOADED")
+        assert {format(link.context.trace_id, "032x")[-1] for link in span.links} == {"0", "1", "2"}
+
+    def test_retry_carries_trace_headers(self):
+        producer = MagicMock()
+        record = _record(kc.TOPIC_CV_UPLOADED, {}, [("traceparent", TRACEPARENT.encode())])
+        retry_queue.FailurePublisher(producer).retry(record, RuntimeError("boom"))
+
+        headers = dict(producer.send.call_args.kwargs["headers"])
+        assert headers["traceparent"] == TRACEPARENT.encode()
+
+    def test_http_request_continues_caller_trace_and_names_by_route(self):
+        from src.main import app
+        from src.services import leaderboard_service
+
+        client = TestClient(app)  # no context manager: startup (model, consumer) is not run
+        with patch.object(leaderboard_service, "rank_of", return_value=None):
+            resp = client.get("/rank/leaderboard/job-1/candidates/x", headers={"traceparent": TRACEPARENT})
+        assert resp.status_code == 404
+
+        (span,) = _spans("GET /rank/leaderboard/{job_id}/candidates/{candidate_id}")
+        assert format(span.context.trace_id, "032x") == TRACE_ID
+        assert span.attributes["http.response.status_code"] == 404